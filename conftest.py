@@ -0,0 +1,13 @@
+# Каталог task_4 собирается как обычный каталог, а не пакет:
+# устаревший task_4/__init__.py не импортируется при сборе тестов
+from pathlib import Path
+
+import pytest
+
+TASK_4 = Path(__file__).resolve().parent / "task_4"
+
+
+def pytest_collect_directory(path, parent):
+    if path == TASK_4:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
@@ -0,0 +1 @@
+#Пакет замеров производительности: python -m benchmarks --help (из каталога task_4)
@@ -0,0 +1,89 @@
+#Запуск замеров: python -m benchmarks suite|compare|startup
+import argparse
+import os
+import sys
+
+from benchmarks import comparisons, startup
+from benchmarks.suite import (REGRESSION_TOLERANCE, median_of, compare_with_baseline, load_baseline, run_suite,
+                              save_baseline)
+
+# База замеров, хранящаяся в репозитории
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Замеры производительности")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    suite = commands.add_parser("suite", help="замеры по фазам со сравнением с базой")
+    suite.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                       help="количество клиентов (до 10 000 000)")
+    suite.add_argument("--seed", type=int, default=1)
+    suite.add_argument("--vip-share", type=float, default=0.1)
+    suite.add_argument("--weight-skew", type=float, default=2.0)
+    suite.add_argument("--train-share", type=float, default=0.1)
+    suite.add_argument("--memory", action="store_true", help="замерять пиковую память (медленнее)")
+    suite.add_argument("--repeat", type=int, default=3, help="прогонов каждого размера (берется медиана фазы)")
+    suite.add_argument("--baseline", default=DEFAULT_BASELINE)
+    suite.add_argument("--save-baseline", action="store_true", help="сохранить замеры как новую базу")
+    suite.add_argument("--tolerance", type=float, default=REGRESSION_TOLERANCE,
+                       help="допустимое замедление (доля); на шумной машине его стоит увеличить")
+    suite.add_argument("--check", action="store_true", help="код возврата 1 при регрессии относительно базы")
+
+    compare = commands.add_parser("compare", help="новые механизмы против прежних реализаций")
+    compare.add_argument("--scale", type=int, default=1)
+
+    launch = commands.add_parser("startup", help="время запуска (python -X importtime) и ленивые импорты")
+    launch.add_argument("--runs", type=int, default=5)
+    launch.add_argument("--limit", type=float, default=startup.STARTUP_LIMIT_MS,
+                        help="допустимое время сверх пустого интерпретатора (мс)")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        comparisons.run_all(args.scale)
+        return
+    if args.command == "startup":
+        results = startup.measure_startup(args.runs)
+        for result in results:
+            print(result)
+        violations = startup.check_startup(results, args.limit)
+        if violations:
+            print("\nРегрессии времени запуска:")
+            for name, problem in violations:
+                print(f"  {name}: {problem}")
+            sys.exit(1)
+        return
+
+    runs = {}
+    regressions = []
+    baseline = load_baseline(args.baseline) if os.path.exists(args.baseline) else {}
+    for size in args.sizes:
+        # Пиковая память от повторов не меняется: с --memory прогон один
+        results = median_of([run_suite(size, args.seed, args.memory, vip_share=args.vip_share,
+                                     weight_skew=args.weight_skew, train_share=args.train_share)
+                           for _ in range(1 if args.memory else max(args.repeat, 1))])
+        runs[size] = results
+        print(f"\nКлиентов: {size}")
+        for result in results:
+            print(result)
+        if args.save_baseline:
+            continue
+        for regression in compare_with_baseline(size, results, baseline, args.tolerance):
+            regressions.append((size, *regression))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, runs, baseline)
+        print(f"\nБаза сохранена в {args.baseline}")
+    elif regressions:
+        print("\nРегрессии относительно базы:")
+        for size, name, metric, before, after in regressions:
+            if metric == "relative":
+                print(f"  {size} клиентов, {name}: {before:.3f} -> {after:.3f} эталона")
+            else:
+                print(f"  {size} клиентов, {name}: {before / 2 ** 20:.1f}МБ -> {after / 2 ** 20:.1f}МБ")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#Сравнительные замеры: новые механизмы против прежних реализаций
+import copy
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from benchmarks.generators import build_company
+from loaders import load_clients
+from packing import STRATEGIES
+from scenarios import Scenario, evaluate_scenarios
+from snapshot import load_company, open_snapshot, save_company
+from transport import Client, Train, Truck, TransportCompany
+
+
+def reference_first_fit(company: TransportCompany):
+    """Исходный линейный first-fit, сохраненный для сравнения"""
+    sorted_clients = sorted(company.clients, key=lambda x: not x.is_vip)
+    sorted_vehicles = sorted(company.vehicles, key=lambda x: x.capacity, reverse=True)
+
+    for vehicle in sorted_vehicles:
+        vehicle.clear_cargo()
+
+    used_vehicles = []
+    for client in sorted_clients:
+        client_loaded = False
+
+        for vehicle in used_vehicles:
+            if vehicle.fits(client):
+                vehicle.load_cargo(client)
+                client_loaded = True
+                break
+
+        if not client_loaded:
+            for vehicle in sorted_vehicles:
+                if vehicle not in used_vehicles and vehicle.fits(client):
+                    vehicle.load_cargo(client)
+                    used_vehicles.append(vehicle)
+                    client_loaded = True
+                    break
+
+    return used_vehicles
+
+
+def snapshot_assignment(vehicles):
+    """Снимок распределения: ID транспорта и имена клиентов в нем"""
+    return [(v.vehicle_id, [c.name for c in v.clients_list]) for v in vehicles]
+
+
+def timed(func, *args):
+    """Выполняет функцию и возвращает (результат, время в секундах)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_distribution(sizes):
+    """Сравнивает индексированный first-fit с исходным циклом"""
+    print(f"{'Транспорт':>10} {'Клиенты':>10} {'Исходный, с':>12} {'Индекс, с':>10} {'Ускорение':>10}")
+    for n_vehicles, n_clients in sizes:
+        company = build_company(n_vehicles, n_clients)
+
+        reference, reference_time = timed(reference_first_fit, company)
+        expected = snapshot_assignment(reference)
+
+        used, indexed_time = timed(company.optimize_cargo_distribution)
+        if snapshot_assignment(used) != expected:
+            raise AssertionError("Индексированный first-fit дал другое распределение")
+
+        print(f"{n_vehicles:>10} {n_clients:>10} {reference_time:>12.3f} {indexed_time:>10.3f} "
+              f"{reference_time / indexed_time:>9.1f}x")
+
+
+def bench_strategies(n_vehicles: int, n_clients: int, time_budget: float = 1.0):
+    """Сравнивает стратегии упаковки по качеству и времени"""
+    company = build_company(n_vehicles, n_clients)
+    for strategy in STRATEGIES:
+        company.optimize_cargo_distribution(strategy, time_budget)
+        print(company.last_stats)
+
+
+def build_costed_company(n_types: int, copies: int, n_clients: int, seed: int = 3) -> TransportCompany:
+    """
+    Разнородный парк из n_types типов по copies единиц: поезда вместительнее, но тонна
+    в крупном грузовике дешевле, а недогруженный поезд дороже нескольких грузовиков.
+    """
+    rng = random.Random(seed)
+    company = TransportCompany("Стоимость")
+    vehicles = []
+    for _ in range(n_types):
+        if rng.random() < 0.2:
+            capacity = rng.randint(20, 60) * 10.0
+            costs = {"fixed_cost": 24.0 * capacity, "cost_per_tonne": 1.0}
+            vehicles.extend(Train(capacity, 5, **costs) for _ in range(copies))
+        else:
+            capacity = float(rng.randint(5, 40))
+            costs = {"fixed_cost": 60.0 + 15.0 * capacity, "cost_per_tonne": 3.0}
+            vehicles.extend(Truck(capacity, "серый", **costs) for _ in range(copies))
+    company.add_vehicles(vehicles)
+    company.add_clients(Client(f"Клиент {i}", round(rng.uniform(0.2, 8.0), 1)) for i in range(n_clients))
+    return company
+
+
+def bench_costs(n_types: int, copies: int, n_clients: int):
+    """Стоимость и время: порядок по убыванию грузоподъемности (ffd) против min_cost"""
+    company = build_costed_company(n_types, copies, n_clients)
+    print(f"Типов транспорта: {n_types} по {copies}, клиентов: {n_clients}")
+    print(f"{'Стратегия':>10} {'Транспорт':>10} {'Стоимость':>12} {'Время, мс':>10}")
+    for strategy in ("ffd", "min_cost"):
+        company.optimize_cargo_distribution(strategy)
+        stats = company.last_stats
+        print(f"{strategy:>10} {stats.vehicles_used:>10} {stats.cost:>12.0f} {stats.elapsed * 1000:>10.1f}")
+
+
+def bench_incremental(n_vehicles: int, n_clients: int, batch: int = 10):
+    """Сравнивает полную переупаковку и дозагрузку небольшой партии клиентов"""
+    company = build_company(n_vehicles, n_clients)
+    _, full_time = timed(company.optimize_cargo_distribution)
+    for i in range(batch):
+        company.add_client(Client(f"Новый {i}", 1.0))
+    _, incremental_time = timed(lambda: company.optimize_cargo_distribution(incremental=True))
+    print(f"Полная переупаковка: {full_time * 1000:.1f}мс, "
+          f"дозагрузка {batch} клиентов: {incremental_time * 1000:.2f}мс ({company.last_stats.strategy})")
+
+
+def bench_loaders(n_rows: int):
+    """Пропускная способность пакетной загрузки клиентов из CSV и JSONL"""
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "clients.csv")
+        jsonl_path = os.path.join(tmp, "clients.jsonl")
+        with open(csv_path, "w", encoding="utf-8") as f_csv, open(jsonl_path, "w", encoding="utf-8") as f_jsonl:
+            f_csv.write("name,cargo_weight,is_vip\n")
+            for i in range(n_rows):
+                weight = round(rng.uniform(0.5, 15.0), 1)
+                is_vip = rng.random() < 0.1
+                f_csv.write(f"Клиент {i},{weight},{'да' if is_vip else 'нет'}\n")
+                f_jsonl.write(json.dumps({"name": f"Клиент {i}", "cargo_weight": weight, "is_vip": is_vip},
+                                         ensure_ascii=False) + "\n")
+        for path in (csv_path, jsonl_path):
+            result = load_clients(TransportCompany("Бенчмарк"), path)
+            print(f"{os.path.basename(path):>14}: {result}")
+
+
+def bench_snapshot(n_vehicles: int, n_clients: int):
+    """Сохранение снимка, открытие через mmap и полное восстановление компании"""
+    _, build_time = timed(build_company, n_vehicles, n_clients)
+    company = build_company(n_vehicles, n_clients)
+    company.optimize_cargo_distribution()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "company.snap")
+        _, save_time = timed(save_company, company, path)
+        view, open_time = timed(open_snapshot, path)
+        view.close()
+        _, load_time = timed(load_company, path)
+        size = os.path.getsize(path)
+    print(f"Снимок {n_clients} клиентов ({size / 1024:.0f} КБ): сохранение {save_time * 1000:.1f}мс, "
+          f"открытие {open_time * 1000:.2f}мс, восстановление {load_time * 1000:.1f}мс, "
+          f"сборка через конструкторы {build_time * 1000:.1f}мс")
+
+
+def bench_partitioned(n_vehicles: int, n_clients: int, partitions: int = 8):
+    """Ускорение распределения по партициям в зависимости от числа процессов"""
+    company = build_company(n_vehicles, n_clients, partitions=partitions)
+    _, serial_time = timed(lambda: company.optimize_partitioned(max_workers=1))
+    print(f"Партиций: {partitions}, процессоров: {os.cpu_count()}")
+    print(f"{'Процессов':>10} {'Время, с':>9} {'Ускорение':>10}")
+    print(f"{1:>10} {serial_time:>9.3f} {1.0:>9.1f}x")
+    for workers in (2, 4, 8):
+        _, parallel_time = timed(lambda: company.optimize_partitioned(max_workers=workers))
+        print(f"{workers:>10} {parallel_time:>9.3f} {serial_time / parallel_time:>9.1f}x")
+
+
+def bench_scenarios(n_vehicles: int, n_clients: int, n_scenarios: int = 8):
+    """Сценарии «что если»: копия компании на каждый сценарий против изменений поверх общих данных"""
+    company = build_company(n_vehicles, n_clients)
+    # Не размещенные грузы ожидаемы и не важны для замера
+    company.on_unplaced = lambda result: None
+    company.optimize_cargo_distribution()
+    scenarios = [Scenario(f"+{k} грузовиков", add_vehicles=[Truck(20.0, "синий") for _ in range(k)])
+                 for k in range(1, n_scenarios + 1)]
+
+    def with_copies():
+        for scenario in scenarios:
+            fork = copy.deepcopy(company)
+            fork.add_vehicles(copy.deepcopy(scenario.add_vehicles))
+            fork.optimize_cargo_distribution()
+
+    _, copy_time = timed(with_copies)
+    print(f"Сценариев: {n_scenarios}, транспорта: {n_vehicles}, клиентов: {n_clients}, процессоров: {os.cpu_count()}")
+    print(f"{'Способ':>22} {'Время, с':>9}")
+    print(f"{'копия компании':>22} {copy_time:>9.3f}")
+    for workers in (1, 4):
+        _, scenario_time = timed(lambda: evaluate_scenarios(company, scenarios, include_base=False,
+                                                            max_workers=workers))
+        print(f"{f'изменения, процессов {workers}':>22} {scenario_time:>9.3f}")
+
+
+class _DictClient:
+    """Клиент в прежнем представлении: атрибуты в __dict__"""
+
+    def __init__(self, name, cargo_weight, is_vip=False):
+        self.name = name
+        self.cargo_weight = cargo_weight
+        self.is_vip = is_vip
+
+
+class _DictVehicle:
+    """Транспорт в прежнем представлении: строковый UUID и список клиентов"""
+
+    def __init__(self, capacity):
+        self.vehicle_id = str(uuid.uuid4())[:8]
+        self.capacity = capacity
+        self.current_load = 0
+        self.clients_list = []
+
+
+def measure_bytes(factory, count: int) -> float:
+    """Средний объем памяти на объект по данным tracemalloc"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Не учитываем сам список-контейнер
+    return (after - before - sys.getsizeof(objects)) / len(objects)
+
+
+def bench_memory(count: int = 100_000):
+    """Сравнивает память на клиента и транспорт до и после перехода на __slots__"""
+    rows = [
+        ("Клиент", lambda i: _DictClient(f"Клиент {i}", 1.5, False),
+         lambda i: Client(f"Клиент {i}", 1.5, False)),
+        ("Грузовик", lambda i: _DictVehicle(20.0), lambda i: Truck(20.0, "синий")),
+    ]
+    print(f"{'Объект':>10} {'Было, байт':>11} {'Стало, байт':>12}")
+    for title, before, after in rows:
+        print(f"{title:>10} {measure_bytes(before, count):>11.1f} {measure_bytes(after, count):>12.1f}")
+
+
+def run_all(scale: int = 1):
+    """Запускает все сравнительные замеры"""
+    bench_distribution([(250 * scale * k, 1000 * scale * k) for k in (1, 2, 4, 8)])
+    print()
+    bench_strategies(20, 50)
+    bench_strategies(250 * scale, 1000 * scale)
+    print()
+    bench_costs(50, 20, 2000 * scale)
+    bench_costs(2000 * scale, 5, 50_000 * scale)
+    print()
+    bench_incremental(2000 * scale, 8000 * scale)
+    print()
+    bench_loaders(100_000 * scale)
+    print()
+    bench_snapshot(25_000 * scale, 100_000 * scale)
+    print()
+    bench_partitioned(25_000 * scale, 100_000 * scale)
+    print()
+    bench_scenarios(2_500 * scale, 10_000 * scale)
+    print()
+    bench_memory(100_000 * scale)
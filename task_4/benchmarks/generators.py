@@ -0,0 +1,62 @@
+#Генераторы синтетических парков и клиентов с фиксированным зерном
+import random
+
+from transport import Client, Truck, Train, TransportCompany
+
+# Максимальный вес одного груза: хвост распределения Парето обрезается
+MAX_CARGO_WEIGHT = 40.0
+
+# Запас грузоподъемности парка относительно общего веса грузов
+FLEET_HEADROOM = 1.25
+
+
+def generate_clients(n: int, seed: int = 1, vip_share: float = 0.1, weight_skew: float = 2.0,
+                     weight_scale: float = 2.0, partitions: int = 0):
+    """
+    Поток клиентов со скошенным распределением веса (Парето с параметром weight_skew
+    и минимумом weight_scale: много мелких грузов и редкие тяжелые) и долей VIP vip_share.
+    """
+    rng = random.Random(seed)
+    for i in range(n):
+        weight = round(min(MAX_CARGO_WEIGHT, weight_scale * rng.paretovariate(weight_skew)), 1)
+        partition = f"Депо {rng.randrange(partitions)}" if partitions else None
+        yield Client(f"Клиент {i}", weight, rng.random() < vip_share, partition)
+
+
+def generate_vehicles(n: int = None, seed: int = 2, train_share: float = 0.1, min_capacity: float = None,
+                      partitions: int = 0):
+    """
+    Поток транспорта: грузовики 5-40т (чаще средние) и поезда из 2-20 вагонов по 10-20т.
+    Генерирует n единиц или, если задан min_capacity, пока суммарная грузоподъемность меньше него.
+    """
+    rng = random.Random(seed)
+    count = 0
+    total_capacity = 0.0
+    while (n is not None and count < n) or (n is None and total_capacity < (min_capacity or 0)):
+        partition = f"Депо {rng.randrange(partitions)}" if partitions else None
+        if rng.random() < train_share:
+            cars = rng.randint(2, 20)
+            vehicle = Train(float(cars * rng.randint(10, 20)), cars, partition)
+        else:
+            vehicle = Truck(float(round(rng.triangular(5, 40, 20))), rng.choice(("синий", "белый", "красный")),
+                            partition)
+        count += 1
+        total_capacity += vehicle.capacity
+        yield vehicle
+
+
+def generate_workload(n_clients: int, seed: int = 1, vip_share: float = 0.1, weight_skew: float = 2.0,
+                      train_share: float = 0.1, headroom: float = FLEET_HEADROOM):
+    """Клиенты и парк, грузоподъемность которого на headroom превышает общий вес грузов"""
+    clients = list(generate_clients(n_clients, seed, vip_share, weight_skew))
+    total = sum(client.cargo_weight for client in clients)
+    vehicles = list(generate_vehicles(seed=seed + 1, train_share=train_share, min_capacity=total * headroom))
+    return clients, vehicles
+
+
+def build_company(n_vehicles: int, n_clients: int, seed: int = 1, partitions: int = 0):
+    """Компания с n_vehicles транспорта и n_clients клиентов (partitions > 0 - распределяет их по депо)"""
+    company = TransportCompany("Бенчмарк")
+    company.add_vehicles(generate_vehicles(n_vehicles, seed + 1, train_share=0.2, partitions=partitions))
+    company.add_clients(generate_clients(n_clients, seed, weight_scale=4.0, partitions=partitions))
+    return company
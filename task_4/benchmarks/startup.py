@@ -0,0 +1,103 @@
+#Замер времени запуска: python -X importtime в отдельном процессе и проверка ленивых импортов
+import os
+import subprocess
+import sys
+import time
+
+# Каталог программы: сценарии запускаются из него, как cli.py и main.py
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Сценарий: (аргументы интерпретатора, модули, которые он не должен импортировать)
+SCENARIOS = {
+    "cli.py --help": (["cli.py", "--help"],
+                      ("transport", "loaders", "snapshot", "packing", "numpy", "concurrent.futures", "cProfile")),
+    "import transport": (["-c", "import transport"], ("numpy", "concurrent.futures", "cProfile", "pstats")),
+}
+
+# Допустимое время запуска сценария сверх пустого интерпретатора (миллисекунды)
+STARTUP_LIMIT_MS = 100
+
+
+class StartupResult:
+    """Замер сценария: время запуска, импортированные модули и самые дорогие импорты верхнего уровня"""
+
+    def __init__(self, name: str, seconds: float, interpreter_seconds: float, modules: dict, forbidden: list):
+        self.name = name
+        self.seconds = seconds
+        self.interpreter_seconds = interpreter_seconds
+        self.modules = modules
+        self.forbidden = forbidden
+
+    @property
+    def overhead(self) -> float:
+        """Время сверх запуска пустого интерпретатора (секунды)"""
+        return max(self.seconds - self.interpreter_seconds, 0.0)
+
+    def top(self, limit: int = 5) -> list:
+        """Самые дорогие импорты верхнего уровня: [(модуль, накопленное время в мкс)]"""
+        return sorted(self.modules.items(), key=lambda item: -item[1])[:limit]
+
+    def __str__(self):
+        imports = ", ".join(f"{name} {us / 1000:.1f}мс" for name, us in self.top())
+        return f"{self.name:<24} {self.seconds * 1000:>8.1f}мс (+{self.overhead * 1000:.1f}мс) {imports}"
+
+
+def parse_importtime(stderr: str) -> tuple:
+    """
+    Разбирает вывод -X importtime: (все импортированные модули, {модуль верхнего уровня: накопленное время в мкс}).
+    Вложенность импорта в выводе обозначается отступом имени.
+    """
+    imported = set()
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        module = name.strip()
+        imported.add(module)
+        # Одиночный пробел после "|" - разделитель, дальнейшие - вложенность
+        if not name[1:].startswith(" "):
+            top_level[module] = int(cumulative)
+    return imported, top_level
+
+
+def _run(args: list, importtime: bool = False):
+    command = [sys.executable, *(["-X", "importtime"] if importtime else []), *args]
+    return subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+
+
+def _best_time(args: list, runs: int) -> float:
+    """Лучшее время запуска из runs (наименее искаженное шумом машины)"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run(args)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def measure_startup(runs: int = 5) -> list:
+    """Замеряет все сценарии; байткод компилируется заранее, чтобы не мерить компиляцию"""
+    # Код возврата не проверяется: устаревший __init__.py каталога не компилируется
+    subprocess.run([sys.executable, "-m", "compileall", "-q", ROOT], capture_output=True)
+    interpreter = _best_time(["-c", "pass"], runs)
+    results = []
+    for name, (args, lazy) in SCENARIOS.items():
+        imported, top_level = parse_importtime(_run(args, importtime=True).stderr)
+        forbidden = [module for module in lazy if module in imported]
+        results.append(StartupResult(name, _best_time(args, runs), interpreter, top_level, forbidden))
+    return results
+
+
+def check_startup(results: list, limit_ms: float = STARTUP_LIMIT_MS) -> list:
+    """Нарушения: (сценарий, описание) - лишние импорты и превышение времени запуска"""
+    violations = []
+    for result in results:
+        if result.forbidden:
+            violations.append((result.name, f"импортированы при запуске: {', '.join(result.forbidden)}"))
+        if result.overhead * 1000 > limit_ms:
+            violations.append((result.name, f"запуск {result.overhead * 1000:.1f}мс дольше {limit_ms:.0f}мс"))
+    return violations
@@ -0,0 +1,190 @@
+#Набор замеров по фазам работы компании со сравнением с сохраненной базой
+import contextlib
+import io
+import json
+import time
+import tracemalloc
+
+from benchmarks.generators import generate_workload
+from transport import Client, Truck, TransportCompany
+
+# Допустимое замедление относительно базы, после которого фаза считается регрессией
+REGRESSION_TOLERANCE = 0.25
+
+# Время фаз сравнивается в долях эталонной нагрузки, замеренной перед той же фазой:
+# так база не зависит от скорости машины. Эталон - лучший из REFERENCE_RUNS запусков
+REFERENCE_SIZE = 100_000
+REFERENCE_RUNS = 3
+
+# Фазы короче этого времени слишком шумные для сравнения с базой (секунды)
+MIN_COMPARABLE_SECONDS = 0.02
+
+
+class PhaseResult:
+    """Замер одной фазы: время (и его доля от эталона reference), пропускная способность и пиковая память"""
+
+    def __init__(self, name: str, items: int, seconds: float, peak_bytes: int = None, reference: float = None):
+        self.name = name
+        self.items = items
+        self.seconds = seconds
+        self.peak_bytes = peak_bytes
+        self.reference = reference
+
+    @property
+    def relative(self) -> float:
+        """Время фазы в долях эталонной нагрузки (None, если эталон не замерялся)"""
+        return self.seconds / self.reference if self.reference else None
+
+    @property
+    def throughput(self) -> float:
+        """Обработано объектов в секунду"""
+        return self.items / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict:
+        return {"items": self.items, "seconds": self.seconds, "relative": self.relative,
+                "peak_bytes": self.peak_bytes}
+
+    def __str__(self):
+        memory = f", пик памяти {self.peak_bytes / 2 ** 20:.1f} МБ" if self.peak_bytes is not None else ""
+        relative = f" ({self.relative:.3f} эталона)" if self.reference else ""
+        return (f"{self.name:<24} {self.seconds * 1000:>10.1f}мс{relative} "
+                f"{self.throughput:>12.0f} объектов/с{memory}")
+
+
+def _reference_workload():
+    """Эталонная нагрузка на чистом Python без кода программы: кортежи, словарь и сортировка"""
+    rows = [(i * 7919 % 10007, str(i)) for i in range(REFERENCE_SIZE)]
+    index = {name: weight for weight, name in rows}
+    rows.sort()
+    return len(index)
+
+
+def reference_seconds(runs: int = REFERENCE_RUNS) -> float:
+    """Время эталонной нагрузки на этой машине сейчас (лучшее из runs)"""
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        _reference_workload()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def median_of(runs: list) -> list:
+    """
+    Медианный замер каждой фазы из нескольких прогонов run_suite (по доле эталона). Медиана, а не лучший
+    замер: и база, и проверка берут один и тот же типичный прогон, а не случайно удачный
+    """
+    return [sorted(results, key=lambda result: result.relative or 0.0)[len(results) // 2]
+            for results in zip(*runs)]
+
+
+def _measure(name: str, items: int, func, trace_memory: bool, reference: float = None) -> PhaseResult:
+    """Выполняет фазу и снимает время и (по желанию) пик памяти через tracemalloc"""
+    if trace_memory:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - base if trace_memory else None
+    return PhaseResult(name, items, seconds, peak, reference)
+
+
+def run_suite(n_clients: int, seed: int = 1, trace_memory: bool = False, **workload) -> list:
+    """
+    Замеряет на синтетической нагрузке из n_clients клиентов:
+    создание объектов с валидацией, add_vehicle/add_client,
+    optimize_cargo_distribution и get_distribution_report.
+    Перед каждой фазой замеряется эталонная нагрузка: доли от нее сравнимы между машинами и запусками.
+    """
+    clients, vehicles = generate_workload(n_clients, seed, **workload)
+    # Исходные данные для фазы конструирования
+    client_rows = [(c.name, c.cargo_weight, c.is_vip) for c in clients]
+    vehicle_rows = [(type(v), v.capacity, v.color if isinstance(v, Truck) else v.number_of_cars) for v in vehicles]
+    company = TransportCompany("Бенчмарк")
+    results = []
+
+    def measure(name: str, items: int, func) -> PhaseResult:
+        # Эталон замеряется непосредственно перед фазой, чтобы попасть в то же состояние машины;
+        # с замером памяти время искажено tracemalloc и не сравнивается, эталон не нужен
+        reference = None if trace_memory else reference_seconds()
+        return _measure(name, items, func, trace_memory, reference)
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        results.append(measure("Создание клиентов", len(client_rows), lambda: [Client(*row) for row in client_rows]))
+        results.append(measure("Создание транспорта", len(vehicle_rows),
+                               lambda: [cls(capacity, extra) for cls, capacity, extra in vehicle_rows]))
+
+        def add_all_vehicles():
+            for vehicle in vehicles:
+                company.add_vehicle(vehicle)
+
+        def add_all_clients():
+            for client in clients:
+                company.add_client(client)
+
+        results.append(measure("add_vehicle", len(vehicles), add_all_vehicles))
+        results.append(measure("add_client", len(clients), add_all_clients))
+
+        def distribute():
+            # Предупреждения о не поместившихся грузах не должны попадать в замер вывода
+            with contextlib.redirect_stdout(io.StringIO()):
+                company.optimize_cargo_distribution()
+
+        results.append(measure("Распределение", len(clients), distribute))
+        results.append(measure("Отчет", len(clients), lambda: company.write_distribution_report(io.StringIO())))
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return results
+
+
+def load_baseline(path: str) -> dict:
+    """База: {размер: {фаза: замер}}"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, runs: dict, previous: dict = None):
+    """
+    Сохраняет замеры {размер: [PhaseResult]} как новую базу. Из previous берется то,
+    что текущий запуск не мерил: время при замере памяти и память при замере времени.
+    """
+    data = {}
+    for size, results in runs.items():
+        reference = (previous or {}).get(str(size), {})
+        data[str(size)] = {}
+        for result in results:
+            entry = result.to_dict()
+            old = reference.get(result.name, {})
+            if result.peak_bytes is None:
+                entry["peak_bytes"] = old.get("peak_bytes")
+            elif "seconds" in old:
+                entry["seconds"], entry["relative"] = old["seconds"], old.get("relative")
+            data[str(size)][result.name] = entry
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def compare_with_baseline(size: int, results: list, baseline: dict, tolerance: float = REGRESSION_TOLERANCE):
+    """
+    Возвращает список регрессий: (фаза, метрика, значение базы, текущее значение).
+    С замером памяти сравнивается пиковая память (tracemalloc замедляет работу), иначе время
+    в долях эталонной нагрузки: абсолютные секунды зависят от машины.
+    """
+    reference = baseline.get(str(size), {})
+    regressions = []
+    for result in results:
+        base = reference.get(result.name)
+        if not base:
+            continue
+        if result.peak_bytes is not None:
+            if base.get("peak_bytes") and result.peak_bytes > base["peak_bytes"] * (1 + tolerance):
+                regressions.append((result.name, "peak_bytes", base["peak_bytes"], result.peak_bytes))
+        elif (base.get("relative") and base["seconds"] >= MIN_COMPARABLE_SECONDS
+              and result.relative > base["relative"] * (1 + tolerance)):
+            regressions.append((result.name, "relative", base["relative"], result.relative))
+    return regressions
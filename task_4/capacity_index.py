@@ -0,0 +1,134 @@
+#Индекс свободной грузоподъемности для быстрого поиска подходящего транспорта
+
+
+class CapacityIndex:
+    """Дерево отрезков по свободной грузоподъемности открытых транспортных средств.
+
+    Слоты нумеруются в порядке открытия транспорта, поэтому find_first
+    возвращает тот же транспорт, что и линейный first-fit, но за O(log n).
+    """
+
+    EMPTY = float("-inf")
+
+    def __init__(self, slots: int):
+        self._validate_slots(slots)
+        self.size = 1
+        while self.size < slots:
+            self.size *= 2
+        self.tree = [self.EMPTY] * (2 * self.size)
+
+    def _validate_slots(self, slots: int):
+        """Валидация количества слотов"""
+        if not isinstance(slots, int) or slots < 0:
+            raise ValueError("Количество слотов должно быть неотрицательным целым числом")
+
+    def update(self, slot: int, free: float):
+        """Устанавливает свободную грузоподъемность слота"""
+        i = slot + self.size
+        tree = self.tree
+        tree[i] = free
+        i >>= 1
+        while i:
+            left = tree[2 * i]
+            right = tree[2 * i + 1]
+            tree[i] = left if left >= right else right
+            i >>= 1
+
+    def clear(self, slot: int):
+        """Исключает слот из поиска"""
+        self.update(slot, self.EMPTY)
+
+    def max_free(self) -> float:
+        """Максимальная свободная грузоподъемность среди всех слотов"""
+        return self.tree[1]
+
+    def find_first(self, weight: float, start: int = 0) -> int:
+        """Находит первый слот не раньше start, куда помещается груз (-1, если такого нет)"""
+        if start >= self.size:
+            return -1
+        tree = self.tree
+        i = start + self.size
+        while True:
+            if tree[i] >= weight:
+                # Спускаемся к самому левому подходящему листу
+                while i < self.size:
+                    i *= 2
+                    if tree[i] < weight:
+                        i += 1
+                return i - self.size
+            # Поднимаемся, пока узел является правым потомком, затем переходим к соседу справа
+            while i & 1:
+                i >>= 1
+                if i == 0:
+                    return -1
+            i += 1
+
+
+class VectorCapacityIndex:
+    """Дерево отрезков по свободному месту в нескольких измерениях (вес, объем, паллеты, вагон).
+
+    Узел хранит максимум каждого измерения по своим слотам отдельно. Это необходимое условие:
+    find_first спускается только в поддеревья, где каждого измерения хватает хотя бы
+    в одном слоте, а точную проверку делает вызывающий код.
+    """
+
+    EMPTY = float("-inf")
+
+    def __init__(self, slots: int, dimensions: int):
+        CapacityIndex._validate_slots(self, slots)
+        self.size = 1
+        while self.size < slots:
+            self.size *= 2
+        self.dimensions = dimensions
+        self.trees = [[self.EMPTY] * (2 * self.size) for _ in range(dimensions)]
+
+    def update(self, slot: int, free):
+        """Устанавливает свободное место слота (по одному числу на измерение)"""
+        for tree, value in zip(self.trees, free):
+            i = slot + self.size
+            tree[i] = value
+            i >>= 1
+            while i:
+                left = tree[2 * i]
+                right = tree[2 * i + 1]
+                tree[i] = left if left >= right else right
+                i >>= 1
+
+    def clear(self, slot: int):
+        """Исключает слот из поиска"""
+        self.update(slot, [self.EMPTY] * self.dimensions)
+
+    def _covers(self, i: int, need) -> bool:
+        for tree, value in zip(self.trees, need):
+            if tree[i] < value:
+                return False
+        return True
+
+    def find_first(self, need, start: int = 0) -> int:
+        """Первый слот не раньше start, где каждого измерения не меньше need (-1, если такого нет)"""
+        if start >= self.size:
+            return -1
+        i = start + self.size
+        while True:
+            if self._covers(i, need):
+                # Максимумы по измерениям могут достигаться в разных слотах,
+                # поэтому при спуске может понадобиться вернуться и идти правее
+                leaf = self._descend(i, need)
+                if leaf != -1:
+                    return leaf
+            while i & 1:
+                i >>= 1
+                if i == 0:
+                    return -1
+            i += 1
+
+    def _descend(self, i: int, need) -> int:
+        """Самый левый лист поддерева i, покрывающий need (-1, если такого нет)"""
+        if i >= self.size:
+            return i - self.size
+        for child in (2 * i, 2 * i + 1):
+            if self._covers(child, need):
+                leaf = self._descend(child, need)
+                if leaf != -1:
+                    return leaf
+        return -1
@@ -0,0 +1,200 @@
+#Пакетный запуск без интерактивного меню: загрузка файлов, распределение, отчет и выгрузка
+import argparse
+import sys
+
+# Коды возврата: 1 - ошибка (файл не найден, неверные параметры), 2 - неверные аргументы (argparse),
+# 3 - с --strict: в файлах есть отклоненные строки или остались не размещенные грузы
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_INCOMPLETE = 3
+
+# Сколько ошибок загрузки выводить в текстовом режиме
+ERROR_LIMIT = 10
+
+
+def _print_json(data: dict):
+    # json импортируется только для машиночитаемого вывода
+    import json
+    print(json.dumps(data, ensure_ascii=False))
+
+
+def _load_result_dict(result) -> dict:
+    return {"loaded": result.loaded, "errors": [{"line": line, "error": error} for line, error in result.errors],
+            "elapsed": result.elapsed}
+
+
+def _print_load_result(title: str, path: str, result):
+    print(f"{title} ({path}): {result}", file=sys.stderr)
+    for line, error in result.errors[:ERROR_LIMIT]:
+        print(f"  строка {line}: {error}", file=sys.stderr)
+    if len(result.errors) > ERROR_LIMIT:
+        print(f"  ... и еще {len(result.errors) - ERROR_LIMIT}", file=sys.stderr)
+
+
+def _build_company(args):
+    """Создает компанию из снимка и/или файлов транспорта и клиентов; возвращает (компания, {файл: LoadResult})"""
+    # Модели и загрузчики импортируются по требованию: --help не должен их загружать
+    from loaders import load_clients, load_vehicles
+    from transport import TransportCompany
+
+    if getattr(args, "snapshot", None):
+        from snapshot import load_company
+        company = load_company(args.snapshot)
+    else:
+        company = TransportCompany(args.name)
+    loads = {}
+    if args.vehicles:
+        loads["vehicles"] = load_vehicles(company, args.vehicles)
+    if args.clients:
+        loads["clients"] = load_clients(company, args.clients)
+    return company, loads
+
+
+def _report_loads(args, loads: dict):
+    if args.json:
+        return
+    titles = {"vehicles": "Транспорт", "clients": "Клиенты"}
+    for kind, result in loads.items():
+        _print_load_result(titles[kind], getattr(args, kind), result)
+
+
+def cmd_check(args) -> int:
+    """Проверяет файлы: загружает их в пустую компанию и сообщает об отклоненных строках"""
+    company, loads = _build_company(args)
+    if args.json:
+        _print_json({kind: _load_result_dict(result) for kind, result in loads.items()})
+    _report_loads(args, loads)
+    return EXIT_INCOMPLETE if any(result.errors for result in loads.values()) else EXIT_OK
+
+
+def _write_assignments(company, result, path: str):
+    """Выгружает распределение в JSONL: клиент, вес (т), транспорт и причина, если груз не размещен"""
+    import json
+    reasons = {client: reason for client, reason in result.unplaced}
+    with open(path, "w", encoding="utf-8") as out:
+        for client in company.clients:
+            row = {"client": client.name, "cargo_weight": client.cargo_weight,
+                   "vehicles": [vehicle.vehicle_id for vehicle in company.vehicles_of(client)]}
+            if client in reasons:
+                row["reason"] = reasons[client]
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def _write_report(company, path: str, start: int, stop: int):
+    if path == "-":
+        company.write_distribution_report(sys.stdout, start, stop)
+        return
+    with open(path, "w", encoding="utf-8") as out:
+        company.write_distribution_report(out, start, stop)
+
+
+def cmd_distribute(args) -> int:
+    """Загружает данные, распределяет грузы и выводит итоги; по желанию пишет отчет, выгрузку и снимок"""
+    company, loads = _build_company(args)
+    _report_loads(args, loads)
+    # Не размещенные грузы попадают в итоги команды, запись в журнал не нужна
+    company.on_unplaced = lambda result: None
+    if args.split:
+        # Не заданные параметры деления берутся по умолчанию компании
+        limits = {"min_chunk": args.min_chunk, "max_parts": args.max_parts}
+        company.enable_split_shipments(**{key: value for key, value in limits.items() if value is not None})
+    if args.partitioned:
+        used = company.optimize_partitioned(args.strategy, args.time_budget, args.workers)
+    else:
+        used = company.optimize_cargo_distribution(args.strategy, args.time_budget)
+    result = company.last_result
+    stats = result.stats
+
+    if args.report:
+        _write_report(company, args.report, args.start, args.stop)
+    if args.assignments:
+        _write_assignments(company, result, args.assignments)
+    if args.save_snapshot:
+        from snapshot import save_company
+        save_company(company, args.save_snapshot)
+
+    if args.json:
+        _print_json({
+            "company": company.name, "strategy": stats.strategy, "vehicles": len(company.vehicles),
+            "clients": len(company.clients), "vehicles_used": len(used), "fill_ratio": stats.fill_ratio,
+            "unplaced": len(result.unplaced), "unplaced_reasons": result.reasons(),
+            "lower_bound": stats.lower_bound, "gap": stats.gap, "cost": stats.cost, "elapsed": stats.elapsed,
+            "load": {kind: _load_result_dict(load) for kind, load in loads.items()},
+        })
+    elif args.report != "-":
+        print(result.summary())
+
+    incomplete = result.unplaced or any(load.errors for load in loads.values())
+    return EXIT_INCOMPLETE if args.strict and incomplete else EXIT_OK
+
+
+def cmd_report(args) -> int:
+    """Печатает отчет о распределении из снимка"""
+    from snapshot import load_company
+    company = load_company(args.snapshot)
+    _write_report(company, args.output, args.start, args.stop)
+    return EXIT_OK
+
+
+def _add_inputs(parser, snapshot: bool = True):
+    parser.add_argument("--vehicles", help="файл транспорта (CSV или JSONL)")
+    parser.add_argument("--clients", help="файл клиентов (CSV или JSONL)")
+    if snapshot:
+        parser.add_argument("--snapshot", help="начальные данные из снимка (файлы добавляются к ним)")
+    parser.add_argument("--name", default="Быстрая Доставка", help="название компании")
+    parser.add_argument("--json", action="store_true", help="машиночитаемый вывод (одна строка JSON)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python cli.py",
+                                     description="Пакетное распределение грузов транспортной компании")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("check", help="проверить файлы транспорта и клиентов")
+    _add_inputs(check, snapshot=False)
+    check.set_defaults(handler=cmd_check)
+
+    distribute = commands.add_parser("distribute", help="распределить грузы и вывести итоги")
+    _add_inputs(distribute)
+    # Список стратегий не проверяется здесь, чтобы --help не импортировал packing;
+    # неизвестную стратегию отклоняет компания со списком доступных
+    distribute.add_argument("--strategy", default="first_fit",
+                            help="стратегия упаковки: first_fit, ffd, bfd, exact, min_cost и др.")
+    distribute.add_argument("--time-budget", type=float, default=1.0, help="бюджет точного поиска (секунды)")
+    distribute.add_argument("--partitioned", action="store_true", help="распределять по партициям в пуле процессов")
+    distribute.add_argument("--workers", type=int, help="процессов для --partitioned")
+    distribute.add_argument("--split", action="store_true", help="делить не поместившиеся грузы на части")
+    distribute.add_argument("--min-chunk", type=float, help="наименьшая часть груза (т)")
+    distribute.add_argument("--max-parts", type=int, help="наибольшее число частей груза")
+    distribute.add_argument("--report", help="записать отчет о распределении в файл ('-' - в stdout)")
+    distribute.add_argument("--start", type=int, default=0, help="первый транспорт отчета")
+    distribute.add_argument("--stop", type=int, help="транспорт отчета до этого номера")
+    distribute.add_argument("--assignments", help="выгрузить распределение по клиентам в JSONL")
+    distribute.add_argument("--save-snapshot", help="сохранить компанию с распределением в снимок")
+    distribute.add_argument("--strict", action="store_true",
+                            help=f"код возврата {EXIT_INCOMPLETE}, если есть отклоненные строки или не размещенные грузы")
+    distribute.set_defaults(handler=cmd_distribute)
+
+    report = commands.add_parser("report", help="отчет о распределении из снимка")
+    report.add_argument("snapshot", help="файл снимка")
+    report.add_argument("--output", default="-", help="файл отчета ('-' - stdout)")
+    report.add_argument("--start", type=int, default=0)
+    report.add_argument("--stop", type=int)
+    report.set_defaults(handler=cmd_report)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "json", False) and getattr(args, "report", None) == "-":
+        parser.error("--report - и --json оба пишут в stdout")
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
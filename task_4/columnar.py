@@ -0,0 +1,208 @@
+#Колоночное хранилище парка и клиентов на массивах NumPy
+try:
+    import numpy as np
+except ImportError:  # NumPy - необязательная зависимость
+    np = None
+
+from packing import DEFAULT_PRIORITY
+
+# Начальный размер массивов; при заполнении емкость удваивается
+INITIAL_CAPACITY = 64
+
+# Номер транспорта для нераспределенного клиента
+UNASSIGNED = -1
+
+
+class ColumnarStore:
+    """
+    Непрерывные массивы capacity_kg, load_kg (по транспорту) и cargo_kg, is_vip, priority,
+    assignment (по клиентам); вес хранится в целых килограммах. store.vehicles[i] и store.clients[j] -
+    объекты i-й и j-й строк, но строки - копии их полей, а не представления: хранилище обновляет
+    TransportCompany. Изменения нужно вносить через компанию (распределение, update_client, remove_*);
+    прямой vehicle.load_cargo(client) или правка полей объекта оставляет строки устаревшими.
+    Хранилище служит агрегатам отчета; проверки вместимости при распределении идут через индекс
+    свободной грузоподъемности (capacity_index.py), которому полный проход по столбцу проигрывает.
+    """
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("Для колоночного хранилища требуется пакет numpy")
+        self.vehicles = []
+        self.clients = []
+        self._vehicle_rows = {}
+        self._client_rows = {}
+        self._capacity_kg = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self._load_kg = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self._cargo_kg = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self._is_vip = np.zeros(INITIAL_CAPACITY, dtype=bool)
+        self._priority = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self._assignment = np.full(INITIAL_CAPACITY, UNASSIGNED, dtype=np.int64)
+
+    @staticmethod
+    def _grow(array, size: int, fill=0):
+        """Возвращает массив емкостью не меньше size, сохраняя данные"""
+        if size <= len(array):
+            return array
+        grown = np.full(max(size, 2 * len(array)), fill, dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    # Представления заполненной части массивов
+
+    @property
+    def capacity_kg(self):
+        return self._capacity_kg[:len(self.vehicles)]
+
+    @property
+    def load_kg(self):
+        return self._load_kg[:len(self.vehicles)]
+
+    @property
+    def cargo_kg(self):
+        return self._cargo_kg[:len(self.clients)]
+
+    @property
+    def is_vip(self):
+        return self._is_vip[:len(self.clients)]
+
+    @property
+    def priority(self):
+        return self._priority[:len(self.clients)]
+
+    @property
+    def assignment(self):
+        return self._assignment[:len(self.clients)]
+
+    def add_vehicle(self, vehicle):
+        """Добавляет строку транспорта"""
+        row = len(self.vehicles)
+        self._capacity_kg = self._grow(self._capacity_kg, row + 1)
+        self._load_kg = self._grow(self._load_kg, row + 1)
+        self._capacity_kg[row] = vehicle.capacity_kg
+        self._load_kg[row] = vehicle.load_kg
+        self._vehicle_rows[vehicle] = row
+        self.vehicles.append(vehicle)
+
+    def add_client(self, client):
+        """Добавляет строку клиента"""
+        row = len(self.clients)
+        self._cargo_kg = self._grow(self._cargo_kg, row + 1)
+        self._is_vip = self._grow(self._is_vip, row + 1, False)
+        self._priority = self._grow(self._priority, row + 1)
+        self._assignment = self._grow(self._assignment, row + 1, UNASSIGNED)
+        self._cargo_kg[row] = client.cargo_kg
+        self._is_vip[row] = client.is_vip
+        self._priority[row] = client.priority
+        self._assignment[row] = UNASSIGNED
+        self._client_rows[client] = row
+        self.clients.append(client)
+
+    def sync_assignment(self):
+        """Переносит в массивы загрузку транспорта и распределение клиентов"""
+        self.load_kg[:] = [vehicle.load_kg for vehicle in self.vehicles]
+        assignment = self.assignment
+        assignment[:] = UNASSIGNED
+        client_rows = self._client_rows
+        for row, vehicle in enumerate(self.vehicles):
+            if vehicle.clients_list:
+                # Части разделенного груза строк не имеют: такой клиент остается нераспределенным
+                assignment[[client_rows[client] for client in vehicle.clients_list if client in client_rows]] = row
+
+    def update_assignment(self, client, vehicle):
+        """Записывает распределение одного клиента и загрузку его транспорта"""
+        row = self._vehicle_rows[vehicle]
+        self._assignment[self._client_rows[client]] = row
+        self._load_kg[row] = vehicle.load_kg
+
+    def update_load(self, vehicle):
+        """Записывает текущую загрузку транспорта"""
+        self._load_kg[self._vehicle_rows[vehicle]] = vehicle.load_kg
+
+    def remove_client(self, client, vehicle=None):
+        """Удаляет строку клиента, перенося на ее место последнюю строку"""
+        row = self._client_rows.pop(client)
+        last = len(self.clients) - 1
+        if row != last:
+            moved = self.clients[last]
+            self.clients[row] = moved
+            self._client_rows[moved] = row
+            self._cargo_kg[row] = self._cargo_kg[last]
+            self._is_vip[row] = self._is_vip[last]
+            self._priority[row] = self._priority[last]
+            self._assignment[row] = self._assignment[last]
+        self.clients.pop()
+        if vehicle is not None:
+            self._load_kg[self._vehicle_rows[vehicle]] = vehicle.load_kg
+
+    def update_client(self, client, vehicle=None):
+        """Переписывает строку клиента после изменения груза; груз снят с транспорта vehicle"""
+        row = self._client_rows[client]
+        self._cargo_kg[row] = client.cargo_kg
+        self._is_vip[row] = client.is_vip
+        self._priority[row] = client.priority
+        self._assignment[row] = UNASSIGNED
+        if vehicle is not None:
+            self._load_kg[self._vehicle_rows[vehicle]] = vehicle.load_kg
+
+    def remove_vehicle(self, vehicle):
+        """
+        Удаляет строку транспорта со сдвигом следующих строк: порядок транспорта в отчете остается
+        порядком добавления. Его клиенты становятся нераспределенными. O(количество транспорта),
+        как и удаление из списка транспорта компании.
+        """
+        row = self._vehicle_rows.pop(vehicle)
+        size = len(self.vehicles)
+        self._capacity_kg[row:size - 1] = self._capacity_kg[row + 1:size]
+        self._load_kg[row:size - 1] = self._load_kg[row + 1:size]
+        assignment = self.assignment
+        assignment[assignment == row] = UNASSIGNED
+        assignment[assignment > row] -= 1
+        del self.vehicles[row]
+        vehicle_rows = self._vehicle_rows
+        for shifted in range(row, size - 1):
+            vehicle_rows[self.vehicles[shifted]] = shifted
+
+    def used_vehicles(self):
+        """Транспорт с ненулевой загрузкой"""
+        return [self.vehicles[row] for row in np.flatnonzero(self.load_kg > 0)]
+
+    def clients_of(self, vehicle):
+        """Клиенты, распределенные в транспорт"""
+        rows = np.flatnonzero(self.assignment == self._vehicle_rows[vehicle])
+        return [self.clients[row] for row in rows]
+
+    def totals(self, by_priority: bool = False, split=()):
+        """
+        Агрегаты по клиентам, как TransportCompany._client_totals: (всего клиентов, VIP клиентов,
+        общий вес в кг, вес VIP в кг, уровни, ожидающие). С by_priority уровни -
+        {приоритет: [клиентов, размещено клиентов, вес в кг, размещенный вес в кг]}, ожидающие -
+        не размещенные клиенты приоритета выше обычного; иначе оба пустые.
+        split - разделенные клиенты: у частей нет строк, но такой груз считается размещенным.
+        """
+        cargo_kg = self.cargo_kg
+        is_vip = self.is_vip
+        tiers = {}
+        waiting = []
+        if by_priority and len(self.clients):
+            placed = self.assignment != UNASSIGNED
+            if split:
+                placed[[self._client_rows[client] for client in split]] = True
+            levels, tier_rows = np.unique(self.priority, return_inverse=True)
+            size = len(levels)
+            # Веса в bincount суммируются в float64: суммы до 2**53 кг точные
+            counts = np.bincount(tier_rows, minlength=size)
+            placed_counts = np.bincount(tier_rows[placed], minlength=size)
+            total = np.bincount(tier_rows, weights=cargo_kg, minlength=size)
+            placed_total = np.bincount(tier_rows[placed], weights=cargo_kg[placed], minlength=size)
+            for i, level in enumerate(levels.tolist()):
+                tiers[level] = [int(counts[i]), int(placed_counts[i]), int(total[i]), int(placed_total[i])]
+            clients = self.clients
+            waiting = [clients[row] for row in np.flatnonzero(~placed & (self.priority > DEFAULT_PRIORITY))]
+        return (
+            len(self.clients),
+            int(np.count_nonzero(is_vip)),
+            int(cargo_kg.sum()),
+            int(cargo_kg[is_vip].sum()),
+            tiers,
+            waiting,
+        )
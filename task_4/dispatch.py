@@ -0,0 +1,289 @@
+#Онлайн-диспетчеризация: клиенты размещаются по мере поступления, транспорт отправляется по заполнению или окну
+import bisect
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+from instrumentation import latency_summary
+
+# Открытый транспорт отправляется не позже, чем через столько секунд после открытия
+DISPATCH_WINDOW = 600.0
+
+# Доля грузоподъемности, при которой транспорт отправляется сразу
+DISPATCH_FILL = 0.95
+
+# Емкость очереди поступающих клиентов: при заполнении submit() ждет
+QUEUE_SIZE = 10_000
+
+# Период фонового прохода: отправка по окну и уплотнение открытого транспорта (секунды)
+TICK_INTERVAL = 5.0
+
+# Сколько последних замеров задержки и ошибок хранить
+LATENCY_SAMPLES = 10_000
+
+# Сигнал остановки фонового потока
+_STOP = object()
+
+
+class RollingDispatcher:
+    """
+    Онлайн-распределение грузов компании. Клиент размещается сразу по поступлении: best-fit
+    по открытому транспорту (наименьший подходящий остаток), иначе открывается самый большой
+    свободный транспорт. Транспорт закрывается и отправляется, когда заполнен на fill или
+    открыт дольше window секунд; release() возвращает его после доставки.
+    tick() отправляет просроченный транспорт и уплотняет открытый: грузы наименее загруженного
+    переносятся в остальные, и он освобождается. После start() клиенты берутся фоновым потоком
+    из очереди на queue_size записей, а tick() выполняется каждые tick_interval секунд.
+    Пока диспетчер работает, пакетная дозагрузка компании не используется.
+    """
+
+    def __init__(self, company, window: float = DISPATCH_WINDOW, fill: float = DISPATCH_FILL,
+                 queue_size: int = QUEUE_SIZE, tick_interval: float = TICK_INTERVAL,
+                 on_dispatch=None, clock=time.monotonic):
+        if window <= 0 or tick_interval <= 0:
+            raise ValueError("Окно и период должны быть положительными")
+        if not 0 < fill <= 1:
+            raise ValueError("Доля заполнения должна быть в пределах (0, 1]")
+        self.company = company
+        self.window = window
+        self.fill = fill
+        self.tick_interval = tick_interval
+        self.on_dispatch = on_dispatch
+        self.clock = clock
+        # Дозагрузка компании работала бы с тем же транспортом параллельно диспетчеру
+        company.detach_incremental()
+        # Свободный транспорт по возрастанию грузоподъемности: самый большой в конце
+        self._free = sorted((v for v in company.vehicles if not v.load_kg), key=lambda x: x.capacity_kg)
+        # Открытый транспорт: отсортированные пары (свободно кг, слот) и слот -> (транспорт, время открытия)
+        self._open = []
+        self._slots = {}
+        self._keys = {}
+        self._slot_ids = itertools.count()
+        self.dispatched = []
+        self.unplaced = []
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+        self.queue_latencies = deque(maxlen=LATENCY_SAMPLES)
+        # Ошибки фонового потока: (клиент, исключение); у ошибок периодического прохода клиент None
+        self.errors = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.RLock()
+        self._queue = queue.Queue(queue_size)
+        self._thread = None
+
+    # Размещение
+
+    def place(self, client):
+        """Добавляет клиента в компанию и сразу размещает его груз; возвращает транспорт или None"""
+        started = time.perf_counter()
+        with self._lock:
+            self.company.add_client(client)
+            vehicle = self._place(client)
+        self.latencies.append(time.perf_counter() - started)
+        return vehicle
+
+    def _place(self, client):
+        vehicle = self._take_best_fit(client)
+        if vehicle is None:
+            vehicle = self._open_vehicle(client)
+            if vehicle is None:
+                self.unplaced.append(client)
+                return None
+        self._load(vehicle, client)
+        return vehicle
+
+    def _take_best_fit(self, client):
+        """Открытый транспорт с наименьшим подходящим остатком, снятый с индекса (None, если такого нет)"""
+        pos = bisect.bisect_left(self._open, (client.cargo_kg, -1))
+        while pos < len(self._open):
+            vehicle = self._slots[self._open[pos][1]][0]
+            if vehicle.fits(client):
+                del self._open[pos]
+                return vehicle
+            pos += 1
+        return None
+
+    def _open_vehicle(self, client):
+        """Открывает самый большой подходящий свободный транспорт"""
+        for pos in range(len(self._free) - 1, -1, -1):
+            if self._free[pos].fits(client):
+                vehicle = self._free.pop(pos)
+                slot = next(self._slot_ids)
+                self._slots[slot] = (vehicle, self.clock())
+                self._keys[vehicle] = slot
+                return vehicle
+        return None
+
+    def _load(self, vehicle, client):
+        """Загружает груз в снятый с индекса транспорт и возвращает транспорт в индекс (или отправляет)"""
+        self.company.place_client(client, vehicle)
+        if self._full(vehicle):
+            self._dispatch(vehicle)
+        else:
+            self._index(vehicle)
+
+    def _full(self, vehicle) -> bool:
+        return vehicle.load_kg >= self.fill * vehicle.capacity_kg
+
+    def _index(self, vehicle):
+        bisect.insort(self._open, (vehicle.capacity_kg - vehicle.load_kg, self._keys[vehicle]))
+
+    def _unindex(self, vehicle):
+        key = (vehicle.capacity_kg - vehicle.load_kg, self._keys[vehicle])
+        del self._open[bisect.bisect_left(self._open, key)]
+
+    def _dispatch(self, vehicle):
+        """Отправляет транспорт (он уже снят с индекса)"""
+        del self._slots[self._keys.pop(vehicle)]
+        self.dispatched.append(vehicle)
+        if self.on_dispatch is not None:
+            self.on_dispatch(vehicle)
+
+    def add_vehicle(self, vehicle):
+        """Добавляет транспорт в компанию и в свободный резерв диспетчера"""
+        with self._lock:
+            self.company.add_vehicle(vehicle)
+            bisect.insort(self._free, vehicle, key=lambda x: x.capacity_kg)
+
+    # Отправка и уплотнение
+
+    def tick(self):
+        """Отправляет транспорт с истекшим окном и уплотняет открытый. Возвращает отправленный транспорт"""
+        with self._lock:
+            deadline = self.clock() - self.window
+            expired = [vehicle for vehicle, opened in self._slots.values() if opened <= deadline]
+            for vehicle in expired:
+                self._unindex(vehicle)
+                self._dispatch(vehicle)
+            self.consolidate()
+        return expired
+
+    def consolidate(self) -> int:
+        """
+        Переносит грузы наименее загруженного открытого транспорта в остальной открытый
+        (best-fit, тяжелые первыми); полностью разгруженный транспорт возвращается в свободный.
+        Останавливается на первом транспорте, который разгрузить не удалось. Возвращает число освобожденных.
+        """
+        freed = 0
+        with self._lock:
+            for vehicle in sorted((v for v, _ in self._slots.values()), key=lambda x: x.load_kg):
+                if vehicle not in self._keys:
+                    # Заполнился и отправлен при разгрузке предыдущего
+                    continue
+                if not self._empty_into_open(vehicle):
+                    break
+                del self._slots[self._keys.pop(vehicle)]
+                vehicle.clear_cargo()
+                bisect.insort(self._free, vehicle, key=lambda x: x.capacity_kg)
+                freed += 1
+        return freed
+
+    def _empty_into_open(self, vehicle) -> bool:
+        """Пытается перенести все грузы транспорта в другой открытый; при неудаче возвращает их обратно"""
+        # Снятый с индекса транспорт не может стать целью переноса
+        self._unindex(vehicle)
+        moved = []
+        for client in sorted(vehicle.clients_list, key=lambda x: x.cargo_kg, reverse=True):
+            target = self._take_best_fit(client)
+            if target is None:
+                for done, target in reversed(moved):
+                    self._unindex(target)
+                    self.company.place_client(done, vehicle, previous=target)
+                    self._index(target)
+                self._index(vehicle)
+                return False
+            self.company.place_client(client, target, previous=vehicle)
+            self._index(target)
+            moved.append((client, target))
+        # Отправка только после успешного переноса, чтобы откат не трогал отправленный транспорт
+        for target in dict.fromkeys(target for _, target in moved):
+            if target in self._keys and self._full(target):
+                self._unindex(target)
+                self._dispatch(target)
+        return True
+
+    def dispatch_all(self):
+        """Отправляет весь открытый транспорт (конец смены)"""
+        with self._lock:
+            vehicles = [vehicle for vehicle, _ in self._slots.values()]
+            for vehicle in vehicles:
+                self._unindex(vehicle)
+                self._dispatch(vehicle)
+        return vehicles
+
+    def release(self, vehicle):
+        """
+        Транспорт вернулся после доставки: его клиенты удаляются из компании, он снова свободен,
+        а не поместившиеся ранее грузы размещаются заново.
+        """
+        with self._lock:
+            if vehicle not in self.dispatched:
+                raise ValueError(f"Транспорт {vehicle.vehicle_id} не отправлялся")
+            self.dispatched.remove(vehicle)
+            for client in list(vehicle.clients_list):
+                self.company.remove_client(client)
+            vehicle.clear_cargo()
+            bisect.insort(self._free, vehicle, key=lambda x: x.capacity_kg)
+            waiting, self.unplaced = self.unplaced, []
+            for client in waiting:
+                self._place(client)
+
+    # Очередь и фоновый поток
+
+    def submit(self, client, timeout: float = None):
+        """Ставит клиента в очередь; при полной очереди ждет (queue.Full по истечении timeout)"""
+        self._queue.put((client, time.perf_counter()), timeout=timeout)
+
+    def start(self):
+        """Запускает фоновый поток размещения и периодических проходов"""
+        if self._thread is not None:
+            raise ValueError("Диспетчер уже запущен")
+        self._thread = threading.Thread(target=self._run, name="rolling-dispatch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Дожидается размещения клиентов из очереди и останавливает поток"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        next_tick = self.clock() + self.tick_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, next_tick - self.clock()))
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                break
+            if item is not None:
+                client, submitted = item
+                # Ошибка клиента или обработчика on_dispatch не должна останавливать поток:
+                # она попадает в errors, а очередь продолжает обслуживаться
+                try:
+                    self.place(client)
+                except Exception as e:
+                    self.errors.append((client, e))
+                self.queue_latencies.append(time.perf_counter() - submitted)
+            if self.clock() >= next_tick:
+                try:
+                    self.tick()
+                except Exception as e:
+                    self.errors.append((None, e))
+                next_tick = self.clock() + self.tick_interval
+
+    def stats(self) -> dict:
+        """Состояние диспетчера и задержки: размещение и путь от submit() до размещения"""
+        with self._lock:
+            return {
+                "open": len(self._slots),
+                "free": len(self._free),
+                "dispatched": len(self.dispatched),
+                "unplaced": len(self.unplaced),
+                "queued": self._queue.qsize(),
+                "errors": len(self.errors),
+                "place": latency_summary(self.latencies),
+                "queue": latency_summary(self.queue_latencies),
+            }
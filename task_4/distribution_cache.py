@@ -0,0 +1,45 @@
+#Ограниченный LRU-кэш результатов распределения
+from collections import OrderedDict
+
+
+class DistributionCache:
+    """
+    Последние maxsize распределений по ключу (отпечаток данных, стратегия, бюджет времени).
+    Считает попадания и промахи; самая давно использованная запись вытесняется первой.
+    """
+
+    def __init__(self, maxsize: int = 8):
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError("Размер кэша должен быть неотрицательным целым числом")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Запись по ключу (None при промахе)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        if not self.maxsize:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __str__(self):
+        return (f"Кэш распределений: {len(self._entries)}/{self.maxsize}, "
+                f"Попаданий: {self.hits}, Промахов: {self.misses}")
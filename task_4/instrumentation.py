@@ -0,0 +1,167 @@
+#Необязательные счетчики, таймеры фаз и профилирование распределения грузов
+import contextlib
+import io
+import json
+import time
+
+# Общий пустой контекст для выключенного режима, чтобы не создавать объект на каждую фазу
+_NO_PHASE = contextlib.nullcontext()
+
+
+class RunStats:
+    """
+    Счетчики и время фаз одного запуска распределения. Счетчики ведут сами стратегии упаковки
+    и дозагрузка, получая RunStats запуска параметром stats: проверка - поиск транспорта в индексе
+    свободного места или проверка fits одного транспорта, загрузка - размещенный груз.
+    """
+
+    def __init__(self, strategy: str, clients: int):
+        self.strategy = strategy
+        self.clients = clients
+        # Проверки транспорта, загрузки, открытый транспорт и неудачные размещения
+        self.probes = 0
+        self.loads = 0
+        self.vehicles_opened = 0
+        self.placement_failures = 0
+        self.phases = {}
+        # Интервалы фаз (название, начало, длительность) для экспорта трассы
+        self.spans = []
+        self.elapsed = 0.0
+
+    @contextlib.contextmanager
+    def phase(self, name: str, replace: bool = False):
+        """Замер фазы: время повторов фазы за запуск складывается, с replace - заменяет прежнее"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if replace:
+                self.phases[name] = seconds
+                self.spans = [span for span in self.spans if span[0] != name]
+            else:
+                self.phases[name] = self.phases.get(name, 0.0) + seconds
+            self.spans.append((name, start, seconds))
+
+    def add_counters(self, other: "RunStats"):
+        """Прибавляет счетчики другого запуска (упаковки партиции в процессе-исполнителе)"""
+        self.probes += other.probes
+        self.loads += other.loads
+        self.vehicles_opened += other.vehicles_opened
+        self.placement_failures += other.placement_failures
+
+    @property
+    def probes_per_client(self) -> float:
+        """Среднее число проверок вместимости на одного клиента"""
+        return self.probes / self.clients if self.clients else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "strategy": self.strategy,
+            "clients": self.clients,
+            "probes": self.probes,
+            "probes_per_client": self.probes_per_client,
+            "loads": self.loads,
+            "vehicles_opened": self.vehicles_opened,
+            "placement_failures": self.placement_failures,
+            "phases": dict(self.phases),
+            "elapsed": self.elapsed,
+        }
+
+    def __str__(self):
+        phases = ", ".join(f"{name} {seconds * 1000:.1f}мс" for name, seconds in self.phases.items())
+        return (f"Стратегия: {self.strategy}, Клиентов: {self.clients}, "
+                f"Проверок на клиента: {self.probes_per_client:.1f}, "
+                f"Загрузок: {self.loads}, "
+                f"Открыто транспорта: {self.vehicles_opened}, "
+                f"Неудачных размещений: {self.placement_failures}, "
+                f"Фазы: {phases or 'нет'}")
+
+
+class Instrumentation:
+    """
+    Сбор статистики запусков распределения одной компании: у каждого запуска свой RunStats,
+    который компания передает стратегиям упаковки. Классы транспорта не меняются, поэтому
+    другие компании процесса ничего не считают. profile - дополнительно снимать профиль cProfile каждого запуска.
+    """
+
+    def __init__(self, profile: bool = False):
+        self.profile = profile
+        self.profiler = None
+        if profile:
+            # cProfile и pstats импортируются по требованию, чтобы не замедлять запуск программы
+            import cProfile
+            self.profiler = cProfile.Profile()
+        self.last_run = None
+        # Идущий запуск; вне запуска None
+        self.current = None
+
+    @contextlib.contextmanager
+    def run(self, strategy: str, clients: int):
+        """Запуск распределения: новый RunStats (счетчики и фазы с нуля) и (по желанию) профилирование"""
+        self.current = self.last_run = RunStats(strategy, clients)
+        start = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            yield self.last_run
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+            self.current = None
+            self.last_run.elapsed = time.perf_counter() - start
+
+    def phase(self, name: str):
+        """
+        Замер фазы идущего запуска. Вне запуска (отчет) фаза относится к последнему запуску
+        и заменяет прежний замер; до первого запуска - пустой контекст.
+        """
+        if self.current is not None:
+            return self.current.phase(name)
+        if self.last_run is not None:
+            return self.last_run.phase(name, replace=True)
+        return _NO_PHASE
+
+    def profile_summary(self, limit: int = 20, sort: str = "cumulative") -> str:
+        """Самые затратные функции по накопленному профилю"""
+        if self.profiler is None:
+            return "Профилирование выключено"
+        import pstats
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def export_profile(self, path: str):
+        """Сохраняет профиль в формате pstats (snakeviz, python -m pstats)"""
+        if self.profiler is None:
+            raise ValueError("Профилирование выключено: создайте Instrumentation(profile=True)")
+        self.profiler.dump_stats(path)
+
+    def export_trace(self, path: str):
+        """Сохраняет фазы последнего запуска в формате Chrome Trace Event (chrome://tracing, Perfetto)"""
+        if self.last_run is None:
+            raise ValueError("Нет завершенных запусков")
+        events = [{"name": name, "ph": "X", "pid": 0, "tid": 0,
+                   "ts": start * 1e6, "dur": seconds * 1e6}
+                  for name, start, seconds in self.last_run.spans]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "otherData": self.last_run.to_dict()}, f, ensure_ascii=False)
+
+
+def latency_summary(samples) -> dict:
+    """Количество замеров и p50/p99 в миллисекундах"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0, "p50_ms": 0.0, "p99_ms": 0.0}
+    return {
+        "count": len(ordered),
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p99_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000,
+    }
+
+
+def phase(stats, name: str):
+    """Контекст замера фазы запуска stats; без статистики (None) - общий пустой контекст"""
+    if stats is None:
+        return _NO_PHASE
+    return stats.phase(name)
@@ -0,0 +1,163 @@
+#Пакетная загрузка клиентов и транспорта из файлов CSV и JSONL
+import csv
+import itertools
+import json
+import time
+
+from transport import Client, Truck, Train, validate_clients
+
+# Количество строк, читаемых и проверяемых за один шаг
+CHUNK_SIZE = 10_000
+
+# Значения поля is_vip в CSV, означающие VIP клиента (как в интерактивном меню)
+VIP_VALUES = {"да", "д", "yes", "y", "true", "1"}
+
+
+class LoadResult:
+    """Итоги загрузки файла: число загруженных строк и ошибки по строкам"""
+
+    def __init__(self, loaded: int, errors: list, elapsed: float):
+        self.loaded = loaded
+        self.errors = errors
+        self.elapsed = elapsed
+
+    @property
+    def rows_per_second(self) -> float:
+        """Пропускная способность загрузки (строк в секунду)"""
+        rows = self.loaded + len(self.errors)
+        return rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"Загружено: {self.loaded}, Ошибок: {len(self.errors)}, "
+                f"Скорость: {self.rows_per_second:.0f} строк/с")
+
+
+def _read_rows(path: str):
+    """
+    Потоково читает строки файла: (номер строки, запись).
+    Строки JSONL отдаются как текст и разбираются при проверке, чтобы ошибка попала в отчет.
+    """
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield line_no, line
+    elif path.endswith(".csv"):
+        with open(path, encoding="utf-8", newline="") as f:
+            # Первая строка файла - заголовок
+            for line_no, row in enumerate(csv.DictReader(f), 2):
+                yield line_no, row
+    else:
+        raise ValueError("Поддерживаются только файлы .csv и .jsonl")
+
+
+def _parse_bool(value):
+    """Приводит значение поля is_vip из CSV к bool; остальное оставляет для валидации"""
+    if isinstance(value, str):
+        return value.strip().lower() in VIP_VALUES
+    return value
+
+
+def _parse_number(value):
+    """Приводит строковое число из CSV к float; остальное оставляет для валидации"""
+    if isinstance(value, str):
+        return float(value)
+    return value
+
+
+def _parse_optional(value, parse):
+    """Необязательное поле: пустое значение - None, строка из CSV приводится через parse"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return parse(value)
+    return value
+
+
+def _limits(row: dict) -> tuple:
+    """Необязательные поля транспорта: partition, max_volume, max_pallets, fixed_cost, cost_per_tonne"""
+    return (row.get("partition") or None, _parse_optional(row.get("max_volume"), float),
+            _parse_optional(row.get("max_pallets"), int),
+            _parse_optional(row.get("fixed_cost"), float) or 0.0,
+            _parse_optional(row.get("cost_per_tonne"), float) or 0.0)
+
+
+def _client_fields(row: dict) -> tuple:
+    """
+    Поля клиента (name, cargo_weight, is_vip, partition, volume, pallets, priority, deadline)
+    из записи, пока без валидации
+    """
+    return (row["name"], _parse_number(row["cargo_weight"]), _parse_bool(row.get("is_vip", False)),
+            row.get("partition") or None, _parse_optional(row.get("volume"), float),
+            _parse_optional(row.get("pallets"), int), _parse_optional(row.get("priority"), int),
+            _parse_optional(row.get("deadline"), float))
+
+
+def client_from_row(row: dict) -> Client:
+    """
+    Создает клиента из записи с полями name, cargo_weight, is_vip
+    и необязательными partition, volume, pallets, priority, deadline
+    """
+    return Client(*_client_fields(row))
+
+
+def _build_clients(parsed: list, objects: list) -> list:
+    """Проверяет порцию полей клиентов одним проходом и создает прошедших проверку без повторной валидации"""
+    errors = validate_clients([fields for _, fields in parsed])
+    objects.extend(Client.trusted(*fields) for i, (_, fields) in enumerate(parsed) if i not in errors)
+    return [(parsed[i][0], error) for i, error in errors.items()]
+
+
+def vehicle_from_row(row: dict):
+    """
+    Создает транспорт из записи с полями type (truck/train), capacity, color или number_of_cars
+    и необязательными partition, max_volume, max_pallets, fixed_cost, cost_per_tonne
+    """
+    vehicle_type = row["type"].strip().lower()
+    capacity = _parse_number(row["capacity"])
+    if vehicle_type == "truck":
+        return Truck(capacity, row["color"], *_limits(row))
+    if vehicle_type == "train":
+        cars = row["number_of_cars"]
+        return Train(capacity, int(cars) if isinstance(cars, str) else cars, *_limits(row))
+    raise ValueError(f"Неизвестный тип транспорта: {row['type']}")
+
+
+def _load(path: str, parse, add_batch, chunk_size: int, build_chunk=None) -> LoadResult:
+    """
+    Читает файл порциями, собирает ошибки по строкам и добавляет валидные объекты одним шагом.
+    parse разбирает запись; build_chunk, если задан, проверяет и создает объекты всей порции сразу.
+    """
+    start = time.perf_counter()
+    rows = _read_rows(path)
+    objects = []
+    errors = []
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            break
+        parsed = []
+        for line_no, row in chunk:
+            try:
+                if isinstance(row, str):
+                    row = json.loads(row)
+                parsed.append((line_no, parse(row)))
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                errors.append((line_no, f"{type(e).__name__}: {e}"))
+        if build_chunk is None:
+            objects.extend(value for _, value in parsed)
+        else:
+            errors.extend((line_no, f"{type(e).__name__}: {e}") for line_no, e in build_chunk(parsed, objects))
+    errors.sort(key=lambda error: error[0])
+    add_batch(objects)
+    return LoadResult(len(objects), errors, time.perf_counter() - start)
+
+
+def load_clients(company, path: str, chunk_size: int = CHUNK_SIZE) -> LoadResult:
+    """Загружает клиентов из CSV/JSONL в компанию"""
+    return _load(path, _client_fields, company.add_clients, chunk_size, _build_clients)
+
+
+def load_vehicles(company, path: str, chunk_size: int = CHUNK_SIZE) -> LoadResult:
+    """Загружает транспорт из CSV/JSONL в компанию"""
+    return _load(path, vehicle_from_row, company.add_vehicles, chunk_size)
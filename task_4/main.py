@@ -1,8 +1,24 @@
+import logging
+import sys
+
+from packing import STRATEGIES
 from transport import Client, Truck, Train, TransportCompany
 
+# Количество транспортных средств на одной странице отчета
+REPORT_PAGE_SIZE = 20
+
+
+def input_optional(prompt: str, parse):
+    """Необязательный ввод: Enter - значение не задано (None)"""
+    value = input(prompt).strip()
+    return parse(value) if value else None
+
 def main():
     """Основная функция программы - меню транспортной компании."""
     
+    # Итоги распределения меню выводит само сводкой; журнал показывает только ошибки
+    logging.basicConfig(level=logging.ERROR, format="%(levelname)s: %(message)s")
+    
     # Создаем транспортную компанию с названием "Быстрая Доставка"
     company = TransportCompany("Быстрая Доставка")
     
@@ -17,6 +33,8 @@ def main():
         print("4. Показать всех клиентов")
         print("5. Распределить грузы оптимально")
         print("6. Показать отчет о распределении")
+        print("7. Удалить клиента")
+        print("8. Найти клиента")
         print("0. Выход")
         
         # Получаем выбор пользователя
@@ -31,19 +49,22 @@ def main():
             vehicle_type = input("Выберите тип транспорта: ")
             
             try:
-                # Получаем грузоподъемность
+                if vehicle_type not in ("1", "2"):
+                    print("Неверный выбор типа транспорта!")
+                    continue
+                
+                # Получаем грузоподъемность и необязательные ограничения по объему и паллетам
                 capacity = float(input("Введите грузоподъемность (тонн): "))
+                max_volume = input_optional("Максимальный объем (м³, Enter - без ограничения): ", float)
+                max_pallets = input_optional("Максимум паллет (Enter - без ограничения): ", int)
                 
                 # Создаем транспорт в зависимости от типа
                 if vehicle_type == "1":
                     color = input("Введите цвет грузовика: ")
-                    vehicle = Truck(capacity, color)
-                elif vehicle_type == "2":
-                    cars = int(input("Введите количество вагонов: "))
-                    vehicle = Train(capacity, cars)
+                    vehicle = Truck(capacity, color, max_volume=max_volume, max_pallets=max_pallets)
                 else:
-                    print("Неверный выбор типа транспорта!")
-                    continue
+                    cars = int(input("Введите количество вагонов: "))
+                    vehicle = Train(capacity, cars, max_volume=max_volume, max_pallets=max_pallets)
                 
                 # Добавляем транспорт в компанию
                 company.add_vehicle(vehicle)
@@ -62,13 +83,18 @@ def main():
                 # Получаем данные клиента
                 name = input("Введите имя клиента: ")
                 cargo_weight = float(input("Введите вес груза (тонн): "))
+                volume = input_optional("Объем груза (м³, Enter - не указан): ", float)
+                pallets = input_optional("Количество паллет (Enter - не указано): ", int)
                 vip_input = input("VIP клиент? (да/нет): ").lower()
                 
                 # Определяем VIP-статус
                 is_vip = vip_input in ['да', 'yes', 'y', 'д']
+                priority = input_optional("Уровень приоритета (больше - раньше, Enter - по VIP-статусу): ", int)
+                deadline = input_optional("Срок доставки (часов, Enter - без срока): ", float)
                 
                 # Создаем клиента
-                client = Client(name, cargo_weight, is_vip)
+                client = Client(name, cargo_weight, is_vip, volume=volume, pallets=pallets,
+                                priority=priority, deadline=deadline)
                 company.add_client(client)
                 print(f"Клиент {name} успешно добавлен!")
                 
@@ -107,17 +133,64 @@ def main():
                 continue
             
             try:
+                # Выбираем стратегию упаковки (по умолчанию first-fit)
+                print(f"Доступные стратегии: {', '.join(STRATEGIES)}")
+                strategy = input("Выберите стратегию (Enter - дозагрузка first_fit): ").strip()
+                split_input = input("Делить не поместившиеся грузы между транспортом? (да/нет): ").lower()
+                if split_input in ['да', 'yes', 'y', 'д']:
+                    company.enable_split_shipments()
+                else:
+                    company.disable_split_shipments()
+                
                 print("\nНачинаем распределение грузов...")
-                # Выполняем распределение
-                used_vehicles = company.optimize_cargo_distribution()
-                print(f"Распределение завершено! Использовано {len(used_vehicles)} единиц транспорта")
+                # Без явной стратегии дозагружаем новых клиентов в текущее распределение
+                if strategy:
+                    company.optimize_cargo_distribution(strategy)
+                else:
+                    company.optimize_cargo_distribution(incremental=True)
+                # Сводка вместо построчных предупреждений: причины и первые не размещенные грузы
+                print("Распределение завершено!")
+                print(company.last_result.summary())
                 
             except Exception as e:
                 print(f"Ошибка при распределении: {e}")
         
         elif choice == "6":
-            # Показ отчета о распределении
-            print(company.get_distribution_report())
+            # Показ отчета о распределении постранично
+            start = 0
+            while True:
+                shown = company.write_distribution_report(sys.stdout, start, start + REPORT_PAGE_SIZE,
+                                                          summary=(start == 0))
+                if shown < REPORT_PAGE_SIZE:
+                    break
+                start += REPORT_PAGE_SIZE
+                if input("\nEnter - следующая страница, q - закончить: ").strip().lower() == "q":
+                    break
+        
+        elif choice == "7":
+            # Удаление клиента с освобождением места в транспорте
+            name = input("Введите имя клиента: ")
+            client = company.get_client(name)
+            if client is None:
+                print(f"Клиент {name} не найден")
+            else:
+                company.remove_client(client)
+                print(f"Клиент {name} удален")
+        
+        elif choice == "8":
+            # Поиск клиентов и их транспорта по индексу; имена клиентов могут повторяться
+            name = input("Введите имя клиента: ")
+            clients = company.get_clients(name)
+            if not clients:
+                print(f"Клиент {name} не найден")
+            for client in clients:
+                print(client)
+                # Разделенный груз может ехать в нескольких транспортных средствах
+                vehicles = company.vehicles_of(client)
+                for vehicle in vehicles:
+                    print(f"Транспорт: {vehicle}")
+                if not vehicles:
+                    print("Груз еще не распределен")
         
         elif choice == "0":
             # Выход из программы
@@ -0,0 +1,873 @@
+#Стратегии упаковки грузов по транспортным средствам
+import bisect
+import heapq
+import time
+
+import instrumentation
+from capacity_index import CapacityIndex, VectorCapacityIndex
+from units import KG_PER_TONNE, format_tonnes
+
+# Допуск на округление для дробных измерений (объем); вес считается в целых килограммах без допуска
+FLOAT_TOLERANCE = 1e-9
+
+# Точный решатель перебирает варианты только для небольших партий
+EXACT_MAX_CLIENTS = 60
+
+UNLIMITED = float("inf")
+
+# Уровни приоритета клиента: больше - раньше. Без явного приоритета VIP получает VIP_PRIORITY, остальные - DEFAULT_PRIORITY
+DEFAULT_PRIORITY = 0
+VIP_PRIORITY = 1
+
+# Стратегия min_cost: транспорт, заполненный меньше чем на эту долю, подбирается заново (не больше MIN_COST_TAIL единиц)
+MIN_COST_TAIL_FILL = 0.9
+MIN_COST_TAIL = 32
+
+# Размер задачи о покрытии веса хвоста: ячеек веса и типов транспорта в динамике
+MIN_COST_DP_CELLS = 256
+MIN_COST_DP_TYPES = 128
+
+
+class PackingStats:
+    """Итоги одного запуска стратегии упаковки"""
+
+    def __init__(self, strategy: str, vehicles_used: int, loaded_weight: float,
+                 used_capacity: float, unplaced: int, elapsed: float, lower_bound: int = None,
+                 cost: float = None):
+        self.strategy = strategy
+        self.vehicles_used = vehicles_used
+        self.loaded_weight = loaded_weight
+        self.used_capacity = used_capacity
+        self.unplaced = unplaced
+        self.elapsed = elapsed
+        # Нижняя граница количества транспорта (None - не вычислялась, как при дозагрузке)
+        self.lower_bound = lower_bound
+        # Суммарная стоимость использованного транспорта (None - не вычислялась)
+        self.cost = cost
+
+    @property
+    def fill_ratio(self) -> float:
+        """Доля занятой грузоподъемности в использованном транспорте"""
+        if not self.used_capacity:
+            return 0.0
+        return self.loaded_weight / self.used_capacity
+
+    @property
+    def gap(self):
+        """Сколько транспорта использовано сверх нижней границы (0 - решение оптимально)"""
+        if self.lower_bound is None:
+            return None
+        return self.vehicles_used - self.lower_bound
+
+    def __str__(self):
+        bound = (f"Нижняя граница: {self.lower_bound} (разрыв {self.gap}), "
+                 if self.lower_bound is not None else "")
+        cost = f"Стоимость: {self.cost:.2f}, " if self.cost else ""
+        return (f"Стратегия: {self.strategy}, "
+                f"Транспорта использовано: {self.vehicles_used}, "
+                f"{bound}"
+                f"{cost}"
+                f"Заполнение: {self.fill_ratio * 100:.1f}%, "
+                f"Не размещено: {self.unplaced}, "
+                f"Время: {self.elapsed * 1000:.1f}мс")
+
+
+# Причины, по которым груз не размещен
+UNPLACED_NO_VEHICLES = "нет подходящего транспорта"
+UNPLACED_TOO_HEAVY = "тяжелее грузоподъемности любого транспорта (вагона)"
+UNPLACED_TOO_LARGE = "больше допустимого объема или числа паллет любого транспорта"
+UNPLACED_NO_ROOM = "не хватило свободного места"
+
+# Сколько не размещенных грузов перечислять в сводке
+SUMMARY_UNPLACED = 5
+
+
+class DistributionResult:
+    """
+    Итог распределения: использованный транспорт, не размещенные грузы с причинами
+    (пары (клиент, причина)) и итоги запуска PackingStats.
+    """
+
+    def __init__(self, used_vehicles, unplaced, stats: PackingStats):
+        self.used_vehicles = used_vehicles
+        self.unplaced = unplaced
+        self.stats = stats
+
+    @property
+    def unplaced_clients(self):
+        return [client for client, _ in self.unplaced]
+
+    def reasons(self) -> dict:
+        """Количество не размещенных грузов по причинам"""
+        counts = {}
+        for _, reason in self.unplaced:
+            counts[reason] = counts.get(reason, 0) + 1
+        return counts
+
+    def high_priority(self) -> list:
+        """Не размещенные грузы приоритета выше DEFAULT_PRIORITY в порядке обслуживания: [(клиент, причина)]"""
+        return sorted(((client, reason) for client, reason in self.unplaced if client.priority > DEFAULT_PRIORITY),
+                      key=lambda entry: schedule_key(entry[0]))
+
+    def summary(self, limit: int = SUMMARY_UNPLACED) -> str:
+        """Краткая сводка: итоги, причины и первые limit не размещенных грузов (старшие приоритеты первыми)"""
+        lines = [f"Использовано {len(self.used_vehicles)} единиц транспорта", str(self.stats)]
+        if self.unplaced:
+            lines.append(f"Не размещено грузов: {len(self.unplaced)}")
+            lines.extend(f"  {reason}: {count}" for reason, count in self.reasons().items())
+            high = self.high_priority()
+            if high:
+                lines.append(f"  из них высокого приоритета: {len(high)}")
+            ordered = high + [entry for entry in self.unplaced if entry[0].priority <= DEFAULT_PRIORITY]
+            for client, reason in ordered[:limit]:
+                lines.append(f"  - {client.name} ({format_tonnes(client.cargo_kg)}т{schedule_label(client)}): {reason}")
+            if len(self.unplaced) > limit:
+                lines.append(f"  ... и еще {len(self.unplaced) - limit}")
+        return "\n".join(lines)
+
+    def __str__(self):
+        return self.summary()
+
+
+def schedule_label(client) -> str:
+    """Приоритет и срок доставки для подписи груза (пусто для обычного груза без срока)"""
+    label = f", приоритет {client.priority}" if client.priority > DEFAULT_PRIORITY else ""
+    if client.deadline is not None:
+        label += f", срок {client.deadline:g}"
+    return label
+
+
+def _limits(vehicles):
+    """Наибольшие вес (с учетом вагона), объем и число паллет, доступные в пустом транспорте"""
+    weight = max((v.car_capacity_kg or v.capacity_kg for v in vehicles), default=0)
+    volume = max((UNLIMITED if v.max_volume is None else v.max_volume for v in vehicles), default=0)
+    pallets = max((UNLIMITED if v.max_pallets is None else v.max_pallets for v in vehicles), default=0)
+    return weight, volume, pallets
+
+
+def explain_unplaced(unplaced, vehicles, by_partition: bool = False):
+    """
+    Причины для не размещенных грузов: пары (клиент, причина) за O(клиентов + транспорта).
+    Груз сравнивается с наибольшими пределами парка (при by_partition - парка своей партиции),
+    поэтому UNPLACED_NO_ROOM означает, что груз поместился бы в пустой транспорт.
+    """
+    if not unplaced:
+        return []
+    groups = {}
+    for vehicle in dict.fromkeys(vehicles):
+        groups.setdefault(vehicle.partition if by_partition else None, []).append(vehicle)
+    limits = {key: _limits(group) for key, group in groups.items()}
+    explained = []
+    for client in unplaced:
+        limit = limits.get(client.partition if by_partition else None)
+        if limit is None:
+            reason = UNPLACED_NO_VEHICLES
+        elif client.cargo_kg > limit[0]:
+            reason = UNPLACED_TOO_HEAVY
+        elif ((client.volume is not None and client.volume > limit[1] + FLOAT_TOLERANCE)
+              or (client.pallets is not None and client.pallets > limit[2])):
+            reason = UNPLACED_TOO_LARGE
+        else:
+            reason = UNPLACED_NO_ROOM
+        explained.append((client, reason))
+    return explained
+
+
+def is_multidimensional(vehicles) -> bool:
+    """Есть ли у транспорта ограничения кроме веса: объем, паллеты или вагоны"""
+    return any(v.max_volume is not None or v.max_pallets is not None or v.car_capacity_kg is not None
+               for v in vehicles)
+
+
+def _weight_need(client) -> int:
+    return client.cargo_kg
+
+
+def _car_free(vehicle) -> int:
+    return vehicle.car_free_kg()
+
+
+def _index_keys(vehicles):
+    """
+    Индекс свободного места по измерениям, которые ограничены хотя бы у одного транспорта,
+    и функции (требования груза, свободное место транспорта) для него.
+    Место в вагоне не больше свободной грузоподъемности, поэтому вес учитывается через него.
+    Если ограничен только вес (и вагоны), ключи - числа для CapacityIndex, иначе кортежи.
+    """
+    volume = any(v.max_volume is not None for v in vehicles)
+    pallets = any(v.max_pallets is not None for v in vehicles)
+    if not volume and not pallets:
+        return CapacityIndex, _weight_need, _car_free
+
+    def need(client):
+        key = [client.cargo_kg]
+        if volume:
+            key.append(client.volume - FLOAT_TOLERANCE if client.volume is not None else 0)
+        if pallets:
+            key.append(client.pallets or 0)
+        return key
+
+    def free(vehicle):
+        key = [vehicle.car_free_kg()]
+        if volume:
+            key.append(vehicle.max_volume - vehicle.current_volume if vehicle.max_volume is not None else UNLIMITED)
+        if pallets:
+            key.append(vehicle.max_pallets - vehicle.current_pallets if vehicle.max_pallets is not None else UNLIMITED)
+        return key
+
+    return (lambda slots: VectorCapacityIndex(slots, 1 + volume + pallets)), need, free
+
+
+class _Fleet:
+    """
+    Транспорт в порядке открытия и открытая его часть. Обычно это порядок убывания
+    грузоподъемности; при indexed=True порядок любой, и открывается первый подходящий.
+    probes - проверки транспорта при открытии (для статистики запуска).
+    """
+
+    def __init__(self, vehicles, indexed: bool = False):
+        self.vehicles = vehicles
+        self.used = []
+        self.next_vehicle = 0
+        self.probes = 0
+        self.multidimensional = is_multidimensional(vehicles)
+        self.indexed = indexed or self.multidimensional
+        if self.indexed:
+            # Индекс пустого неоткрытого транспорта: первый подходящий находится за O(log n)
+            self.make_index, self.need_of, self.free_of = _index_keys(vehicles)
+            self.unopened = self.make_index(len(vehicles))
+            for j, vehicle in enumerate(vehicles):
+                self.unopened.update(j, self.free_of(vehicle))
+
+    def open_for(self, client) -> int:
+        """Открывает следующий транспорт под груз и возвращает его слот (-1, если не помещается)"""
+        if self.indexed:
+            return self._open_indexed(client)
+        # Неоткрытый транспорт пуст и отсортирован по убыванию грузоподъемности,
+        # поэтому если не подходит самый большой из них, не подойдет ни один
+        self.probes += 1
+        if self.next_vehicle < len(self.vehicles) and self.vehicles[self.next_vehicle].can_load_kg(client.cargo_kg):
+            self.used.append(self.vehicles[self.next_vehicle])
+            self.next_vehicle += 1
+            return len(self.used) - 1
+        return -1
+
+    def _open_indexed(self, client) -> int:
+        """Открывает первый неоткрытый транспорт, подходящий по всем измерениям"""
+        need = self.need_of(client)
+        j = self.unopened.find_first(need)
+        self.probes += 1
+        while j != -1 and not self.vehicles[j].fits(client):
+            j = self.unopened.find_first(need, j + 1)
+            self.probes += 1
+        if j == -1:
+            return -1
+        self.unopened.clear(j)
+        self.used.append(self.vehicles[j])
+        return len(self.used) - 1
+
+    def record(self, stats, probes: int):
+        """Переносит проверки стратегии (probes) и открытия транспорта в статистику запуска, если она ведется"""
+        if stats is not None:
+            stats.probes += probes + self.probes
+            stats.vehicles_opened += len(self.used)
+
+
+def schedule_key(client) -> tuple:
+    """Порядок обслуживания: приоритет по убыванию, затем ближайший срок доставки (без срока - последними)"""
+    deadline = client.deadline
+    return -client.priority, UNLIMITED if deadline is None else deadline
+
+
+def _by_weight_desc(clients):
+    """
+    Сначала старшие уровни приоритета, внутри уровня - по убыванию веса груза.
+    Сроки доставки здесь не учитываются: порядок по весу важнее для плотной упаковки.
+    """
+    return sorted(clients, key=lambda x: (-x.priority, -x.cargo_kg))
+
+
+def first_fit(clients, vehicles, time_budget=None, stats=None):
+    """First-fit в порядке поступления клиентов (старшие приоритеты первыми)"""
+    return _first_fit(clients, _Fleet(vehicles), stats)
+
+
+def _first_fit(clients, fleet, stats=None):
+    if fleet.multidimensional:
+        return _first_fit_vector(clients, fleet, stats)
+    # Индекс свободной грузоподъемности по транспорту в порядке открытия
+    index = CapacityIndex(len(fleet.vehicles))
+    unplaced = []
+    for client in clients:
+        weight = client.cargo_kg
+
+        # Индекс хранит точный остаток в килограммах, поэтому найденный слот подходит без перепроверки
+        slot = index.find_first(weight)
+
+        if slot == -1:
+            slot = fleet.open_for(client)
+            if slot == -1:
+                unplaced.append(client)
+                continue
+
+        vehicle = fleet.used[slot]
+        vehicle.load_trusted(client)
+        index.update(slot, vehicle.capacity_kg - vehicle.load_kg)
+
+    # Каждый груз - один поиск в индексе
+    fleet.record(stats, len(clients))
+    return fleet.used, unplaced
+
+
+def _first_fit_vector(clients, fleet, stats=None):
+    """First-fit по всем измерениям: индекс по ограниченным измерениям отсекает транспорт, точный ответ дает fits"""
+    need_of = fleet.need_of
+    free_of = fleet.free_of
+    index = fleet.make_index(len(fleet.vehicles))
+    unplaced = []
+    probes = 0
+    for client in clients:
+        need = need_of(client)
+        slot = index.find_first(need)
+        probes += 1
+        while slot != -1 and not fleet.used[slot].fits(client):
+            slot = index.find_first(need, slot + 1)
+            probes += 1
+
+        if slot == -1:
+            slot = fleet.open_for(client)
+            if slot == -1:
+                unplaced.append(client)
+                continue
+
+        vehicle = fleet.used[slot]
+        vehicle.load_trusted(client)
+        index.update(slot, free_of(vehicle))
+
+    fleet.record(stats, probes)
+    return fleet.used, unplaced
+
+
+def first_fit_decreasing(clients, vehicles, time_budget=None, stats=None):
+    """First-fit по убыванию веса груза"""
+    return first_fit(_by_weight_desc(clients), vehicles, stats=stats)
+
+
+def vector_first_fit_decreasing(clients, vehicles, time_budget=None, stats=None):
+    """
+    First-fit по убыванию наибольшей доли груза среди измерений (вес, объем, паллеты),
+    отнесенной к самому вместительному транспорту. Без объема и паллет совпадает с ffd.
+    """
+    max_weight = max((v.capacity_kg for v in vehicles), default=1)
+    max_volume = max((v.max_volume for v in vehicles if v.max_volume is not None), default=None)
+    max_pallets = max((v.max_pallets for v in vehicles if v.max_pallets is not None), default=None)
+
+    def size(client):
+        share = client.cargo_kg / max_weight
+        if max_volume and client.volume is not None:
+            share = max(share, client.volume / max_volume)
+        if max_pallets and client.pallets is not None:
+            share = max(share, client.pallets / max_pallets)
+        return share
+
+    return first_fit(sorted(clients, key=lambda x: (-x.priority, -size(x))), vehicles, stats=stats)
+
+
+def best_fit_decreasing(clients, vehicles, time_budget=None, stats=None):
+    """Best-fit по убыванию веса: груз идет в транспорт с наименьшим подходящим остатком"""
+    fleet = _Fleet(vehicles)
+    # Отсортированные пары (свободно, слот) открытого транспорта
+    free_slots = []
+    unplaced = []
+    probes = 0
+    for client in _by_weight_desc(clients):
+        pos = bisect.bisect_left(free_slots, (client.cargo_kg, -1))
+        probes += 1
+        while pos < len(free_slots) and not fleet.used[free_slots[pos][1]].fits(client):
+            pos += 1
+            probes += 1
+
+        if pos < len(free_slots):
+            slot = free_slots.pop(pos)[1]
+        else:
+            slot = fleet.open_for(client)
+            if slot == -1:
+                unplaced.append(client)
+                continue
+
+        vehicle = fleet.used[slot]
+        vehicle.load_trusted(client)
+        bisect.insort(free_slots, (vehicle.capacity_kg - vehicle.load_kg, slot))
+
+    fleet.record(stats, probes)
+    return fleet.used, unplaced
+
+
+def worst_fit(clients, vehicles, time_budget=None, stats=None):
+    """Worst-fit: груз идет в открытый транспорт с наибольшим остатком"""
+    fleet = _Fleet(vehicles)
+    index = CapacityIndex(len(vehicles))
+    unplaced = []
+    for client in clients:
+        largest = index.max_free()
+        slot = index.find_first(largest) if largest >= client.cargo_kg else -1
+        if slot == -1 or not fleet.used[slot].fits(client):
+            slot = fleet.open_for(client)
+            if slot == -1:
+                unplaced.append(client)
+                continue
+
+        vehicle = fleet.used[slot]
+        vehicle.load_trusted(client)
+        index.update(slot, vehicle.capacity_kg - vehicle.load_kg)
+
+    # Каждый груз - одна проверка транспорта с наибольшим остатком
+    fleet.record(stats, len(clients))
+    return fleet.used, unplaced
+
+
+def vehicle_cost(vehicle) -> float:
+    """Стоимость рейса: запуск и груз по тарифу за тонну (0 для незагруженного транспорта)"""
+    if not vehicle.load_kg:
+        return 0.0
+    return vehicle.fixed_cost + vehicle.cost_per_tonne * vehicle.load_kg / KG_PER_TONNE
+
+
+def total_cost(vehicles) -> float:
+    """Суммарная стоимость рейсов транспорта"""
+    return sum(vehicle_cost(vehicle) for vehicle in vehicles)
+
+
+def _full_cost(vehicle) -> float:
+    """Стоимость рейса при полной загрузке"""
+    return vehicle.fixed_cost + vehicle.cost_per_tonne * vehicle.capacity_kg / KG_PER_TONNE
+
+
+def min_cost(clients, vehicles, time_budget=None, stats=None):
+    """
+    Минимизация стоимости для разнородного парка (упаковка в контейнеры разного размера):
+    first-fit по убыванию веса, транспорт открывается в порядке стоимости тонны при полной
+    загрузке. Затем недогруженный хвост подбирается заново динамикой покрытия его веса
+    самыми дешевыми типами транспорта; новый хвост принимается, только если он дешевле.
+    Без заданной стоимости совпадает с ffd.
+    """
+    order = sorted(vehicles, key=lambda x: (_full_cost(x) / x.capacity_kg, -x.capacity_kg))
+    used, unplaced = _first_fit(_by_weight_desc(clients), _Fleet(order, indexed=True), stats)
+    return _resize_tail(used, order), unplaced
+
+
+def _resize_tail(used, vehicles):
+    """Заменяет недогруженный хвост более дешевым набором транспорта, если он находится"""
+    tail = sorted((v for v in used if v.load_kg < MIN_COST_TAIL_FILL * v.capacity_kg),
+                  key=lambda x: x.load_kg / x.capacity_kg)[:MIN_COST_TAIL]
+    if not tail:
+        return used
+    used_set = set(used)
+    # Транспорт хвоста идет первым, чтобы при равной стоимости он и остался
+    candidates = tail + [v for v in vehicles if v not in used_set]
+    saved = [(vehicle, list(vehicle.clients_list)) for vehicle in tail]
+    clients = _by_weight_desc([client for _, loaded in saved for client in loaded])
+    before = total_cost(tail)
+    weight = sum(client.cargo_kg for client in clients)
+    # Второй заход с запасом: покрытие по весу не учитывает дробление на отдельные грузы
+    for margin in (1.0, 1.1):
+        chosen = _cheapest_cover(candidates, int(weight * margin))
+        if chosen is None:
+            break
+        for vehicle in tail:
+            vehicle.clear_cargo()
+        if _load_all(clients, chosen) and total_cost(chosen) < before - FLOAT_TOLERANCE:
+            tail_set = set(tail)
+            return [v for v in used if v not in tail_set] + [v for v in chosen if v.load_kg]
+        for vehicle in chosen + tail:
+            vehicle.clear_cargo()
+        for vehicle, loaded in saved:
+            for client in loaded:
+                vehicle.load_trusted(client)
+    return used
+
+
+def _load_all(clients, vehicles) -> bool:
+    """First-fit всех грузов в заданный транспорт; False, если какой-то груз не поместился"""
+    for client in clients:
+        for vehicle in vehicles:
+            if vehicle.fits(client):
+                vehicle.load_trusted(client)
+                break
+        else:
+            return False
+    return True
+
+
+def _cheapest_cover(vehicles, weight: int):
+    """
+    Самый дешевый набор транспорта с суммарной грузоподъемностью не меньше weight (кг):
+    0/1-рюкзак на покрытие по MIN_COST_DP_CELLS ячейкам веса. Одинаковый транспорт
+    (грузоподъемность, вагоны, стоимость) объединяется в типы, копии типа - двоичным
+    разбиением; в динамику идут MIN_COST_DP_TYPES типов с самой дешевой тонной.
+    Стоимость типа - при полной загрузке. Возвращает транспорт по убыванию грузоподъемности или None.
+    """
+    types = {}
+    for vehicle in vehicles:
+        key = (vehicle.capacity_kg, vehicle.car_capacity_kg, vehicle.fixed_cost, vehicle.cost_per_tonne)
+        types.setdefault(key, []).append(vehicle)
+    unit = max(1, -(-weight // MIN_COST_DP_CELLS))
+    cells = -(-weight // unit)
+    ranked = sorted(((key, group) for key, group in types.items() if key[0] >= unit),
+                    key=lambda entry: _full_cost(entry[1][0]) / entry[0][0])[:MIN_COST_DP_TYPES]
+
+    items = []
+    for key, group in ranked:
+        size = key[0] // unit
+        cost = _full_cost(group[0])
+        copies = min(len(group), -(-cells // size))
+        take = 1
+        while copies:
+            take = min(take, copies)
+            items.append((size * take, cost * take, key, take))
+            copies -= take
+            take *= 2
+
+    best = [0.0] + [UNLIMITED] * cells
+    marks = []
+    for size, cost, _, _ in items:
+        mark = bytearray(cells + 1)
+        for covered in range(cells, 0, -1):
+            value = best[covered - size if covered > size else 0] + cost
+            if value < best[covered]:
+                best[covered] = value
+                mark[covered] = 1
+        marks.append(mark)
+    if best[cells] == UNLIMITED:
+        return None
+
+    chosen = []
+    covered = cells
+    for (size, _, key, take), mark in zip(reversed(items), reversed(marks)):
+        if mark[covered]:
+            chosen.extend(types[key][:take])
+            del types[key][:take]
+            covered = max(0, covered - size)
+    return sorted(chosen, key=lambda x: x.capacity_kg, reverse=True)
+
+
+def continuous_bound(weights, capacities) -> int:
+    """
+    Непрерывная граница: наименьшее k, при котором k самых больших машин
+    вмещают суммарный вес. capacities - по убыванию.
+    """
+    total = sum(weights)
+    bound = 0
+    capacity_sum = 0
+    while bound < len(capacities) and capacity_sum < total:
+        capacity_sum += capacities[bound]
+        bound += 1
+    return bound
+
+
+def martello_toth_l2(weights, capacity: int) -> int:
+    """
+    Граница L2 Мартелло-Тота для одинаковой вместимости capacity за O(n log n).
+    Для парка разной вместимости берется наибольшая: любая упаковка в него годится и для нее.
+    Грузы тяжелее capacity не учитываются.
+    """
+    weights = sorted(w for w in weights if w <= capacity)
+    if not weights:
+        return 0
+    prefix = [0]
+    for weight in weights:
+        prefix.append(prefix[-1] + weight)
+    half = bisect.bisect_right(weights, capacity / 2)
+
+    def count_above(limit):
+        return len(weights) - bisect.bisect_right(weights, limit)
+
+    best = 0
+    # alpha пробегает 0 и все различные веса не больше capacity / 2
+    for alpha in [0, *sorted(set(weights[:half]))]:
+        # J1: больше capacity - alpha; J2: (capacity / 2, capacity - alpha]; J3: [alpha, capacity / 2]
+        j2_start = half
+        j2_end = len(weights) - count_above(capacity - alpha)
+        n12 = len(weights) - j2_start
+        n2 = j2_end - j2_start
+        s2 = prefix[j2_end] - prefix[j2_start]
+        s3 = prefix[half] - prefix[bisect.bisect_left(weights, alpha)]
+        # Деление с округлением вверх в целых килограммах
+        extra = -(-(s3 - (n2 * capacity - s2)) // capacity)
+        best = max(best, n12 + max(0, extra))
+    return best
+
+
+def lower_bound(clients, vehicles) -> int:
+    """Нижняя граница количества транспорта: максимум непрерывной границы и L2"""
+    capacities = sorted((v.capacity_kg for v in dict.fromkeys(vehicles)), reverse=True)
+    if not capacities:
+        return 0
+    weights = [client.cargo_kg for client in clients if client.cargo_kg <= capacities[0]]
+    return max(continuous_bound(weights, capacities), martello_toth_l2(weights, capacities[0]))
+
+
+def _reset(vehicles):
+    """Очищает загрузку транспорта"""
+    for vehicle in vehicles:
+        vehicle.clear_cargo()
+
+
+def _search_packing(weights, capacities, deadline):
+    """
+    Поиск с возвратом: раскладывает грузы (по убыванию веса) по транспорту.
+    Возвращает номера транспорта для каждого груза или None.
+    Выбрасывает TimeoutError, если истек бюджет времени.
+    """
+    loads = [0] * len(capacities)
+    assignment = [0] * len(weights)
+    # Остаток грузов, начиная с каждой позиции, для отсечения по суммарному объему
+    remaining = [0] * (len(weights) + 1)
+    for i in range(len(weights) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + weights[i]
+    total_capacity = sum(capacities)
+
+    def place(i, loaded):
+        if i == len(weights):
+            return True
+        if time.perf_counter() > deadline:
+            raise TimeoutError
+        if remaining[i] > total_capacity - loaded:
+            return False
+        weight = weights[i]
+        tried = set()
+        for j, capacity in enumerate(capacities):
+            # Одинаковые по состоянию транспортные средства взаимозаменяемы
+            state = (capacity, loads[j])
+            if state in tried or loads[j] + weight > capacity:
+                continue
+            tried.add(state)
+            # Восстанавливаем сохраненное значение, а не вычитаем, чтобы суммы совпали с реальной загрузкой
+            loads[j] = state[1] + weight
+            assignment[i] = j
+            if place(i + 1, loaded + weight):
+                return True
+            loads[j] = state[1]
+        return False
+
+    return assignment if place(0, 0) else None
+
+
+def exact(clients, vehicles, time_budget=1.0, stats=None):
+    """
+    Точный поиск минимального количества транспорта для небольших партий.
+    Если все грузы не помещаются в парк, партия слишком велика или
+    не уложились в time_budget секунд, возвращается результат first-fit-decreasing.
+    """
+    deadline = time.perf_counter() + (time_budget if time_budget is not None else 1.0)
+    used, unplaced = first_fit_decreasing(clients, vehicles, stats=stats)
+    # Перебор учитывает только вес, поэтому с другими ограничениями остается FFD
+    if unplaced or len(clients) > EXACT_MAX_CLIENTS or is_multidimensional(vehicles):
+        return used, unplaced
+
+    # Если first-fit-decreasing уже достиг нижней границы, перебор ничего не улучшит
+    bound = lower_bound(clients, vehicles)
+    if len(used) <= bound:
+        return used, unplaced
+
+    ordered = _by_weight_desc(clients)
+    weights = [client.cargo_kg for client in ordered]
+
+    # Любой набор из k машин можно заменить k самыми большими, поэтому перебираем только их
+    for k in range(max(bound, 1), len(used)):
+        try:
+            assignment = _search_packing(weights, [v.capacity_kg for v in vehicles[:k]], deadline)
+        except TimeoutError:
+            break
+        if assignment is not None:
+            _reset(used)
+            for client, j in zip(ordered, assignment):
+                vehicles[j].load_trusted(client)
+            return [v for v in vehicles[:k] if v.clients_list], []
+
+    return used, unplaced
+
+
+class IncrementalPacker:
+    """
+    Состояние последнего распределения для дозагрузки без полной переупаковки.
+    Новые грузы размещаются first-fit по открытому транспорту в порядке открытия,
+    затем в самый большой свободный; снятие груза освобождает место. Каждая операция - O(log n).
+    Если у транспорта есть ограничения кроме веса, индекс строится по всем ограниченным измерениям.
+    """
+
+    # Грузы размещаются в любой транспорт, без учета партиций
+    by_partition = False
+
+    def __init__(self, used_vehicles, spare_vehicles):
+        self._load(used_vehicles, spare_vehicles)
+
+    def _load(self, used_vehicles, spare_vehicles):
+        self.used = list(used_vehicles)
+        self.slots = {vehicle: slot for slot, vehicle in enumerate(self.used)}
+        # Свободный транспорт по возрастанию грузоподъемности: самый большой в конце
+        self.spare = sorted(spare_vehicles, key=lambda x: x.capacity_kg)
+        self.loaded_kg = sum(v.load_kg for v in self.used)
+        self.opened_kg = sum(v.capacity_kg for v in self.used)
+        self._build_index(len(self.used) + len(self.spare))
+
+    def _build_index(self, slots: int):
+        """Перестраивает индекс свободного места под нужное число слотов и ограниченные измерения"""
+        self.multidimensional = is_multidimensional(self.used) or is_multidimensional(self.spare)
+        make_index, self._need, self._free = _index_keys(self.used + self.spare)
+        self.index = make_index(slots)
+        for slot, vehicle in enumerate(self.used):
+            self.index.update(slot, self._free(vehicle))
+
+    def fragmentation(self) -> float:
+        """Доля незанятой грузоподъемности в открытом транспорте"""
+        if not self.opened_kg:
+            return 0.0
+        return 1 - self.loaded_kg / self.opened_kg
+
+    def used_vehicles(self):
+        """Открытый транспорт с ненулевой загрузкой"""
+        return [vehicle for vehicle in self.used if vehicle.load_kg > 0]
+
+    def __contains__(self, vehicle) -> bool:
+        """Открыт ли транспорт в этом распределении"""
+        return vehicle in self.slots
+
+    def add_vehicle(self, vehicle):
+        """Добавляет транспорт в резерв"""
+        bisect.insort(self.spare, vehicle, key=lambda x: x.capacity_kg)
+        if len(self.used) + len(self.spare) > self.index.size:
+            self._build_index(2 * self.index.size)
+        elif (vehicle.max_volume is not None or vehicle.max_pallets is not None
+              or (vehicle.car_capacity_kg is not None and not self.multidimensional)):
+            # Могло добавиться ограниченное измерение
+            self._build_index(self.index.size)
+
+    def remove_vehicle(self, vehicle):
+        """Убирает транспорт, грузы которого уже выгружены: индекс по слотам строится заново без него"""
+        self._load([v for v in self.used if v is not vehicle], [v for v in self.spare if v is not vehicle])
+
+    def _spare_for(self, client) -> tuple:
+        """Позиция в резерве самого большого подходящего транспорта (-1, если такого нет) и число проверок"""
+        probes = 0
+        for pos in range(len(self.spare) - 1, -1, -1):
+            probes += 1
+            if self.spare[pos].fits(client):
+                return pos, probes
+            # Без других измерений не подошел самый большой - не подойдет никакой
+            if not self.multidimensional:
+                break
+        return -1, probes
+
+    def place(self, client, stats=None):
+        """Размещает груз и возвращает транспорт (None, если места нет); stats - статистика запуска"""
+        weight = client.cargo_kg
+        need = self._need(client)
+        slot = self.index.find_first(need)
+        probes = 1
+        while slot != -1 and not self.used[slot].fits(client):
+            slot = self.index.find_first(need, slot + 1)
+            probes += 1
+
+        opened = slot == -1
+        if opened:
+            pos, spare_probes = self._spare_for(client)
+            if stats is not None:
+                stats.probes += probes + spare_probes
+            if pos == -1:
+                return None
+            vehicle = self.spare.pop(pos)
+            slot = len(self.used)
+            self.used.append(vehicle)
+            self.slots[vehicle] = slot
+            self.opened_kg += vehicle.capacity_kg
+        elif stats is not None:
+            stats.probes += probes
+
+        vehicle = self.used[slot]
+        vehicle.load_trusted(client)
+        self.loaded_kg += weight
+        self.index.update(slot, self._free(vehicle))
+        if stats is not None:
+            stats.loads += 1
+            stats.vehicles_opened += opened
+        return vehicle
+
+    def remove(self, client, vehicle):
+        """Выгружает груз клиента и освобождает место в транспорте"""
+        vehicle.unload_cargo(client)
+        self.loaded_kg -= client.cargo_kg
+        self.index.update(self.slots[vehicle], self._free(vehicle))
+
+
+def pack(clients, vehicles, strategy: str = "first_fit", time_budget: float = 1.0, ordered: bool = False,
+         stats=None):
+    """
+    Распределяет клиентов (в порядке schedule_key) по транспорту (по убыванию грузоподъемности)
+    выбранной стратегией, предварительно очистив загрузку. Возвращает (использованный транспорт, не размещенные).
+    ordered - клиенты уже идут в порядке обслуживания (очередь компании), сортировка не нужна.
+    stats - RunStats запуска (instrumentation), в который стратегия добавляет счетчики и фазы.
+    """
+    with instrumentation.phase(stats, "сортировка"):
+        sorted_clients = clients if ordered else sorted(clients, key=schedule_key)
+        sorted_vehicles = sorted(dict.fromkeys(vehicles), key=lambda x: x.capacity_kg, reverse=True)
+        _reset(sorted_vehicles)
+    with instrumentation.phase(stats, "размещение"):
+        used, unplaced = STRATEGIES[strategy](sorted_clients, sorted_vehicles, time_budget, stats)
+    if stats is not None:
+        stats.loads += len(sorted_clients) - len(unplaced)
+    return used, unplaced
+
+
+def split_cargo(clients, vehicles, min_chunk_kg: int, max_parts: int, make_part):
+    """
+    Делит не поместившиеся грузы (старшие приоритеты и тяжелые первыми) между транспортом с наибольшим
+    свободным местом: не больше max_parts частей, каждая не легче min_chunk_kg, одна часть на транспорт.
+    Транспорт хранится в куче по свободному месту (в вагоне), поэтому груз обходится
+    в O(max_parts * log m). Грузы с паллетами не делятся. make_part(клиент, кг, номер, всего)
+    создает часть. Возвращает (загруженные пары (транспорт, часть), не размещенные клиенты).
+    """
+    vehicles = list(dict.fromkeys(vehicles))
+    heap = [(-_car_free(vehicle), i) for i, vehicle in enumerate(vehicles)]
+    heapq.heapify(heap)
+    loaded = []
+    unplaced = []
+    for client in sorted(clients, key=lambda x: (-x.priority, -x.cargo_kg)):
+        if client.pallets is not None or client.cargo_kg < 2 * min_chunk_kg:
+            unplaced.append(client)
+            continue
+        plan = []
+        taken = []
+        remaining = client.cargo_kg
+        while remaining and len(plan) < max_parts and heap:
+            taken.append(heapq.heappop(heap))
+            chunk = min(remaining, -taken[-1][0])
+            if remaining - chunk < min_chunk_kg:
+                # Остаток легче минимальной части: часть уменьшается, чтобы остаток стал допустимым
+                chunk = remaining if chunk == remaining else remaining - min_chunk_kg
+            if chunk < min_chunk_kg:
+                # В остальном транспорте места еще меньше
+                break
+            plan.append((vehicles[taken[-1][1]], chunk))
+            remaining -= chunk
+        parts = [make_part(client, chunk, i, len(plan)) for i, (_, chunk) in enumerate(plan, 1)] if not remaining else []
+        if parts and all(vehicle.fits(part) for (vehicle, _), part in zip(plan, parts)):
+            for (vehicle, _), part in zip(plan, parts):
+                vehicle.load_trusted(part)
+                loaded.append((vehicle, part))
+        else:
+            unplaced.append(client)
+        for _, i in taken:
+            heapq.heappush(heap, (-_car_free(vehicles[i]), i))
+    return loaded, unplaced
+
+
+STRATEGIES = {
+    "first_fit": first_fit,
+    "ffd": first_fit_decreasing,
+    "vector_ffd": vector_first_fit_decreasing,
+    "bfd": best_fit_decreasing,
+    "worst_fit": worst_fit,
+    "exact": exact,
+    "min_cost": min_cost,
+}
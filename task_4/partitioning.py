@@ -0,0 +1,180 @@
+#Параллельное распределение грузов по независимым партициям парка
+from instrumentation import RunStats
+from packing import IncrementalPacker, pack
+from transport import Client, Train, Vehicle
+
+
+class _Item(Client):
+    """Груз в процессе-исполнителе: клиент без имени и партиции, row - номер его строки"""
+    __slots__ = ("row",)
+
+
+class _Bin(Vehicle):
+    """Транспорт в процессе-исполнителе, row - номер его строки; проверка и загрузка - методы Vehicle"""
+    __slots__ = ("row",)
+
+
+class _TrainBin(Train):
+    """Поезд в процессе-исполнителе, row - номер его строки; вагоны заполняются методами Train"""
+    __slots__ = ("row",)
+
+
+def _bin(row: int, capacity_kg: int, max_volume: float, max_pallets: int, number_of_cars: int,
+         fixed_cost: float, cost_per_tonne: float):
+    """
+    Транспорт процесса-исполнителя из полей vehicle_columns: поезд, если вагонов больше одного.
+    Без проверок и без выдачи ID транспорта - поля уже проверены в исходных объектах.
+    """
+    if number_of_cars > 1:
+        vehicle = object.__new__(_TrainBin)
+        vehicle.number_of_cars = number_of_cars
+    else:
+        vehicle = object.__new__(_Bin)
+    vehicle.row = vehicle._id = row
+    vehicle.capacity_kg = capacity_kg
+    vehicle.partition = None
+    vehicle.max_volume = max_volume
+    vehicle.max_pallets = max_pallets
+    vehicle.fixed_cost = fixed_cost
+    vehicle.cost_per_tonne = cost_per_tonne
+    vehicle.clear_cargo()
+    return vehicle
+
+
+def client_columns(client) -> tuple:
+    """Поля клиента для процесса-исполнителя: (вес в кг, VIP, объем, паллеты, приоритет, срок доставки)"""
+    return client.cargo_kg, client.is_vip, client.volume, client.pallets, client.priority, client.deadline
+
+
+def vehicle_columns(vehicle) -> tuple:
+    """
+    Поля транспорта для процесса-исполнителя: (грузоподъемность в кг, объем, паллеты, вагоны,
+    стоимость запуска, стоимость тонны)
+    """
+    return (vehicle.capacity_kg, vehicle.max_volume, vehicle.max_pallets, getattr(vehicle, "number_of_cars", 1),
+            vehicle.fixed_cost, vehicle.cost_per_tonne)
+
+
+def from_columns(clients, vehicles):
+    """Грузы и транспорт процесса-исполнителя из кортежей client_columns и vehicle_columns"""
+    items = []
+    for row, (cargo_kg, is_vip, volume, pallets, priority, deadline) in enumerate(clients):
+        item = _Item.from_kg(None, cargo_kg, is_vip, None, volume, pallets, priority, deadline)
+        item.row = row
+        items.append(item)
+    return items, [_bin(row, *fields) for row, fields in enumerate(vehicles)]
+
+
+def split_by_partition(clients, vehicles):
+    """Группирует клиентов и транспорт по ключу партиции: {партиция: (клиенты, транспорт)}"""
+    partitions = {}
+    for vehicle in dict.fromkeys(vehicles):
+        partitions.setdefault(vehicle.partition, ([], []))[1].append(vehicle)
+    for client in clients:
+        partitions.setdefault(client.partition, ([], []))[0].append(client)
+    return partitions
+
+
+class PartitionedPacker:
+    """
+    Дозагрузка после распределения по партициям: свой IncrementalPacker на каждую партицию,
+    поэтому груз попадает только в транспорт своей партиции. Интерфейс тот же, что у IncrementalPacker.
+    """
+
+    by_partition = True
+
+    def __init__(self, used_vehicles, spare_vehicles):
+        groups = {}
+        for vehicle in used_vehicles:
+            groups.setdefault(vehicle.partition, ([], []))[0].append(vehicle)
+        for vehicle in spare_vehicles:
+            groups.setdefault(vehicle.partition, ([], []))[1].append(vehicle)
+        self.packers = {partition: IncrementalPacker(used, spare) for partition, (used, spare) in groups.items()}
+
+    @property
+    def loaded_kg(self) -> int:
+        return sum(packer.loaded_kg for packer in self.packers.values())
+
+    def fragmentation(self) -> float:
+        """Доля незанятой грузоподъемности в открытом транспорте всех партиций"""
+        opened_kg = sum(packer.opened_kg for packer in self.packers.values())
+        return 1 - self.loaded_kg / opened_kg if opened_kg else 0.0
+
+    def used_vehicles(self):
+        return [vehicle for packer in self.packers.values() for vehicle in packer.used_vehicles()]
+
+    def __contains__(self, vehicle) -> bool:
+        packer = self.packers.get(vehicle.partition)
+        return packer is not None and vehicle in packer
+
+    def add_vehicle(self, vehicle):
+        packer = self.packers.get(vehicle.partition)
+        if packer is None:
+            self.packers[vehicle.partition] = IncrementalPacker([], [vehicle])
+        else:
+            packer.add_vehicle(vehicle)
+
+    def remove_vehicle(self, vehicle):
+        self.packers[vehicle.partition].remove_vehicle(vehicle)
+
+    def place(self, client, stats=None):
+        """Размещает груз в транспорт его партиции (None, если места нет или у партиции нет транспорта)"""
+        packer = self.packers.get(client.partition)
+        return packer.place(client, stats) if packer is not None else None
+
+    def remove(self, client, vehicle):
+        self.packers[vehicle.partition].remove(client, vehicle)
+
+
+def _pack_columns(clients, vehicles, strategy, time_budget):
+    """
+    Упаковка одной партиции в процессе-исполнителе.
+    Получает только кортежи чисел (client_columns, vehicle_columns), чтобы не передавать объекты между процессами.
+    Возвращает [(номер транспорта, [номера клиентов в порядке загрузки])], номера не размещенных
+    и счетчики упаковки (RunStats).
+    """
+    items, bins = from_columns(clients, vehicles)
+    stats = RunStats(strategy, len(items))
+    used, unplaced = pack(items, bins, strategy, time_budget, stats=stats)
+    loads = [(vehicle.row, [item.row for item in vehicle.clients_list]) for vehicle in used]
+    return loads, [item.row for item in unplaced], stats
+
+
+def pack_partitioned(clients, vehicles, strategy: str = "first_fit", time_budget: float = 1.0,
+                     max_workers: int = None, stats=None):
+    """
+    Распределяет каждую партицию отдельно (в пуле процессов, если партиций больше одной)
+    и применяет результат к исходным объектам. Возвращает (использованный транспорт, не размещенные).
+    stats - RunStats запуска, к которому прибавляются счетчики всех партиций.
+    """
+    partitions = split_by_partition(clients, vehicles)
+    jobs = [
+        ([client_columns(client) for client in part_clients],
+         [vehicle_columns(vehicle) for vehicle in part_vehicles],
+         strategy, time_budget)
+        for part_clients, part_vehicles in partitions.values()
+    ]
+
+    if len(jobs) > 1 and max_workers != 1:
+        # Пул процессов импортируется по требованию, чтобы не замедлять запуск программы
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_pack_columns, *zip(*jobs)))
+    else:
+        results = [_pack_columns(*job) for job in jobs]
+
+    used_vehicles = []
+    unplaced = []
+    for (part_clients, part_vehicles), (loads, part_unplaced, part_stats) in zip(partitions.values(), results):
+        if stats is not None:
+            stats.add_counters(part_stats)
+        for vehicle in part_vehicles:
+            vehicle.clear_cargo()
+        # Загружаем в том же порядке, что и исполнитель, поэтому суммы загрузки совпадают
+        for vehicle_row, client_rows in loads:
+            vehicle = part_vehicles[vehicle_row]
+            for client_row in client_rows:
+                vehicle.load_trusted(part_clients[client_row])
+            used_vehicles.append(vehicle)
+        unplaced.extend(part_clients[row] for row in part_unplaced)
+    return used_vehicles, unplaced
@@ -0,0 +1,184 @@
+#Сценарии «что если»: изменения поверх данных компании, оцениваемые параллельно без изменения самой компании
+import time
+
+from packing import DEFAULT_PRIORITY, STRATEGIES, lower_bound, pack, total_cost
+from partitioning import client_columns, from_columns, vehicle_columns
+from units import to_tonnes
+
+# Название сценария без изменений, с которым сравниваются остальные
+BASE_SCENARIO = "Текущие данные"
+
+# Данные компании в процессе-исполнителе: передаются один раз при запуске процесса, а не с каждым сценарием
+_shared = None
+
+
+class Scenario:
+    """
+    Сценарий «что если»: добавленный и убранный (по ID) транспорт, добавленные и убранные (по имени) клиенты.
+    Имена клиентов не уникальны: убирается каждый клиент с этим именем, и в компании, и среди добавленных.
+    Хранит только изменения - данные компании не копируются и не меняются.
+    strategy - стратегия упаковки сценария (None - общая стратегия сравнения).
+    """
+
+    def __init__(self, name: str, add_vehicles=(), remove_vehicles=(), add_clients=(), remove_clients=(),
+                 strategy: str = None):
+        self.name = name
+        self.add_vehicles = list(add_vehicles)
+        self.remove_vehicles = set(remove_vehicles)
+        self.add_clients = list(add_clients)
+        self.remove_clients = set(remove_clients)
+        self.strategy = strategy
+
+    def fork(self, name: str, add_vehicles=(), remove_vehicles=(), add_clients=(), remove_clients=(),
+             strategy: str = None):
+        """Новый сценарий поверх этого: изменения складываются, исходный сценарий не меняется"""
+        return Scenario(name, self.add_vehicles + list(add_vehicles), self.remove_vehicles | set(remove_vehicles),
+                        self.add_clients + list(add_clients), self.remove_clients | set(remove_clients),
+                        strategy or self.strategy)
+
+
+class ScenarioResult:
+    """
+    Итоги сценария: транспорт, заполнение, не размещенные грузы (unplaced_high - приоритета
+    выше обычного) и стоимость
+    """
+
+    def __init__(self, name: str, strategy: str, vehicles: int, clients: int, vehicles_used: int, loaded_kg: int,
+                 used_capacity_kg: int, unplaced: int, unplaced_kg: int, unplaced_high: int, cost: float,
+                 lower_bound: int, elapsed: float):
+        self.name = name
+        self.strategy = strategy
+        self.vehicles = vehicles
+        self.clients = clients
+        self.vehicles_used = vehicles_used
+        self.loaded_kg = loaded_kg
+        self.used_capacity_kg = used_capacity_kg
+        self.unplaced = unplaced
+        self.unplaced_kg = unplaced_kg
+        self.unplaced_high = unplaced_high
+        self.cost = cost
+        self.lower_bound = lower_bound
+        self.elapsed = elapsed
+
+    @property
+    def fill_ratio(self) -> float:
+        """Доля занятой грузоподъемности в использованном транспорте"""
+        return self.loaded_kg / self.used_capacity_kg if self.used_capacity_kg else 0.0
+
+    @property
+    def unplaced_weight(self) -> float:
+        """Вес не размещенных грузов (т)"""
+        return to_tonnes(self.unplaced_kg)
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "strategy": self.strategy, "vehicles": self.vehicles, "clients": self.clients,
+                "vehicles_used": self.vehicles_used, "fill_ratio": self.fill_ratio, "unplaced": self.unplaced,
+                "unplaced_weight": self.unplaced_weight, "unplaced_high": self.unplaced_high, "cost": self.cost,
+                "lower_bound": self.lower_bound, "elapsed": self.elapsed}
+
+    def __str__(self):
+        return (f"{self.name}: Транспорта использовано: {self.vehicles_used} из {self.vehicles}, "
+                f"Заполнение: {self.fill_ratio:.1%}, Не размещено: {self.unplaced} ({self.unplaced_weight}т), "
+                f"Стоимость: {self.cost:.2f}")
+
+
+def _delta(scenario: Scenario, client_rows: dict, vehicle_rows: dict) -> tuple:
+    """
+    Изменения сценария в виде, пригодном для передачи процессу: (номера убранных клиентов компании,
+    добавленные клиенты, номера убранного транспорта компании, добавленный транспорт).
+    client_rows - имя -> номера клиентов компании с этим именем.
+    """
+    added_ids = {vehicle.vehicle_id for vehicle in scenario.add_vehicles}
+    for vehicle_id in scenario.remove_vehicles:
+        if vehicle_id not in vehicle_rows and vehicle_id not in added_ids:
+            raise ValueError(f"Транспорт {vehicle_id} не найден")
+    added_names = {client.name for client in scenario.add_clients}
+    for name in scenario.remove_clients:
+        if name not in client_rows and name not in added_names:
+            raise ValueError(f"Клиент {name} не найден")
+
+    added_clients = [client_columns(client) for client in scenario.add_clients
+                     if client.name not in scenario.remove_clients]
+    added_vehicles = [vehicle_columns(vehicle) for vehicle in scenario.add_vehicles
+                      if vehicle.vehicle_id not in scenario.remove_vehicles]
+    return ({row for name in scenario.remove_clients for row in client_rows.get(name, ())}, added_clients,
+            {vehicle_rows[vehicle_id] for vehicle_id in scenario.remove_vehicles if vehicle_id in vehicle_rows},
+            added_vehicles)
+
+
+def _evaluate(base_clients, base_vehicles, name: str, delta: tuple, strategy: str,
+              time_budget: float) -> ScenarioResult:
+    """Собирает данные сценария из общих данных компании и изменений и распределяет их"""
+    start = time.perf_counter()
+    removed_clients, added_clients, removed_vehicles, added_vehicles = delta
+    clients = [row for i, row in enumerate(base_clients) if i not in removed_clients] + added_clients
+    vehicles = [row for i, row in enumerate(base_vehicles) if i not in removed_vehicles] + added_vehicles
+    items, bins = from_columns(clients, vehicles)
+    used, unplaced = pack(items, bins, strategy, time_budget)
+    # Граница - по размещенным грузам, как в итогах компании: не размещенные не требуют транспорта
+    placed = [item for vehicle in used for item in vehicle.clients_list]
+    return ScenarioResult(
+        name, strategy, len(bins), len(items), len(used),
+        sum(vehicle.load_kg for vehicle in used), sum(vehicle.capacity_kg for vehicle in used),
+        len(unplaced), sum(item.cargo_kg for item in unplaced), sum(item.priority > DEFAULT_PRIORITY for item in unplaced),
+        total_cost(used), lower_bound(placed, bins), time.perf_counter() - start,
+    )
+
+
+def _init_worker(base_clients, base_vehicles):
+    global _shared
+    _shared = (base_clients, base_vehicles)
+
+
+def _evaluate_shared(name: str, delta: tuple, strategy: str, time_budget: float) -> ScenarioResult:
+    return _evaluate(*_shared, name, delta, strategy, time_budget)
+
+
+def evaluate_scenarios(company, scenarios, strategy: str = "first_fit", time_budget: float = 1.0,
+                       max_workers: int = None, include_base: bool = True) -> list:
+    """
+    Оценивает сценарии «что если» в пуле процессов (если сценариев больше одного) и возвращает
+    ScenarioResult в порядке сценариев; первым идет BASE_SCENARIO, если include_base.
+    Распределение компании не меняется: сценарии упаковываются на копиях в виде кортежей чисел,
+    а общие данные компании передаются каждому процессу один раз.
+    """
+    scenarios = list(scenarios)
+    if include_base:
+        scenarios.insert(0, Scenario(BASE_SCENARIO))
+    for scenario in scenarios:
+        name = scenario.strategy or strategy
+        if name not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия: {name}. Доступны: {', '.join(STRATEGIES)}")
+
+    clients = company.clients
+    client_rows = {}
+    for row, client in enumerate(clients):
+        client_rows.setdefault(client.name, []).append(row)
+    vehicle_rows = {vehicle.vehicle_id: row for row, vehicle in enumerate(company.vehicles)}
+    base_clients = [client_columns(client) for client in clients]
+    base_vehicles = [vehicle_columns(vehicle) for vehicle in company.vehicles]
+    jobs = [(scenario.name, _delta(scenario, client_rows, vehicle_rows), scenario.strategy or strategy, time_budget)
+            for scenario in scenarios]
+
+    if len(jobs) > 1 and max_workers != 1:
+        # Пул процессов импортируется по требованию, чтобы не замедлять запуск программы
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(base_clients, base_vehicles)) as executor:
+            return list(executor.map(_evaluate_shared, *zip(*jobs)))
+    return [_evaluate(base_clients, base_vehicles, *job) for job in jobs]
+
+
+def format_comparison(results) -> str:
+    """Таблица сравнения сценариев; разница в транспорте и стоимости - относительно первого сценария"""
+    header = (f"{'Сценарий':<24} {'Транспорт':>10} {'Граница':>8} {'Заполнение':>11} "
+              f"{'Не размещено':>14} {'Приор.':>6} {'Стоимость':>12} {'Разница':>16}")
+    lines = [header, "-" * len(header)]
+    first = results[0] if results else None
+    for result in results:
+        difference = (f"{result.vehicles_used - first.vehicles_used:+d} шт, "
+                      f"{result.cost - first.cost:+.2f}" if result is not first else "")
+        lines.append(f"{result.name[:24]:<24} {result.vehicles_used:>5}/{result.vehicles:<4} {result.lower_bound:>8} "
+                     f"{result.fill_ratio:>11.1%} {result.unplaced:>5} ({result.unplaced_weight:>5.1f}т) "
+                     f"{result.unplaced_high:>6} {result.cost:>12.2f} {difference:>16}")
+    return "\n".join(lines)
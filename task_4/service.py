@@ -0,0 +1,176 @@
+#Асинхронный сервис диспетчеризации поверх TransportCompany
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+
+from instrumentation import latency_summary
+from loaders import client_from_row, vehicle_from_row
+from transport import TransportCompany
+
+# Окно, в течение которого запросы на распределение объединяются в один запуск (секунды)
+COALESCE_WINDOW = 0.05
+
+# Сколько последних замеров задержки хранить для каждой операции
+LATENCY_SAMPLES = 10_000
+
+
+class DispatchService:
+    """
+    Сервис с построчным протоколом JSON: один запрос - одна строка {"op": ..., ...}.
+    Операции: add_client, add_vehicle, distribute, report, track, stats.
+    Одновременные add_client добавляются в компанию одной пачкой, запросы distribute,
+    пришедшие в пределах COALESCE_WINDOW, обслуживаются одним запуском оптимизатора.
+    """
+
+    def __init__(self, company: TransportCompany, window: float = COALESCE_WINDOW):
+        self.company = company
+        self.window = window
+        self.latencies = {}
+        # Общий замок: компания меняется либо пачкой клиентов, либо оптимизатором
+        self._lock = asyncio.Lock()
+        self._pending_clients = []
+        self._flush_task = None
+        self._distributions = {}
+
+    def _record(self, op: str, started: float):
+        """Сохраняет задержку операции"""
+        self.latencies.setdefault(op, deque(maxlen=LATENCY_SAMPLES)).append(time.perf_counter() - started)
+
+    def latency_stats(self) -> dict:
+        """p50/p99 задержки по операциям в миллисекундах"""
+        return {op: latency_summary(samples) for op, samples in self.latencies.items()}
+
+    async def add_client(self, row: dict):
+        """Проверяет клиента сразу, а в компанию добавляет пачкой вместе с соседними запросами"""
+        client = client_from_row(row)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_clients.append((client, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_clients())
+        await future
+        return {"name": client.name}
+
+    async def _flush_clients(self):
+        """Добавляет накопленных клиентов одним вызовом add_clients"""
+        # Даем остальным запросам текущей итерации цикла попасть в пачку
+        await asyncio.sleep(0)
+        async with self._lock:
+            batch, self._pending_clients = self._pending_clients, []
+            self._flush_task = None
+            self.company.add_clients([client for client, _ in batch])
+        for _, future in batch:
+            future.set_result(True)
+
+    async def add_vehicle(self, row: dict):
+        vehicle = vehicle_from_row(row)
+        async with self._lock:
+            self.company.add_vehicle(vehicle)
+        return {"vehicle_id": vehicle.vehicle_id}
+
+    async def distribute(self, strategy: str = "first_fit"):
+        """Запросы в пределах окна ждут один общий запуск оптимизатора"""
+        task = self._distributions.get(strategy)
+        if task is None:
+            task = asyncio.create_task(self._run_distribution(strategy))
+            self._distributions[strategy] = task
+        return await asyncio.shield(task)
+
+    async def _run_distribution(self, strategy: str):
+        await asyncio.sleep(self.window)
+        # Следующие запросы уже будут ждать нового запуска
+        self._distributions.pop(strategy, None)
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            used = await loop.run_in_executor(
+                None, lambda: self.company.optimize_cargo_distribution(strategy, incremental=True))
+            stats = self.company.last_stats
+            reasons = self.company.last_result.reasons()
+        return {"vehicles_used": len(used), "fill_ratio": stats.fill_ratio,
+                "unplaced": stats.unplaced, "unplaced_reasons": reasons, "strategy": stats.strategy,
+                "lower_bound": stats.lower_bound, "gap": stats.gap}
+
+    async def report(self, start: int = 0, stop: int = None):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(None, self.company.get_distribution_report, start, stop)
+        return {"report": text}
+
+    async def track(self, name: str) -> dict:
+        """
+        Транспорт клиента по индексам компании. Под общим замком: оптимизатор в потоке-исполнителе
+        пересобирает распределение, и без замка можно прочитать его наполовину обновленным
+        """
+        async with self._lock:
+            client = self.company.get_client(name)
+            if client is None:
+                raise ValueError(f"Клиент {name} не найден")
+            vehicle = self.company.vehicle_of(client)
+        return {"name": name, "vehicle_id": vehicle.vehicle_id if vehicle is not None else None}
+
+    async def handle(self, request: dict) -> dict:
+        """Выполняет один запрос и возвращает ответ"""
+        started = time.perf_counter()
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "Запрос должен быть объектом JSON"}
+        op = request.get("op")
+        try:
+            if op == "add_client":
+                result = await self.add_client(request)
+            elif op == "add_vehicle":
+                result = await self.add_vehicle(request)
+            elif op == "distribute":
+                result = await self.distribute(request.get("strategy", "first_fit"))
+            elif op == "report":
+                result = await self.report(request.get("start", 0), request.get("stop"))
+            elif op == "track":
+                result = await self.track(request["name"])
+            elif op == "stats":
+                result = {"latency": self.latency_stats()}
+            else:
+                raise ValueError(f"Неизвестная операция: {op}")
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self._record(op, started)
+        return {"ok": True, **result}
+
+    async def serve_connection(self, reader, writer):
+        """Обслуживает соединение: строки JSON на входе и на выходе"""
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError as e:
+                    response = {"ok": False, "error": f"Некорректный JSON: {e}"}
+                else:
+                    response = await self.handle(request)
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+async def serve(company: TransportCompany, host: str = "127.0.0.1", port: int = 8765, unix: str = None):
+    """Запускает сервис на TCP-порту или Unix-сокете"""
+    service = DispatchService(company)
+    if unix:
+        server = await asyncio.start_unix_server(service.serve_connection, unix)
+    else:
+        server = await asyncio.start_server(service.serve_connection, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сервис диспетчеризации транспортной компании")
+    parser.add_argument("--name", default="Быстрая Доставка", help="название компании")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="путь к Unix-сокету вместо TCP")
+    args = parser.parse_args()
+    asyncio.run(serve(TransportCompany(args.name), args.host, args.port, args.unix))
+
+
+if __name__ == "__main__":
+    main()
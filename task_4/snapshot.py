@@ -0,0 +1,365 @@
+#Двоичный снимок состояния компании с перезагрузкой через mmap
+import contextlib
+import gc
+import math
+import mmap
+import struct
+import sys
+from array import array
+
+from transport import Client, ClientPart, Vehicle, Truck, Train, TransportCompany, reserve_vehicle_ids
+from units import to_tonnes
+
+MAGIC = b"TCSNAP08"
+
+# Заголовок: сигнатура, порядок байт, число транспорта, клиентов, частей разделенных грузов и строк
+HEADER = struct.Struct("<8s8sqqqq")
+
+# Тип транспорта в колонке kind
+KINDS = {Vehicle: 0, Truck: 1, Train: 2}
+
+# Колонки снимка: (имя, код типа array) в порядке размещения в файле
+# Вес, грузоподъемность и загрузка - целые килограммы, как в объектах; car - вагон поезда с грузом клиента
+VEHICLE_COLUMNS = [("vehicle_id", "q"), ("capacity_kg", "q"), ("load_kg", "q"), ("kind", "b"), ("extra", "q"),
+                   ("vehicle_partition", "q"), ("max_volume", "d"), ("max_pallets", "q"),
+                   ("current_volume", "d"), ("current_pallets", "q"), ("fixed_cost", "d"), ("cost_per_tonne", "d")]
+CLIENT_COLUMNS = [("cargo_kg", "q"), ("is_vip", "b"), ("vehicle_row", "q"), ("position", "q"), ("name", "q"),
+                  ("client_partition", "q"), ("volume", "d"), ("pallets", "q"), ("priority", "q"), ("deadline", "d"),
+                  ("car", "q")]
+# Части разделенных грузов: строка клиента, строка транспорта, позиция в нем, вес, номер части, число частей, вагон
+PART_COLUMNS = [("part_client", "q"), ("part_vehicle", "q"), ("part_position", "q"), ("part_kg", "q"),
+                ("part_index", "q"), ("part_count", "q"), ("part_car", "q")]
+
+# Незаданный объем и срок доставки хранятся как NaN, незаданное число паллет и вагон - как -1
+NO_VOLUME = float("nan")
+NO_DEADLINE = float("nan")
+NO_PALLETS = -1
+NO_CAR = -1
+
+
+def _volume(value: float):
+    """Объем из колонки снимка (None для NaN)"""
+    return None if math.isnan(value) else value
+
+
+def _pallets(value: int):
+    """Число паллет из колонки снимка (None для -1)"""
+    return None if value < 0 else value
+
+
+def _deadline(value: float):
+    """Срок доставки из колонки снимка (None для NaN)"""
+    return None if math.isnan(value) else value
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """
+    Приостанавливает сборщик циклов на время массового создания объектов: иначе он запускается
+    через каждые несколько сотен объектов и обходит уже созданные, хотя собирать нечего
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _aligned(size: int) -> int:
+    """Выравнивает размер колонки до 8 байт"""
+    return (size + 7) // 8 * 8
+
+
+def _layout(n_vehicles: int, n_clients: int, n_parts: int, n_strings: int):
+    """Смещения колонок в файле: {имя: (смещение, число элементов, код типа)}"""
+    offset = HEADER.size
+    layout = {}
+    sections = [(VEHICLE_COLUMNS, n_vehicles), (CLIENT_COLUMNS, n_clients), (PART_COLUMNS, n_parts),
+                ([("string_offsets", "q")], n_strings + 1)]
+    for columns, count in sections:
+        for name, code in columns:
+            layout[name] = (offset, count, code)
+            offset += _aligned(count * array(code).itemsize)
+    layout["strings"] = (offset, None, "B")
+    return layout
+
+
+def save_company(company: TransportCompany, path: str):
+    """Сохраняет транспорт, клиентов и распределение в двоичный снимок"""
+    strings = [company.name]
+    string_ids = {company.name: 0}
+
+    def intern(value: str) -> int:
+        # Отсутствующая партиция хранится как -1
+        if value is None:
+            return -1
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    vehicles = company.vehicles
+    columns = {name: array(code) for name, code in VEHICLE_COLUMNS + CLIENT_COLUMNS + PART_COLUMNS}
+
+    placement = {}
+    parts = []
+    for row, vehicle in enumerate(vehicles):
+        kind = KINDS.get(type(vehicle))
+        if kind is None:
+            raise ValueError(f"Снимок не поддерживает транспорт типа {type(vehicle).__name__}")
+        cars = getattr(vehicle, "_car_of", None) or {}
+        if vehicle.load_kg:
+            for position, client in enumerate(vehicle.clients_list):
+                if isinstance(client, ClientPart):
+                    parts.append((client, row, position, cars.get(client, NO_CAR)))
+                else:
+                    placement[client] = (row, position, cars.get(client, NO_CAR))
+        columns["vehicle_id"].append(vehicle._id)
+        columns["capacity_kg"].append(vehicle.capacity_kg)
+        columns["load_kg"].append(vehicle.load_kg)
+        columns["kind"].append(kind)
+        columns["vehicle_partition"].append(intern(vehicle.partition))
+        columns["max_volume"].append(vehicle.max_volume if vehicle.max_volume is not None else NO_VOLUME)
+        columns["max_pallets"].append(vehicle.max_pallets if vehicle.max_pallets is not None else NO_PALLETS)
+        columns["current_volume"].append(vehicle.current_volume)
+        columns["current_pallets"].append(vehicle.current_pallets)
+        columns["fixed_cost"].append(vehicle.fixed_cost)
+        columns["cost_per_tonne"].append(vehicle.cost_per_tonne)
+        if isinstance(vehicle, Truck):
+            columns["extra"].append(intern(vehicle.color))
+        elif isinstance(vehicle, Train):
+            columns["extra"].append(vehicle.number_of_cars)
+        else:
+            columns["extra"].append(0)
+
+    for client in company.clients:
+        row, position, car = placement.get(client, (-1, -1, NO_CAR))
+        columns["cargo_kg"].append(client.cargo_kg)
+        columns["is_vip"].append(client.is_vip)
+        columns["vehicle_row"].append(row)
+        columns["position"].append(position)
+        columns["name"].append(intern(client.name))
+        columns["client_partition"].append(intern(client.partition))
+        columns["volume"].append(client.volume if client.volume is not None else NO_VOLUME)
+        columns["pallets"].append(client.pallets if client.pallets is not None else NO_PALLETS)
+        columns["priority"].append(client.priority)
+        columns["deadline"].append(client.deadline if client.deadline is not None else NO_DEADLINE)
+        columns["car"].append(car)
+
+    if parts:
+        client_rows = {client: row for row, client in enumerate(company.clients)}
+        for part, row, position, car in parts:
+            columns["part_client"].append(client_rows[part.client])
+            columns["part_vehicle"].append(row)
+            columns["part_position"].append(position)
+            columns["part_kg"].append(part.cargo_kg)
+            columns["part_index"].append(part.index)
+            columns["part_count"].append(part.count)
+            columns["part_car"].append(car)
+
+    blob = bytearray()
+    string_offsets = array("q", [0])
+    for value in strings:
+        blob += value.encode("utf-8")
+        string_offsets.append(len(blob))
+    columns["string_offsets"] = string_offsets
+
+    layout = _layout(len(vehicles), len(company.clients), len(parts), len(strings))
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, sys.byteorder.encode().ljust(8, b"\0"),
+                            len(vehicles), len(company.clients), len(parts), len(strings)))
+        for name, (offset, count, code) in layout.items():
+            if name == "strings":
+                f.write(blob)
+                break
+            data = columns[name].tobytes()
+            f.write(data + b"\0" * (_aligned(len(data)) - len(data)))
+
+
+class SnapshotView:
+    """
+    Снимок, отображенный в память: колонки доступны как memoryview без разбора файла,
+    объекты Client и Vehicle создаются только при обращении к строке.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        magic, byteorder, self.n_vehicles, self.n_clients, self.n_parts, n_strings = HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Файл не является снимком транспортной компании")
+        if byteorder.rstrip(b"\0").decode() != sys.byteorder:
+            self.close()
+            raise ValueError("Снимок создан на платформе с другим порядком байт")
+
+        for name, (offset, count, code) in _layout(self.n_vehicles, self.n_clients, self.n_parts, n_strings).items():
+            if name == "strings":
+                self._strings = self._buffer[offset:]
+            else:
+                size = count * array(code).itemsize
+                setattr(self, name, self._buffer[offset:offset + size].cast(code))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Освобождает отображение файла"""
+        columns = VEHICLE_COLUMNS + CLIENT_COLUMNS + PART_COLUMNS
+        for name in [name for name, _ in columns] + ["string_offsets", "_strings"]:
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def string(self, index: int) -> str:
+        """Строка из таблицы строк"""
+        return str(self._strings[self.string_offsets[index]:self.string_offsets[index + 1]], "utf-8")
+
+    def _partition(self, index: int):
+        """Партиция по индексу строки (None для -1)"""
+        return self.string(index) if index >= 0 else None
+    
+    @property
+    def company_name(self) -> str:
+        return self.string(0)
+
+    def client(self, row: int) -> Client:
+        """Клиент из строки снимка (без повторной валидации)"""
+        return Client.from_kg(self.string(self.name[row]), self.cargo_kg[row], bool(self.is_vip[row]),
+                              self._partition(self.client_partition[row]), _volume(self.volume[row]),
+                              _pallets(self.pallets[row]), self.priority[row], _deadline(self.deadline[row]))
+
+    def vehicle(self, row: int):
+        """Транспорт из строки снимка без клиентов (без повторной валидации)"""
+        kind = self.kind[row]
+        limits = (self._partition(self.vehicle_partition[row]), _volume(self.max_volume[row]),
+                  _pallets(self.max_pallets[row]), self.fixed_cost[row], self.cost_per_tonne[row])
+        capacity = to_tonnes(self.capacity_kg[row])
+        if kind == KINDS[Truck]:
+            vehicle = Truck.trusted(capacity, self.string(self.extra[row]), *limits)
+        elif kind == KINDS[Train]:
+            vehicle = Train.trusted(capacity, self.extra[row], *limits)
+        else:
+            vehicle = Vehicle.trusted(capacity, *limits)
+        vehicle._id = self.vehicle_id[row]
+        vehicle.load_kg = self.load_kg[row]
+        vehicle.current_volume = self.current_volume[row] or 0
+        vehicle.current_pallets = self.current_pallets[row]
+        return vehicle
+
+    def to_company(self, columnar: bool = False) -> TransportCompany:
+        """Восстанавливает компанию целиком вместе с распределением"""
+        with _gc_paused():
+            return self._to_company(columnar)
+
+    def _to_company(self, columnar: bool) -> TransportCompany:
+        company = TransportCompany(self.company_name, columnar)
+        # Колонки читаются целиком: это быстрее, чем обращаться к memoryview по строкам
+        offsets = self.string_offsets.tolist()
+        blob = bytes(self._strings)
+        text = str(blob, "utf-8")
+        # Смещения даны в байтах; для ASCII они совпадают с позициями символов и строки режутся без декодирования
+        source = text if len(text) == len(blob) else blob
+        strings = [source[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+        if source is blob:
+            strings = [str(value, "utf-8") for value in strings]
+        # Индекс -1 (нет партиции) указывает на последний элемент
+        strings.append(None)
+
+        vehicles = []
+        kinds = self.kind.tolist()
+        extras = self.extra.tolist()
+        for (vehicle_id, capacity_kg, load_kg, kind, extra, partition, max_volume, max_pallets,
+             current_volume, current_pallets, fixed_cost, cost_per_tonne) in zip(
+                self.vehicle_id.tolist(), self.capacity_kg.tolist(), self.load_kg.tolist(), kinds, extras,
+                self.vehicle_partition.tolist(), self.max_volume.tolist(), self.max_pallets.tolist(),
+                self.current_volume.tolist(), self.current_pallets.tolist(), self.fixed_cost.tolist(),
+                self.cost_per_tonne.tolist()):
+            # Данные снимка уже проходили проверку при создании объектов
+            limits = (strings[partition], _volume(max_volume), _pallets(max_pallets), fixed_cost, cost_per_tonne)
+            capacity = to_tonnes(capacity_kg)
+            if kind == KINDS[Truck]:
+                vehicle = Truck.trusted(capacity, strings[extra], *limits)
+            elif kind == KINDS[Train]:
+                vehicle = Train.trusted(capacity, extra, *limits)
+            else:
+                vehicle = Vehicle.trusted(capacity, *limits)
+            vehicle._id = vehicle_id
+            vehicle.load_kg = load_kg
+            vehicle.current_volume = current_volume or 0
+            vehicle.current_pallets = current_pallets
+            vehicles.append(vehicle)
+
+        # Распределение восстанавливается прямо из колонок: позиции задают порядок грузов в транспорте,
+        # колонка car - вагон поезда, поэтому размещение грузов не повторяется
+        clients = []
+        loaded = {}
+        from_kg = Client.from_kg
+        for name, cargo_kg, is_vip, vehicle_row, position, partition, volume, pallets, priority, deadline, car in zip(
+                self.name.tolist(), self.cargo_kg.tolist(), self.is_vip.tolist(),
+                self.vehicle_row.tolist(), self.position.tolist(), self.client_partition.tolist(),
+                self.volume.tolist(), self.pallets.tolist(), self.priority.tolist(), self.deadline.tolist(),
+                self.car.tolist()):
+            # NaN не равен самому себе: так проверка незаданного объема и срока обходится без вызова функции
+            client = from_kg(strings[name], cargo_kg, bool(is_vip), strings[partition],
+                             volume if volume == volume else None, pallets if pallets >= 0 else None,
+                             priority, deadline if deadline == deadline else None)
+            clients.append(client)
+            if vehicle_row >= 0:
+                entry = (position, client, car)
+                if vehicle_row in loaded:
+                    loaded[vehicle_row].append(entry)
+                else:
+                    loaded[vehicle_row] = [entry]
+
+        # Части разделенных грузов создаются заново от восстановленных клиентов и встают на свои позиции
+        parts = {}
+        for client_row, vehicle_row, position, cargo_kg, index, count, car in zip(
+                self.part_client.tolist(), self.part_vehicle.tolist(), self.part_position.tolist(),
+                self.part_kg.tolist(), self.part_index.tolist(), self.part_count.tolist(), self.part_car.tolist()):
+            client = clients[client_row]
+            part = ClientPart.of(client, cargo_kg, index, count)
+            parts.setdefault(client, []).append(part)
+            loaded.setdefault(vehicle_row, []).append((position, part, car))
+        for client_parts in parts.values():
+            client_parts.sort(key=lambda part: part.index)
+
+        assignment = {}
+        for vehicle_row, entries in loaded.items():
+            # Позиции в транспорте различны, поэтому сравнение записей не доходит до клиентов
+            entries.sort()
+            vehicle = vehicles[vehicle_row]
+            vehicle.clients_list = [client for _, client, _ in entries]
+            assignment.update(dict.fromkeys(vehicle.clients_list, vehicle))
+            if vehicle.car_capacity_kg is not None:
+                car_loads = [0] * vehicle.number_of_cars
+                car_of = {}
+                for _, client, car in entries:
+                    car_loads[car] += client.cargo_kg
+                    car_of[client] = car
+                vehicle._car_loads = car_loads
+                vehicle._car_of = car_of
+
+        if vehicles:
+            reserve_vehicle_ids(max(self.vehicle_id))
+        company._restore(vehicles, clients, assignment, parts)
+        return company
+
+
+def open_snapshot(path: str) -> SnapshotView:
+    """Открывает снимок через mmap; данные читаются с диска по мере обращения"""
+    return SnapshotView(path)
+
+
+def load_company(path: str, columnar: bool = False) -> TransportCompany:
+    """Загружает компанию из снимка"""
+    with open_snapshot(path) as view:
+        return view.to_company(columnar)
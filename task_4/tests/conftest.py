@@ -0,0 +1,5 @@
+#Модули программы импортируются из каталога task_4, как в cli.py и main.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
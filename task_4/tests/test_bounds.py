@@ -0,0 +1,36 @@
+#Нижние границы количества транспорта
+from packing import continuous_bound, lower_bound, martello_toth_l2
+from transport import Client, TransportCompany, Truck
+
+
+def test_continuous_bound_takes_the_largest_vehicles_first():
+    assert continuous_bound([5, 5, 5], [10, 10, 10]) == 2
+    assert continuous_bound([5, 5, 5], [20, 10, 10]) == 1
+    assert continuous_bound([], [10]) == 0
+    # Не больше, чем транспорта в парке
+    assert continuous_bound([50], [10, 10]) == 2
+
+
+def test_l2_counts_heavy_items_the_continuous_bound_misses():
+    assert continuous_bound([6, 6, 6], [10, 10, 10]) == 2
+    assert martello_toth_l2([6, 6, 6], 10) == 3
+    assert martello_toth_l2([4, 4, 4, 7, 7], 10) == 4
+    assert martello_toth_l2([11, 12], 10) == 0
+
+
+def test_lower_bound_ignores_cargo_heavier_than_any_vehicle():
+    vehicles = [Truck(10, "белый") for _ in range(3)]
+    assert lower_bound([Client("a", 6), Client("b", 6), Client("c", 6)], vehicles) == 3
+    assert lower_bound([Client("a", 6), Client("big", 50)], vehicles) == 1
+    assert lower_bound([Client("a", 6)], []) == 0
+
+
+def test_stats_report_the_gap_to_the_bound():
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(10, "белый") for _ in range(6)])
+    company.add_clients([Client(f"c{i}", w) for i, w in enumerate((2, 5, 2, 2, 6, 3))])
+    company.optimize_cargo_distribution("ffd")
+    assert (company.last_stats.lower_bound, company.last_stats.gap) == (2, 1)
+    company.optimize_cargo_distribution("exact")
+    assert company.last_stats.gap == 0
+    assert "Нижняя граница: 2 (разрыв 0)" in str(company.last_stats)
@@ -0,0 +1,48 @@
+#Минимизация стоимости рейсов
+import pytest
+
+from packing import pack, total_cost, vehicle_cost
+from transport import Client, TransportCompany, Truck
+
+
+def _fleet():
+    return [Truck(20, "белый", fixed_cost=100.0), Truck(10, "синий", fixed_cost=20.0),
+            Truck(10, "синий", fixed_cost=20.0)]
+
+
+def _clients(*weights):
+    return [Client(f"c{i}", weight) for i, weight in enumerate(weights)]
+
+
+def test_vehicle_cost_counts_only_loaded_vehicles():
+    truck = Truck(10, "белый", fixed_cost=50.0, cost_per_tonne=2.5)
+    assert vehicle_cost(truck) == 0.0
+    truck.load_cargo(Client("a", 4))
+    assert vehicle_cost(truck) == pytest.approx(60.0)
+    assert total_cost([truck, Truck(10, "белый", fixed_cost=50.0)]) == pytest.approx(60.0)
+
+
+def test_min_cost_prefers_cheaper_tonnes_over_fewer_vehicles():
+    used, unplaced = pack(_clients(8, 7), _fleet(), "ffd")
+    assert unplaced == [] and len(used) == 1 and total_cost(used) == pytest.approx(100.0)
+
+    used, unplaced = pack(_clients(8, 7), _fleet(), "min_cost")
+    assert unplaced == [] and len(used) == 2 and total_cost(used) == pytest.approx(40.0)
+    assert {vehicle.capacity_kg for vehicle in used} == {10000}
+
+
+def test_min_cost_matches_ffd_without_costs():
+    weights = (2, 5, 2, 2, 6, 3, 9, 1, 4)
+    ffd, _ = pack(_clients(*weights), [Truck(c, "белый") for c in (10, 10, 8, 8, 12)], "ffd")
+    cheap, _ = pack(_clients(*weights), [Truck(c, "белый") for c in (10, 10, 8, 8, 12)], "min_cost")
+    assert len(cheap) == len(ffd)
+
+
+def test_company_reports_cost_of_the_distribution():
+    company = TransportCompany("Тест")
+    company.add_vehicles(_fleet())
+    company.add_clients(_clients(8, 7))
+    company.optimize_cargo_distribution("min_cost")
+    assert company.last_stats.cost == pytest.approx(40.0)
+    company.optimize_cargo_distribution("ffd")
+    assert company.last_stats.cost == pytest.approx(100.0)
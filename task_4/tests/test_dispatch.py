@@ -0,0 +1,87 @@
+#Онлайн-диспетчеризация
+import time
+
+from transport import Client, TransportCompany, Truck
+from dispatch import RollingDispatcher
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _company(*capacities):
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(capacity, "белый") for capacity in capacities])
+    return company
+
+
+def test_best_fit_and_dispatch_when_full():
+    company = _company(10, 10)
+    dispatched = []
+    dispatcher = RollingDispatcher(company, fill=0.9, on_dispatch=dispatched.append)
+    first = dispatcher.place(Client("a", 6))
+    assert dispatcher.place(Client("b", 3)) is first
+    second = dispatcher.place(Client("c", 5))
+    assert second is not first
+    assert dispatched == [first] and first.load_kg == 9000
+    assert dispatcher.place(Client("d", 20)) is None
+    assert [client.name for client in dispatcher.unplaced] == ["d"]
+    assert company.vehicle_of(company.get_client("c")) is second
+
+
+def test_tick_dispatches_by_window_and_consolidates():
+    clock = FakeClock()
+    company = _company(10, 10, 10)
+    dispatcher = RollingDispatcher(company, window=60, fill=1.0, clock=clock)
+    first = dispatcher.place(Client("a", 8))
+    clock.now = 30
+    # В первом транспорте места нет, поэтому открывается следующий
+    second = dispatcher.place(Client("b", 3))
+    assert second is not first
+    clock.now = 61
+    assert dispatcher.tick() == [first]
+    assert dispatcher.dispatched == [first]
+    assert dispatcher.stats()["open"] == 1
+
+
+def test_background_thread_survives_errors():
+    company = _company(5, 5)
+
+    def failing(vehicle):
+        raise RuntimeError("обработчик упал")
+
+    dispatcher = RollingDispatcher(company, fill=1.0, tick_interval=0.01, on_dispatch=failing)
+    dispatcher.start()
+    dispatcher.submit("не клиент")
+    dispatcher.submit(Client("a", 5))
+    dispatcher.submit(Client("b", 2))
+    dispatcher.stop()
+
+    errors = [type(error) for _, error in dispatcher.errors]
+    assert TypeError in errors and RuntimeError in errors
+    assert company.vehicle_of(company.get_client("b")) is not None
+    assert dispatcher.stats()["errors"] == len(dispatcher.errors)
+
+
+def test_failing_tick_keeps_the_thread_running():
+    company = _company(5, 5)
+
+    def failing(vehicle):
+        raise RuntimeError("обработчик упал")
+
+    dispatcher = RollingDispatcher(company, window=0.01, fill=1.0, tick_interval=0.01, on_dispatch=failing)
+    dispatcher.start()
+    dispatcher.submit(Client("a", 2))
+    deadline = time.monotonic() + 5
+    while not dispatcher.errors and time.monotonic() < deadline:
+        time.sleep(0.01)
+    dispatcher.submit(Client("b", 2))
+    dispatcher.stop()
+
+    client, error = dispatcher.errors[0]
+    assert client is None and isinstance(error, RuntimeError)
+    assert company.vehicle_of(company.get_client("b")) is not None
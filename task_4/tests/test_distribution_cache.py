@@ -0,0 +1,64 @@
+#Кэш распределений по отпечатку данных компании
+import gc
+
+from transport import Client, TransportCompany, Truck
+
+
+def _company():
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(10, "белый"), Truck(10, "белый")])
+    company.add_clients([Client("a", 6), Client("b", 6)])
+    return company
+
+
+def test_repeat_without_changes_is_a_hit():
+    company = _company()
+    first = company.optimize_cargo_distribution()
+    assert company.optimize_cargo_distribution() == first
+    assert (company.distribution_cache.hits, company.distribution_cache.misses) == (1, 1)
+
+
+def test_change_misses_and_undo_restores_cached_result():
+    company = _company()
+    company.optimize_cargo_distribution()
+    extra = Client("c", 3)
+    company.add_client(extra)
+    company.optimize_cargo_distribution()
+    assert company.distribution_cache.misses == 2
+    assert company.vehicle_of(extra) is not None
+
+    company.remove_client(extra)
+    used = company.optimize_cargo_distribution()
+    assert company.distribution_cache.hits == 1
+    assert sorted(vehicle.current_load for vehicle in used) == [6, 6]
+
+
+def test_update_client_invalidates_cached_results():
+    company = _company()
+    company.optimize_cargo_distribution()
+    company.update_client("a", cargo_weight=9)
+    company.optimize_cargo_distribution()
+    assert company.distribution_cache.hits == 0
+    assert company.vehicle_of(company.get_client("a")).current_load == 9
+
+
+def test_new_vehicle_in_place_of_removed_one_is_not_a_hit():
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(10, "белый"), Truck(5, "белый")])
+    company.add_clients([Client("x", 8), Client("y", 15)])
+    company.optimize_cargo_distribution("ffd")
+    y = company.get_client("y")
+    assert company.vehicle_of(y) is None
+
+    # Неиспользованный транспорт не держится кэшем: его id достается новому транспорту
+    small = company.vehicles[1]
+    old_id = id(small)
+    company.remove_vehicle(small.vehicle_id)
+    del small
+    gc.collect()
+    candidates = [Truck(20, "белый") for _ in range(100)]
+    company.add_vehicle(next((vehicle for vehicle in candidates if id(vehicle) == old_id), candidates[0]))
+    company.optimize_cargo_distribution("ffd")
+
+    assert company.distribution_cache.hits == 0
+    assert company.vehicle_of(y) is not None
@@ -0,0 +1,45 @@
+#Дозагрузка без полной переупаковки
+from transport import Client, TransportCompany, Truck
+
+
+def _company():
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(10, "белый"), Truck(10, "белый")])
+    company.add_clients([Client("a", 9), Client("b", 9), Client("vip", 20, is_vip=True)])
+    return company
+
+
+def test_unplaced_vip_does_not_force_repack():
+    company = _company()
+    company.optimize_cargo_distribution()
+    vip = company.get_client("vip")
+    assert [client for client, _ in company.last_result.unplaced] == [vip]
+    before = {name: company.vehicle_of(company.get_client(name)) for name in ("a", "b")}
+
+    company.add_clients([Client("c", 0.5), Client("d", 0.5)])
+    company.optimize_cargo_distribution(incremental=True)
+
+    assert company.last_stats.strategy == "incremental"
+    assert {name: company.vehicle_of(company.get_client(name)) for name in ("a", "b")} == before
+    assert company.vehicle_of(company.get_client("c")) is not None
+    assert company.vehicle_of(company.get_client("d")) is not None
+    assert company.vehicle_of(vip) is None
+    assert [client for client, _ in company.last_result.unplaced] == [vip]
+
+
+def test_new_vip_that_does_not_fit_forces_repack():
+    company = _company()
+    company.optimize_cargo_distribution()
+    company.add_client(Client("vip2", 2, is_vip=True))
+    company.optimize_cargo_distribution(incremental=True)
+    assert company.last_stats.strategy == "first_fit"
+    assert company.vehicle_of(company.get_client("vip2")) is not None
+
+
+def test_unplaced_client_is_retried_after_vehicle_added():
+    company = _company()
+    company.optimize_cargo_distribution()
+    company.add_vehicle(Truck(25, "синий"))
+    company.optimize_cargo_distribution(incremental=True)
+    assert company.last_stats.strategy == "incremental"
+    assert company.vehicle_of(company.get_client("vip")) is not None
@@ -0,0 +1,70 @@
+#Индексы поиска клиентов и транспорта
+import pytest
+
+from loaders import load_clients
+from transport import Client, TransportCompany, Truck
+
+
+def test_client_names_may_repeat():
+    company = TransportCompany("Тест")
+    company.add_vehicle(Truck(10, "белый"))
+    first, second = Client("Иванов", 3), Client("Иванов", 4)
+    company.add_client(first)
+    company.add_clients([second, Client("Петров", 2)])
+
+    assert company.get_client("Иванов") is first
+    assert company.get_clients("Иванов") == [first, second]
+    assert len(company.clients) == 3
+    company.optimize_cargo_distribution()
+    assert company.vehicle_of(first) is not None and company.vehicle_of(second) is not None
+
+
+def test_removing_first_namesake_promotes_the_next():
+    company = TransportCompany("Тест")
+    first, second = Client("Иванов", 3), Client("Иванов", 4)
+    company.add_clients([first, second])
+    company.remove_client(first)
+    assert company.get_client("Иванов") is second
+    assert company.get_clients("Иванов") == [second]
+    assert company.scheduled_clients() == [second]
+
+    company.update_client("Иванов", cargo_weight=5)
+    assert second.cargo_weight == 5
+    company.remove_client(second)
+    assert company.get_client("Иванов") is None and company.get_clients("Иванов") == []
+    with pytest.raises(ValueError):
+        company.remove_client(second)
+
+
+def test_same_client_object_is_added_once():
+    company = TransportCompany("Тест")
+    client = Client("Иванов", 3)
+    company.add_client(client)
+    with pytest.raises(ValueError):
+        company.add_client(client)
+    with pytest.raises(ValueError):
+        company.add_clients([Client("Петров", 1), client])
+    assert company.clients == [client]
+
+
+def test_loader_accepts_repeated_names(tmp_path):
+    path = tmp_path / "clients.csv"
+    path.write_text("name,cargo_weight,is_vip\nА,1,нет\nБ,2,нет\nА,3,да\n", encoding="utf-8")
+    company = TransportCompany("Тест")
+    company.add_client(Client("Б", 5))
+    result = load_clients(company, str(path))
+    assert (result.loaded, result.errors) == (3, [])
+    assert [client.cargo_weight for client in company.get_clients("А")] == [1, 3]
+    assert len(company.get_clients("Б")) == 2
+
+
+def test_vehicle_lookup_by_id():
+    company = TransportCompany("Тест")
+    truck = Truck(10, "белый")
+    company.add_vehicle(truck)
+    assert company.get_vehicle(truck.vehicle_id) is truck
+    assert company.get_vehicle("не id") is None
+    with pytest.raises(ValueError):
+        company.add_vehicle(truck)
+    company.remove_vehicle(truck.vehicle_id)
+    assert company.get_vehicle(truck.vehicle_id) is None
@@ -0,0 +1,76 @@
+#Пакетная загрузка из файлов
+import pytest
+
+from loaders import load_clients, load_vehicles
+from transport import TransportCompany, Train, Truck
+
+CLIENTS_CSV = ("name,cargo_weight,is_vip,partition,volume,pallets,priority,deadline\n"
+               "a,2.5,да,холод,3,,,\n"
+               "b,abc,,,,,,\n"
+               "c,-1,,,,,,\n"
+               "d,4,нет,,,2,3,1.5\n"
+               "e,,,,,,,\n"
+               ",1,,,,,,\n"
+               "f,1,,,,,-2,\n")
+
+CLIENTS_JSONL = ('{"name": "a", "cargo_weight": 2.5, "is_vip": true}\n'
+                 '{"name": "b"}\n'
+                 '\n'
+                 'не json\n'
+                 '{"name": "c", "cargo_weight": [3]}\n'
+                 '{"name": "d", "cargo_weight": 1, "priority": 2, "deadline": 4}\n')
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [2, 10_000])
+def test_csv_clients_report_bad_rows_and_load_the_rest(tmp_path, chunk_size):
+    company = TransportCompany("Тест")
+    result = load_clients(company, _write(tmp_path, "clients.csv", CLIENTS_CSV), chunk_size)
+
+    assert result.loaded == 2
+    assert [line for line, _ in result.errors] == [3, 4, 6, 7, 8]
+    assert result.errors[0][1].startswith("ValueError")
+    a, d = company.get_client("a"), company.get_client("d")
+    assert (a.cargo_kg, a.is_vip, a.partition, a.volume) == (2500, True, "холод", 3.0)
+    assert (d.is_vip, d.pallets, d.priority, d.deadline) == (False, 2, 3, 1.5)
+    assert len(company.clients) == 2
+
+
+def test_jsonl_clients_number_lines_including_blank_ones(tmp_path):
+    company = TransportCompany("Тест")
+    result = load_clients(company, _write(tmp_path, "clients.jsonl", CLIENTS_JSONL))
+
+    assert result.loaded == 2
+    assert [(line, error.split(":")[0]) for line, error in result.errors] == [
+        (2, "KeyError"), (4, "JSONDecodeError"), (5, "ValueError")]
+    assert [client.name for client in company.clients] == ["a", "d"]
+    assert company.get_client("a").priority == 1 and company.get_client("d").deadline == 4
+    assert "Загружено: 2, Ошибок: 3" in str(result)
+
+
+def test_vehicles_report_unknown_types_and_missing_fields(tmp_path):
+    company = TransportCompany("Тест")
+    path = _write(tmp_path, "vehicles.csv", "type,capacity,color,number_of_cars,fixed_cost,cost_per_tonne\n"
+                                            "truck,10,белый,,50,2\n"
+                                            "ship,10,,,,\n"
+                                            "Train,30,,3,,\n"
+                                            "train,30,,,,\n"
+                                            "truck,-5,белый,,,\n")
+    result = load_vehicles(company, path, chunk_size=2)
+
+    assert result.loaded == 2
+    assert [line for line, _ in result.errors] == [3, 5, 6]
+    assert "Неизвестный тип транспорта: ship" in result.errors[0][1]
+    truck, train = company.vehicles
+    assert isinstance(truck, Truck) and (truck.fixed_cost, truck.cost_per_tonne) == (50.0, 2.0)
+    assert isinstance(train, Train) and train.capacity_kg == 30000
+
+
+def test_unsupported_file_type_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        load_clients(TransportCompany("Тест"), _write(tmp_path, "clients.txt", "name\n"))
@@ -0,0 +1,71 @@
+#Компактные объекты клиентов и транспорта
+import pytest
+
+from transport import Client, ClientPart, Train, Truck
+
+
+@pytest.mark.parametrize("obj", [Client("a", 1), Truck(10, "белый"), Train(30, 3),
+                                 ClientPart.of(Client("a", 4), 2000, 1, 2)])
+def test_objects_have_no_instance_dict(obj):
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        obj.unknown_field = 1
+
+
+def test_rare_client_fields_share_one_slot():
+    client = Client("a", 1.5)
+    assert client._extra is None
+    assert (client.partition, client.volume, client.pallets, client.deadline) == (None, None, None, None)
+
+    client.deadline = 4
+    client.partition = "север"
+    assert client._extra == ("север", None, None, 4)
+    client.partition = client.deadline = None
+    assert client._extra is None
+
+
+def test_equal_weights_share_one_int():
+    first, second = Client("a", 1.5), Client("b", 1.5)
+    assert first.cargo_kg == 1500 and first.cargo_kg is second.cargo_kg
+    second.cargo_weight = 2.5
+    assert second.cargo_kg is Client("c", 2.5).cargo_kg and first.cargo_weight == 1.5
+
+
+def _client_state(client):
+    return client.name, client.cargo_kg, client.is_vip, client.priority, client._extra
+
+
+def _vehicle_state(vehicle):
+    return tuple(getattr(vehicle, name) for name in ("capacity_kg", "load_kg", "partition", "max_volume",
+                                                     "max_pallets", "current_volume", "current_pallets",
+                                                     "fixed_cost", "cost_per_tonne", "car_capacity_kg"))
+
+
+@pytest.mark.parametrize("fields", [("a", 2.5), ("v", 1, True), ("b", 0.3333, False, "юг", 2.0, 3, 2, 8.5),
+                                    ("c", 4, True, None, None, None, 0, None)])
+def test_trusted_client_equals_validated_one(fields):
+    assert _client_state(Client.trusted(*fields)) == _client_state(Client(*fields))
+
+
+@pytest.mark.parametrize("make, fields", [(Truck, (10, "белый")), (Truck, (7.5, "синий", "юг", 20.0, 8, 50.0, 2.0)),
+                                          (Train, (30, 4)), (Train, (12.5, 1, None, None, None, 10.0, 1.0))])
+def test_trusted_vehicle_equals_validated_one(make, fields):
+    trusted, validated = make.trusted(*fields), make(*fields)
+    assert type(trusted) is make and trusted.vehicle_id != validated.vehicle_id
+    assert _vehicle_state(trusted) == _vehicle_state(validated)
+    assert str(trusted).split(",", 1)[1] == str(validated).split(",", 1)[1]
+
+
+def test_trusted_loading_matches_checked_loading():
+    checked, trusted = Train(30, 3, max_volume=10.0), Train(30, 3, max_volume=10.0)
+    clients = [Client("a", 9, volume=2.0), Client("b", 6, pallets=1), Client("c", 8)]
+    for client in clients:
+        checked.load_cargo(client)
+        trusted.load_trusted(client)
+    assert _vehicle_state(trusted) == _vehicle_state(checked)
+    assert trusted._car_loads == checked._car_loads == [9000, 6000, 8000]
+
+    with pytest.raises(ValueError):
+        checked.load_cargo(Client("d", 9))
+    with pytest.raises(TypeError):
+        checked.load_cargo("d")
@@ -0,0 +1,73 @@
+#Стратегии упаковки
+import random
+
+import pytest
+
+from packing import EXACT_MAX_CLIENTS, STRATEGIES, pack
+from transport import Client, TransportCompany, Train, Truck
+
+
+def _trucks(*capacities):
+    return [Truck(capacity, "белый") for capacity in capacities]
+
+
+def _clients(*weights):
+    return [Client(f"c{i}", weight) for i, weight in enumerate(weights)]
+
+
+def _loads(used):
+    return sorted(sorted(client.cargo_kg // 1000 for client in vehicle.clients_list) for vehicle in used)
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_every_strategy_packs_validly(strategy):
+    rng = random.Random(7)
+    vehicles = _trucks(*(rng.choice([5, 10, 20]) for _ in range(12))) + [Train(30, 3), Train(12, 2)]
+    clients = _clients(*(round(rng.uniform(0.5, 12), 1) for _ in range(50)))
+
+    used, unplaced = pack(clients, vehicles, strategy)
+
+    placed = [client for vehicle in used for client in vehicle.clients_list]
+    assert sorted(map(id, placed + unplaced)) == sorted(map(id, clients))
+    for vehicle in vehicles:
+        assert vehicle.load_kg == sum(client.cargo_kg for client in vehicle.clients_list) <= vehicle.capacity_kg
+        assert (vehicle.load_kg > 0) == (vehicle in used)
+    for vehicle in vehicles[-2:]:
+        assert all(load <= vehicle.car_capacity_kg for load in vehicle._car_loads)
+
+
+def test_decreasing_order_beats_arrival_order():
+    clients = _clients(3, 3, 3, 7, 7, 7)
+    assert len(pack(clients, _trucks(*[10] * 6), "first_fit")[0]) == 4
+    assert _loads(pack(clients, _trucks(*[10] * 6), "ffd")[0]) == [[3, 7]] * 3
+
+
+def test_best_fit_takes_the_tightest_vehicle():
+    clients = _clients(6, 5, 3)
+    assert _loads(pack(clients, _trucks(10, 8), "ffd")[0]) == [[3, 6], [5]]
+    assert _loads(pack(clients, _trucks(10, 8), "bfd")[0]) == [[3, 5], [6]]
+
+
+def test_exact_finds_the_optimum_ffd_misses():
+    clients = _clients(2, 5, 2, 2, 6, 3)
+    assert len(pack(clients, _trucks(*[10] * 6), "ffd")[0]) == 3
+    used, unplaced = pack(clients, _trucks(*[10] * 6), "exact")
+    assert unplaced == [] and _loads(used) == [[2, 2, 6], [2, 3, 5]]
+
+
+def test_exact_falls_back_to_ffd_for_large_batches():
+    clients = _clients(*([2, 5, 2, 2, 6, 3] * (EXACT_MAX_CLIENTS // 6 + 1)))
+    vehicles = _trucks(*[10] * len(clients))
+    ffd = _loads(pack(clients, vehicles, "ffd")[0])
+    assert _loads(pack(clients, vehicles, "exact")[0]) == ffd
+
+
+def test_company_rejects_unknown_strategy_and_reports_the_used_one():
+    company = TransportCompany("Тест")
+    company.add_vehicles(_trucks(10, 10))
+    company.add_clients(_clients(4, 4))
+    with pytest.raises(ValueError):
+        company.optimize_cargo_distribution("random")
+    company.optimize_cargo_distribution("bfd")
+    assert company.last_stats.strategy == "bfd"
+    assert company.last_stats.vehicles_used == 1
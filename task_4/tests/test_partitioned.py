@@ -0,0 +1,34 @@
+#Дозагрузка после распределения по партициям
+from transport import Client, TransportCompany, Truck
+
+
+def _company():
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(10, "белый", partition="north"), Truck(10, "белый", partition="south")])
+    company.add_clients([Client("a", 9, partition="north"), Client("b", 8, partition="south")])
+    company.optimize_partitioned(max_workers=1)
+    return company
+
+
+def test_incremental_keeps_client_in_its_partition():
+    company = _company()
+    company.add_client(Client("c", 3, partition="north"))
+    company.optimize_cargo_distribution(incremental=True)
+    assert company.last_stats.strategy == "incremental"
+    assert company.vehicle_of(company.get_client("c")) is None
+    assert [client.name for client, _ in company.last_result.unplaced] == ["c"]
+
+    company.add_client(Client("d", 1, partition="south"))
+    company.optimize_cargo_distribution(incremental=True)
+    assert company.vehicle_of(company.get_client("d")).partition == "south"
+
+
+def test_repack_after_partitioned_run_stays_partitioned():
+    company = _company()
+    company.add_client(Client("c", 3, partition="north", is_vip=True))
+    company.optimize_cargo_distribution(incremental=True)
+    assert company.last_stats.strategy == "first_fit по партициям"
+    for client in company.clients:
+        vehicle = company.vehicle_of(client)
+        assert vehicle is None or vehicle.partition == client.partition
+    assert company.vehicle_of(company.get_client("c")).partition == "north"
@@ -0,0 +1,62 @@
+#Приоритеты и сроки доставки
+import pytest
+
+from packing import DEFAULT_PRIORITY, VIP_PRIORITY, pack
+from transport import Client, TransportCompany, Truck
+
+
+def _names(clients):
+    return [client.name for client in clients]
+
+
+def test_priority_defaults_follow_vip():
+    assert Client("a", 1).priority == DEFAULT_PRIORITY
+    assert Client("v", 1, is_vip=True).priority == VIP_PRIORITY
+    assert Client("v", 1, is_vip=True, priority=0).priority == 0
+    with pytest.raises(ValueError):
+        Client("a", 1, priority=-1)
+
+
+def test_schedule_orders_by_priority_then_deadline_then_arrival():
+    company = TransportCompany("Тест")
+    company.add_clients([Client("поздний", 1, deadline=5), Client("без срока", 1), Client("срочный", 1, deadline=1),
+                         Client("vip", 1, is_vip=True), Client("срочный2", 1, deadline=1),
+                         Client("важный", 1, priority=3, deadline=9)])
+    assert _names(company.scheduled_clients()) == ["важный", "vip", "срочный", "срочный2", "поздний", "без срока"]
+
+    company.add_client(Client("новый", 1, deadline=1))
+    assert _names(company.scheduled_clients())[4] == "новый"
+
+
+def test_update_client_requeues_after_equal_clients():
+    company = TransportCompany("Тест")
+    company.add_clients([Client("a", 1, deadline=2), Client("b", 1, deadline=2), Client("c", 1, deadline=3)])
+    assert _names(company.scheduled_clients()) == ["a", "b", "c"]
+    company.update_client("c", deadline=2)
+    assert _names(company.scheduled_clients()) == ["a", "b", "c"]
+    company.update_client("a", deadline=1)
+    company.update_client("b", priority=2)
+    assert _names(company.scheduled_clients()) == ["b", "a", "c"]
+    # Без явного приоритета он следует за is_vip
+    company.update_client("c", is_vip=True)
+    assert company.get_client("c").priority == VIP_PRIORITY
+    assert _names(company.scheduled_clients()) == ["b", "c", "a"]
+
+
+@pytest.mark.parametrize("strategy", ["first_fit", "ffd", "bfd"])
+def test_higher_priority_wins_scarce_capacity(strategy):
+    clients = [Client("обычный", 6), Client("тяжелый", 8), Client("важный", 5, priority=2)]
+    used, unplaced = pack(clients, [Truck(10, "белый")], strategy)
+    assert "важный" in _names(used[0].clients_list)
+    assert "важный" not in _names(unplaced)
+
+
+def test_unplaced_high_priority_clients_come_first():
+    company = TransportCompany("Тест")
+    company.add_vehicle(Truck(5, "белый"))
+    company.add_clients([Client("большой", 9), Client("срочный", 8, priority=1, deadline=2),
+                         Client("важный", 7, priority=2)])
+    company.optimize_cargo_distribution("ffd")
+    assert _names(client for client, _ in company.last_result.high_priority()) == ["важный", "срочный"]
+    summary = company.last_result.summary()
+    assert summary.index("важный") < summary.index("срочный") < summary.index("большой")
@@ -0,0 +1,136 @@
+#Отчет о распределении грузов
+import io
+import re
+
+import pytest
+
+from transport import Client, TransportCompany, Truck
+
+
+def _company(columnar=False):
+    company = TransportCompany("Тест", columnar=columnar)
+    company.add_vehicles([Truck(10, "белый"), Truck(10, "белый")])
+    company.add_clients([Client("a", 6), Client("b", 6, is_vip=True), Client("c", 4)])
+    return company
+
+
+def _report(company, **kwargs):
+    out = io.StringIO()
+    count = company.write_distribution_report(out, **kwargs)
+    return out.getvalue(), count
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_totals_are_printed_in_whole_tonnes(columnar):
+    if columnar:
+        pytest.importorskip("numpy")
+    company = _company(columnar)
+    text, _ = _report(company)
+    assert "Общий вес грузов: 16т\n" in text
+    assert "Вес грузов VIP: 6т\n" in text
+
+    company.optimize_cargo_distribution()
+    text, _ = _report(company)
+    assert "Общий вес грузов: 16т\n" in text
+    assert "6т из 6т" in text and "10т из 10т" in text
+
+
+@pytest.mark.parametrize("summary", [True, False])
+def test_page_count_is_the_number_of_vehicles(summary):
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(5, "белый") for _ in range(3)])
+    _, count = _report(company, summary=summary)
+    assert count == 0
+
+    company.add_clients([Client(f"c{i}", 4) for i in range(3)])
+    company.optimize_cargo_distribution()
+    assert _report(company, summary=summary)[1] == 3
+    assert _report(company, start=0, stop=2, summary=summary)[1] == 2
+    assert _report(company, start=2, stop=4, summary=False)[1] == 1
+
+
+def test_pages_join_into_the_full_report():
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(5, "белый") for _ in range(5)])
+    company.add_clients([Client(f"c{i}", 4) for i in range(5)])
+    company.optimize_cargo_distribution()
+    full, _ = _report(company)
+    first, _ = _report(company, start=0, stop=2)
+    rest, _ = _report(company, start=2, stop=5, summary=False)
+    assert first + rest == full
+
+
+def _operations(company):
+    """Одинаковая история изменений для компаний с колоночным хранилищем и без него"""
+    company.add_vehicles([Truck(10, "белый"), Truck(8, "синий"), Truck(6, "белый")])
+    company.add_clients([Client("a", 5, priority=2), Client("b", 4, is_vip=True), Client("c", 7),
+                         Client("d", 9, priority=3, deadline=5), Client("e", 3)])
+    company.optimize_cargo_distribution()
+    yield
+    company.add_client(Client("f", 2, priority=2))
+    company.optimize_cargo_distribution(incremental=True)
+    yield
+    company.update_client("c", priority=4)
+    company.remove_client(company.get_client("e"))
+    company.optimize_cargo_distribution("bfd")
+    yield
+    company.enable_split_shipments(1, 3)
+    company.add_client(Client("g", 12, priority=1))
+    company.optimize_cargo_distribution("ffd")
+    yield
+    company.remove_vehicle(company.vehicles[0].vehicle_id)
+    company.optimize_cargo_distribution("ffd")
+    yield
+    company.add_vehicle(Truck(9, "синий"))
+    company.remove_vehicle(company.vehicles[1].vehicle_id)
+    company.optimize_cargo_distribution(incremental=True)
+    yield
+
+
+def test_columnar_report_matches_object_report():
+    pytest.importorskip("numpy")
+    plain, columnar = TransportCompany("Тест"), TransportCompany("Тест", columnar=True)
+    for _ in zip(_operations(plain), _operations(columnar)):
+        # ID транспорта сквозные, поэтому у двух компаний они разные
+        text, count = _report(columnar)
+        assert (re.sub(r"ID: \w+", "ID", text), count) == (re.sub(r"ID: \w+", "ID", _report(plain)[0]), _report(plain)[1])
+        assert "По уровням приоритета:" in _report(plain)[0]
+
+
+class _Writes(io.StringIO):
+    """Файловый объект, запоминающий каждую запись"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def write(self, text):
+        self.calls.append(text)
+        return super().write(text)
+
+
+def test_report_is_streamed_line_by_line():
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(5, "белый") for _ in range(50)])
+    company.add_clients([Client(f"c{i}", 4) for i in range(50)])
+    company.optimize_cargo_distribution()
+
+    lines = company.iter_distribution_report()
+    assert next(lines) == "Отчет компании 'Тест':\n"
+    assert "".join(lines) == company.get_distribution_report()[len("Отчет компании 'Тест':\n"):]
+
+    out = _Writes()
+    assert company.write_distribution_report(out) == 50
+    assert len(out.calls) > 50 and all(call.count("\n") <= 2 for call in out.calls)
+    assert out.getvalue() == company.get_distribution_report()
+
+
+def test_cached_report_follows_data_changes():
+    company = _company()
+    company.optimize_cargo_distribution()
+    before = company.get_distribution_report()
+    assert company.get_distribution_report() is before
+
+    company.add_client(Client("d", 1))
+    after = company.get_distribution_report()
+    assert after != before and "Всего клиентов: 4" in after
@@ -0,0 +1,84 @@
+#Сценарии «что если»
+import pytest
+
+from scenarios import BASE_SCENARIO, Scenario, evaluate_scenarios, format_comparison
+from transport import Client, TransportCompany, Truck
+
+
+def _company():
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(10, "белый", fixed_cost=10.0), Truck(10, "белый", fixed_cost=10.0)])
+    company.add_clients([Client("a", 6), Client("b", 6), Client("a", 3), Client("c", 7, priority=2)])
+    return company
+
+
+def _summary(result):
+    return result.vehicles, result.clients, result.vehicles_used, result.unplaced, result.unplaced_high, result.cost
+
+
+def test_base_scenario_matches_the_company_and_leaves_it_untouched():
+    company = _company()
+    fingerprint = company._fingerprint
+    base, = evaluate_scenarios(company, [], "ffd")
+
+    assert fingerprint == company._fingerprint
+    assert all(vehicle.load_kg == 0 for vehicle in company.vehicles) and company.last_stats is None
+    company.optimize_cargo_distribution("ffd")
+    assert base.name == BASE_SCENARIO
+    assert _summary(base) == (2, 4, company.last_stats.vehicles_used, company.last_stats.unplaced, 0,
+                              company.last_stats.cost)
+
+
+def test_changes_apply_only_to_their_scenario():
+    company = _company()
+    truck_id = company.vehicles[0].vehicle_id
+    scenarios = [Scenario("еще грузовик", add_vehicles=[Truck(10, "синий")]),
+                 Scenario("без грузовика", remove_vehicles=[truck_id]),
+                 Scenario("без a", remove_clients=["a"], add_clients=[Client("a", 1), Client("d", 2)]),
+                 Scenario("точно", strategy="exact")]
+    base, more, fewer, without_a, exact = evaluate_scenarios(company, scenarios, "first_fit", max_workers=1)
+
+    assert (base.vehicles_used, base.unplaced, base.unplaced_weight) == (2, 1, 6.0)
+    assert (more.vehicles, more.unplaced) == (3, 0)
+    assert (fewer.vehicles, fewer.vehicles_used) == (1, 1) and fewer.unplaced == 2
+    # Убраны все клиенты с именем a, в том числе добавленный сценарием
+    assert (without_a.clients, without_a.unplaced, without_a.loaded_kg) == (3, 0, 15000)
+    assert (exact.strategy, exact.unplaced) == ("exact", 1)
+    assert base.strategy == "first_fit" and len(company.vehicles) == 2 and len(company.clients) == 4
+
+
+def test_fork_accumulates_changes_without_touching_the_parent():
+    truck = Truck(10, "синий")
+    parent = Scenario("родитель", add_vehicles=[truck], strategy="bfd")
+    child = parent.fork("потомок", remove_clients=["b"])
+    assert (parent.add_vehicles, parent.remove_clients) == ([truck], set())
+    assert (child.add_vehicles, child.remove_clients, child.strategy) == ([truck], {"b"}, "bfd")
+
+    company = _company()
+    results = evaluate_scenarios(company, [parent, child], include_base=False, max_workers=1)
+    assert [result.name for result in results] == ["родитель", "потомок"]
+    assert results[1].clients == 3 and results[1].unplaced == 0
+
+
+def test_process_pool_gives_the_same_results():
+    company = _company()
+    scenarios = [Scenario("еще грузовик", add_vehicles=[Truck(10, "синий")]), Scenario("ffd", strategy="ffd")]
+    serial = evaluate_scenarios(company, scenarios, max_workers=1)
+    parallel = evaluate_scenarios(company, scenarios, max_workers=2)
+    assert [_summary(result) for result in parallel] == [_summary(result) for result in serial]
+
+
+@pytest.mark.parametrize("scenario", [Scenario("x", remove_vehicles=["нет"]), Scenario("x", remove_clients=["нет"]),
+                                      Scenario("x", strategy="random")])
+def test_bad_scenarios_are_rejected(scenario):
+    with pytest.raises(ValueError):
+        evaluate_scenarios(_company(), [scenario], max_workers=1)
+
+
+def test_comparison_shows_differences_from_the_first_scenario():
+    company = _company()
+    results = evaluate_scenarios(company, [Scenario("еще грузовик", add_vehicles=[Truck(10, "синий")])],
+                                 max_workers=1)
+    lines = format_comparison(results).splitlines()
+    assert len(lines) == 4 and lines[2].startswith(BASE_SCENARIO)
+    assert lines[3].startswith("еще грузовик") and lines[3].endswith("+1 шт, +0.00")
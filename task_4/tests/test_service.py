@@ -0,0 +1,97 @@
+#Протокол асинхронного сервиса
+import asyncio
+import json
+
+from service import DispatchService
+from transport import TransportCompany
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_requests_flow_from_clients_to_tracking():
+    service = DispatchService(TransportCompany("Тест"), window=0)
+
+    async def scenario():
+        vehicle = await service.handle({"op": "add_vehicle", "type": "truck", "capacity": 10, "color": "белый"})
+        added = await asyncio.gather(*(service.handle({"op": "add_client", "name": name, "cargo_weight": 4})
+                                       for name in ("a", "b", "c")))
+        distributed = await service.handle({"op": "distribute", "strategy": "ffd"})
+        tracked = await service.handle({"op": "track", "name": "a"})
+        report = await service.handle({"op": "report", "start": 0, "stop": 1})
+        stats = await service.handle({"op": "stats"})
+        return vehicle, added, distributed, tracked, report, stats
+
+    vehicle, added, distributed, tracked, report, stats = _run(scenario())
+
+    assert vehicle["ok"] and vehicle["vehicle_id"] == service.company.vehicles[0].vehicle_id
+    assert [response["name"] for response in added] == ["a", "b", "c"]
+    assert [client.name for client in service.company.clients] == ["a", "b", "c"]
+    assert distributed["ok"] and distributed["strategy"] == "ffd"
+    assert (distributed["vehicles_used"], distributed["unplaced"], distributed["lower_bound"]) == (1, 1, 1)
+    assert tracked == {"ok": True, "name": "a", "vehicle_id": vehicle["vehicle_id"]}
+    assert "Всего клиентов: 3" in report["report"]
+    assert set(stats["latency"]) == {"add_vehicle", "add_client", "distribute", "track", "report"}
+
+
+def test_concurrent_distribute_requests_share_one_run(monkeypatch):
+    company = TransportCompany("Тест")
+    calls = []
+    optimize = company.optimize_cargo_distribution
+    monkeypatch.setattr(company, "optimize_cargo_distribution",
+                        lambda *args, **kwargs: calls.append(args) or optimize(*args, **kwargs))
+    service = DispatchService(company, window=0.01)
+
+    async def scenario():
+        await service.handle({"op": "add_vehicle", "type": "truck", "capacity": 10, "color": "белый"})
+        await service.handle({"op": "add_client", "name": "a", "cargo_weight": 4})
+        first = await asyncio.gather(*(service.handle({"op": "distribute"}) for _ in range(5)))
+        second = await service.handle({"op": "distribute"})
+        return first, second
+
+    first, second = _run(scenario())
+    assert len(calls) == 2
+    assert all(response == first[0] for response in first) and second["vehicles_used"] == 1
+
+
+def test_bad_requests_get_error_responses():
+    service = DispatchService(TransportCompany("Тест"), window=0)
+
+    async def scenario():
+        return [await service.handle(request) for request in (
+            ["add_client"],
+            {"op": "fly"},
+            {"op": "add_client", "name": "a", "cargo_weight": -1},
+            {"op": "add_client", "name": "a"},
+            {"op": "add_vehicle", "type": "ship", "capacity": 10},
+            {"op": "track", "name": "нет такого"},
+            {"op": "track"},
+            {"op": "distribute", "strategy": "random"},
+        )]
+
+    responses = _run(scenario())
+    assert all(response["ok"] is False and response["error"] for response in responses)
+    assert "Неизвестная операция: fly" in responses[1]["error"]
+    assert responses[3]["error"].startswith("KeyError")
+    assert service.company.clients == [] and service.latencies == {}
+
+
+def test_connection_speaks_json_lines():
+    service = DispatchService(TransportCompany("Тест"), window=0)
+
+    async def scenario():
+        server = await asyncio.start_server(service.serve_connection, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b'{"op": "add_client", "name": "\xd0\xb0", "cargo_weight": 1}\n{oops\n')
+            await writer.drain()
+            lines = [await reader.readline(), await reader.readline()]
+            writer.close()
+            await writer.wait_closed()
+        return [json.loads(line) for line in lines]
+
+    added, broken = _run(scenario())
+    assert added == {"ok": True, "name": "а"}
+    assert broken["ok"] is False and broken["error"].startswith("Некорректный JSON")
@@ -0,0 +1,115 @@
+#Двоичный снимок состояния компании
+import pytest
+
+from snapshot import load_company, open_snapshot, save_company
+from transport import Client, TransportCompany, Train, Truck, Vehicle
+
+
+def _report(company) -> str:
+    return "".join(company.iter_distribution_report())
+
+
+def _round_trip(company, tmp_path, columnar=False):
+    path = str(tmp_path / "company.snap")
+    save_company(company, path)
+    return load_company(path, columnar)
+
+
+def test_round_trip_restores_distribution(tmp_path):
+    company = TransportCompany("Тест")
+    company.add_vehicles([Train(30, 3, partition="север", max_volume=50.0), Truck(10, "красный", fixed_cost=5.0),
+                          Vehicle(4, cost_per_tonne=2.0)])
+    for i in range(12):
+        company.add_client(Client(f"клиент {i % 10}", 1.5 + i % 4, i % 3 == 0, volume=1.0 if i % 2 else None,
+                                  priority=i % 3 if i % 4 else None, deadline=5.0 if i % 5 == 0 else None))
+    company.optimize_cargo_distribution()
+
+    restored = _round_trip(company, tmp_path)
+
+    assert restored.name == company.name
+    for before, after in zip(company.vehicles, restored.vehicles, strict=True):
+        assert (type(after), after.vehicle_id, after.load_kg, after.current_volume, after.fixed_cost) == \
+            (type(before), before.vehicle_id, before.load_kg, before.current_volume, before.fixed_cost)
+        assert [client.label for client in after.clients_list] == [client.label for client in before.clients_list]
+    assert restored.vehicles[0].car_loads == company.vehicles[0].car_loads
+    assert [client.name for client in restored.scheduled_clients()] == \
+        [client.name for client in company.scheduled_clients()]
+    assert _report(restored) == _report(company)
+
+
+def test_round_trip_keeps_split_shipments(tmp_path):
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(10, "белый"), Truck(10, "белый"), Train(12, 2)])
+    company.add_clients([Client("a", 4), Client("b", 4), Client("большой", 14, is_vip=True)])
+    company.enable_split_shipments(1, 3)
+    company.optimize_cargo_distribution()
+    big = company.get_client("большой")
+    assert len(company.vehicles_of(big)) > 1
+
+    for columnar in (False, True):
+        if columnar:
+            pytest.importorskip("numpy")
+        restored = _round_trip(company, tmp_path, columnar)
+        restored_big = restored.get_client("большой")
+        assert [vehicle.vehicle_id for vehicle in restored.vehicles_of(restored_big)] == \
+            [vehicle.vehicle_id for vehicle in company.vehicles_of(big)]
+        assert [vehicle.load_kg for vehicle in restored.vehicles] == [vehicle.load_kg for vehicle in company.vehicles]
+        assert _report(restored) == _report(company)
+        assert "Не размещены" not in _report(restored)
+
+        # Удаление разделенного клиента выгружает все его части
+        restored.remove_client(restored_big)
+        assert sum(vehicle.load_kg for vehicle in restored.vehicles) == 8_000
+
+
+def test_view_reads_rows_lazily(tmp_path):
+    company = TransportCompany("Тест")
+    company.add_vehicle(Truck(10, "синий"))
+    company.add_client(Client("a", 2.5, deadline=3))
+    path = str(tmp_path / "company.snap")
+    save_company(company, path)
+    with open_snapshot(path) as view:
+        assert (view.company_name, view.n_vehicles, view.n_clients) == ("Тест", 1, 1)
+        client = view.client(0)
+        assert (client.name, client.cargo_weight, client.deadline) == ("a", 2.5, 3)
+        assert view.vehicle(0).color == "синий"
+
+
+def test_unknown_vehicle_type_is_a_value_error(tmp_path):
+    class Van(Truck):
+        __slots__ = ()
+
+    company = TransportCompany("Тест")
+    company.add_vehicle(Van(3, "белый"))
+    path = tmp_path / "company.snap"
+    with pytest.raises(ValueError):
+        save_company(company, str(path))
+    assert not path.exists()
+
+
+def test_foreign_file_is_rejected(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a snapshot" * 10)
+    with pytest.raises(ValueError):
+        load_company(str(path))
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_restored_company_keeps_working(tmp_path, columnar):
+    if columnar:
+        pytest.importorskip("numpy")
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(10, "белый"), Truck(10, "белый")])
+    company.add_clients([Client("a", 6), Client("b", 6), Client("c", 7)])
+    company.optimize_cargo_distribution("ffd")
+
+    restored = _round_trip(company, tmp_path, columnar)
+    a = restored.get_client("a")
+    assert restored.vehicle_of(a).vehicle_id == company.vehicle_of(company.get_client("a")).vehicle_id
+    assert _report(restored) == _report(company)
+
+    restored.add_vehicle(Truck(10, "синий"))
+    restored.optimize_cargo_distribution("ffd")
+    assert restored.last_stats.unplaced == 0
+    assert sorted(v.load_kg for v in restored.vehicles) == [6000, 6000, 7000]
+    assert company.last_stats.unplaced == 1 and len(company.vehicles) == 2
@@ -0,0 +1,76 @@
+#Деление грузов между транспортом
+import pytest
+
+from transport import Client, ClientPart, TransportCompany, Truck
+
+
+def _company(capacities, weights, **client_options):
+    company = TransportCompany("Тест")
+    company.add_vehicles([Truck(capacity, "белый") for capacity in capacities])
+    clients = [Client(f"c{i}", weight) for i, weight in enumerate(weights)]
+    company.add_clients(clients)
+    return company, clients
+
+
+def _unplaced(company):
+    return [client for client, _ in company.last_result.unplaced]
+
+
+def test_cargo_that_does_not_fit_is_split_by_free_space():
+    company, (big, a, b) = _company([10, 10], [8, 6, 6])
+    company.optimize_cargo_distribution("ffd")
+    assert _unplaced(company) == [b]
+
+    company.enable_split_shipments(1, 3)
+    company.optimize_cargo_distribution("ffd")
+    assert _unplaced(company) == []
+    vehicles = company.vehicles_of(b)
+    assert len(vehicles) == 2 and company.vehicle_of(b) is vehicles[0]
+    parts = [part for vehicle in vehicles for part in vehicle.clients_list if isinstance(part, ClientPart)]
+    assert [(part.client, part.index, part.count) for part in parts] == [(b, 1, 2), (b, 2, 2)]
+    assert sorted(part.cargo_kg for part in parts) == [2000, 4000]
+    assert all(vehicle.load_kg == vehicle.capacity_kg for vehicle in company.vehicles)
+
+
+def test_split_respects_max_parts_and_min_chunk():
+    company, clients = _company([10, 10, 10], [8, 8, 8, 6])
+    company.enable_split_shipments(1, 2)
+    company.optimize_cargo_distribution("ffd")
+    assert _unplaced(company) == [clients[-1]]
+
+    company.enable_split_shipments(3, 3)
+    company.optimize_cargo_distribution("ffd")
+    assert _unplaced(company) == [clients[-1]]
+
+    company.enable_split_shipments(1, 3)
+    company.optimize_cargo_distribution("ffd")
+    assert _unplaced(company) == [] and len(company.vehicles_of(clients[-1])) == 3
+
+
+def test_cargo_with_pallets_is_not_split():
+    company, (big, a) = _company([10, 10], [8, 6])
+    pallets = Client("паллеты", 6, pallets=2)
+    company.add_client(pallets)
+    company.enable_split_shipments(1, 3)
+    company.optimize_cargo_distribution("ffd")
+    assert _unplaced(company) == [pallets] and company.vehicles_of(pallets) == []
+
+
+def test_removing_a_split_client_unloads_every_part():
+    company, (big, a, b) = _company([10, 10], [8, 6, 6])
+    company.enable_split_shipments(1, 3)
+    company.optimize_cargo_distribution("ffd")
+    company.remove_client(b)
+    assert company.vehicles_of(b) == []
+    assert sorted(vehicle.load_kg for vehicle in company.vehicles) == [6000, 8000]
+
+    company.disable_split_shipments()
+    company.add_client(Client("d", 6))
+    company.optimize_cargo_distribution("ffd")
+    assert [client.name for client in _unplaced(company)] == ["d"]
+
+
+@pytest.mark.parametrize("min_chunk, max_parts", [(0, 3), (-1, 3), (1, 1), (1, 2.0), (True, 3)])
+def test_split_rejects_bad_settings(min_chunk, max_parts):
+    with pytest.raises(ValueError):
+        TransportCompany("Тест").enable_split_shipments(min_chunk, max_parts)
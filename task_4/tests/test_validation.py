@@ -0,0 +1,51 @@
+#Проверка входных данных клиентов и транспорта
+import math
+
+import pytest
+
+from loaders import load_clients, load_vehicles
+from transport import Client, TransportCompany, Truck, Train, validate_clients
+
+NON_FINITE = [math.inf, -math.inf, math.nan]
+
+
+@pytest.mark.parametrize("weight", NON_FINITE)
+def test_client_rejects_non_finite_weight(weight):
+    with pytest.raises(ValueError):
+        Client("a", weight)
+    assert isinstance(validate_clients([("a", weight, False, None, None, None, None, None)])[0], ValueError)
+
+
+@pytest.mark.parametrize("capacity", NON_FINITE)
+def test_vehicle_rejects_non_finite_capacity(capacity):
+    with pytest.raises(ValueError):
+        Truck(capacity, "белый")
+    with pytest.raises(ValueError):
+        Train(capacity, 3)
+
+
+def test_split_rejects_non_finite_chunk():
+    with pytest.raises(ValueError):
+        TransportCompany("Тест").enable_split_shipments(math.inf)
+
+
+def test_loaders_report_non_finite_values_per_row(tmp_path):
+    clients = tmp_path / "clients.jsonl"
+    clients.write_text('{"name": "a", "cargo_weight": 2}\n'
+                       '{"name": "b", "cargo_weight": Infinity}\n'
+                       '{"name": "c", "cargo_weight": NaN}\n', encoding="utf-8")
+    vehicles = tmp_path / "vehicles.csv"
+    vehicles.write_text("type,capacity,color,number_of_cars\n"
+                        "truck,10,белый,\n"
+                        "truck,inf,белый,\n"
+                        "train,nan,,3\n", encoding="utf-8")
+    company = TransportCompany("Тест")
+
+    client_result = load_clients(company, str(clients))
+    vehicle_result = load_vehicles(company, str(vehicles))
+
+    assert client_result.loaded == 1
+    assert [line for line, _ in client_result.errors] == [2, 3]
+    assert vehicle_result.loaded == 1
+    assert [line for line, _ in vehicle_result.errors] == [3, 4]
+    assert all(error.startswith("ValueError") for _, error in client_result.errors + vehicle_result.errors)
@@ -1,73 +1,512 @@
 #Пакет с хранением всех классов
-import uuid
+import contextlib
+import heapq
+import itertools
+import logging
+import math
+import time
+
+import instrumentation
+from distribution_cache import DistributionCache
+from packing import (DEFAULT_PRIORITY, STRATEGIES, SUMMARY_UNPLACED, UNLIMITED, VIP_PRIORITY, DistributionResult,
+                     IncrementalPacker, PackingStats, explain_unplaced, lower_bound, pack, schedule_key, schedule_label,
+                     split_cargo, total_cost)
+from units import KG_PER_TONNE, format_tonnes, shared_kg, to_kg, to_tonnes
+
+# Доля незанятой грузоподъемности, после которой дозагрузка уступает полной переупаковке
+FRAGMENTATION_THRESHOLD = 0.25
+
+# Сколько последних полных распределений хранить в кэше компании
+DISTRIBUTION_CACHE_SIZE = 8
+
+# Отпечаток данных компании: сумма хешей (вид объекта, порядковый номер в компании) по модулю 2**64
+FINGERPRINT_MASK = (1 << 64) - 1
+VEHICLE_TOKEN = 1
+CLIENT_TOKEN = 2
+
+# Деление грузов по умолчанию: наименьшая часть (тонн) и наибольшее число частей на клиента
+SPLIT_MIN_CHUNK = 1.0
+SPLIT_MAX_PARTS = 4
+
+# Сводка о не размещенных грузах - WARNING, по каждому грузу - DEBUG
+logger = logging.getLogger(__name__)
+
+# Последовательные целочисленные ID транспорта: уникальны и компактнее строк UUID
+_vehicle_ids = itertools.count(1)
+
+
+def reserve_vehicle_ids(last_id: int):
+    """Сдвигает генератор ID так, чтобы новые ID были больше last_id (после загрузки снимка)"""
+    global _vehicle_ids
+    _vehicle_ids = itertools.count(max(next(_vehicle_ids), last_id + 1))
+
+
+def _validate_partition(partition):
+    """Валидация ключа партиции (депо/региона)"""
+    if partition is not None and (not isinstance(partition, str) or not partition.strip()):
+        raise ValueError("Партиция должна быть непустой строкой или None")
+
+
+def _client_error(name, cargo_weight, is_vip):
+    """Первая ошибка в данных клиента или None"""
+    if not isinstance(name, str) or not name.strip():
+        return ValueError("Имя клиента должно быть непустой строкой")
+    # Вес хранится в целых килограммах, поэтому груз легче 0.5 кг считается нулевым;
+    # бесконечность и NaN отсекаются до перевода в килограммы
+    if (not isinstance(cargo_weight, (int, float)) or not math.isfinite(cargo_weight) or cargo_weight <= 0
+            or to_kg(cargo_weight) <= 0):
+        return ValueError("Вес груза должен быть положительным числом")
+    if not isinstance(is_vip, bool):
+        return TypeError("is_vip должен быть булевым значением")
+    return None
+
+
+def _dimensions_error(volume, pallets):
+    """Первая ошибка в объеме (м³) и числе паллет или None; None в обоих означает «не задано»"""
+    if volume is not None and (isinstance(volume, bool) or not isinstance(volume, (int, float)) or volume <= 0):
+        return ValueError("Объем должен быть положительным числом или None")
+    if pallets is not None and (isinstance(pallets, bool) or not isinstance(pallets, int) or pallets <= 0):
+        return ValueError("Количество паллет должно быть положительным целым числом или None")
+    return None
+
+
+def _schedule_error(priority, deadline):
+    """Первая ошибка в приоритете и сроке доставки или None; None в обоих означает «не задано»"""
+    if priority is not None and (isinstance(priority, bool) or not isinstance(priority, int) or priority < 0):
+        return ValueError("Приоритет должен быть неотрицательным целым числом или None")
+    if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))
+                                 or not math.isfinite(deadline)):
+        return ValueError("Срок доставки должен быть числом или None")
+    return None
+
+
+def validate_clients(rows) -> dict:
+    """
+    Проверяет пачку записей (name, cargo_weight, is_vip, partition, volume, pallets, priority, deadline)
+    одним проходом. Возвращает {номер записи: исключение} для не прошедших проверку;
+    остальные можно создавать через Client.trusted.
+    """
+    errors = {}
+    for i, (name, cargo_weight, is_vip, partition, volume, pallets, priority, deadline) in enumerate(rows):
+        error = (_client_error(name, cargo_weight, is_vip) or _dimensions_error(volume, pallets)
+                 or _schedule_error(priority, deadline))
+        if error is None and partition is not None and (not isinstance(partition, str) or not partition.strip()):
+            error = ValueError("Партиция должна быть непустой строкой или None")
+        if error is not None:
+            errors[i] = error
+    return errors
+
+
+def _schedule_entry(client, number: int) -> tuple:
+    """Запись очереди обслуживания: (-приоритет, срок, номер постановки, клиент) - порядок schedule_key"""
+    deadline = client.deadline
+    return -client.priority, UNLIMITED if deadline is None else deadline, number, client
+
+
+def _first_duplicate(keys, taken):
+    """Первый ключ, который уже есть в taken или повторяется в keys (None, если повторов нет)"""
+    seen = set()
+    for key in keys:
+        if key in taken or key in seen:
+            return key
+        seen.add(key)
+    return None
+
+
+def _client_extra(partition, volume, pallets, deadline):
+    """Редкие поля клиента одним кортежем (partition, volume, pallets, deadline) или None, если все не заданы"""
+    if partition is None and volume is None and pallets is None and deadline is None:
+        return None
+    return partition, volume, pallets, deadline
+
 
 class Client:
-    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False):
+    # Вес груза хранится целым числом килограммов (cargo_kg), cargo_weight - в тоннах.
+    # priority - уровень обслуживания (больше - раньше; по умолчанию из is_vip),
+    # deadline - срок доставки (число, например часы от начала планирования; меньше - раньше).
+    # Редко задаваемые partition, volume, pallets и deadline хранятся в одном слоте _extra (None у большинства
+    # клиентов) и читаются через свойства: так клиент занимает меньше памяти, чем с отдельным слотом на поле
+    __slots__ = ("name", "cargo_kg", "is_vip", "priority", "_extra")
+    
+    def __init__(self, name: str, cargo_weight: float, is_vip: bool = False, partition: str = None,
+                 volume: float = None, pallets: int = None, priority: int = None, deadline: float = None):
         self._validate_data(name, cargo_weight, is_vip)
+        _validate_partition(partition)
+        self._validate_dimensions(volume, pallets)
+        self._validate_schedule(priority, deadline)
         self.name = name
-        self.cargo_weight = cargo_weight
+        self.cargo_kg = shared_kg(to_kg(cargo_weight))
         self.is_vip = is_vip
+        self.priority = priority if priority is not None else VIP_PRIORITY if is_vip else DEFAULT_PRIORITY
+        self._extra = _client_extra(partition, volume, pallets, deadline)
+    
+    @classmethod
+    def trusted(cls, name: str, cargo_weight: float, is_vip: bool = False, partition: str = None,
+                volume: float = None, pallets: int = None, priority: int = None, deadline: float = None):
+        """Создание без валидации: только для уже проверенных данных (загрузчики, validate_clients)"""
+        client = object.__new__(cls)
+        client.name = name
+        # to_kg() встроен: конструктор на горячем пути загрузки
+        client.cargo_kg = shared_kg(round(cargo_weight * KG_PER_TONNE))
+        client.is_vip = is_vip
+        client.priority = priority if priority is not None else VIP_PRIORITY if is_vip else DEFAULT_PRIORITY
+        client._extra = _client_extra(partition, volume, pallets, deadline)
+        return client
+    
+    @classmethod
+    def from_kg(cls, name: str, cargo_kg: int, is_vip: bool, partition: str, volume: float, pallets: int,
+                priority: int, deadline: float):
+        """Создание без валидации из сохраненных полей (вес в кг, приоритет задан): для снимка"""
+        client = object.__new__(cls)
+        client.name = name
+        client.cargo_kg = shared_kg(cargo_kg)
+        client.is_vip = is_vip
+        client.priority = priority
+        client._extra = _client_extra(partition, volume, pallets, deadline)
+        return client
+    
+    def _set_extra(self, index: int, value):
+        """Меняет одно из редких полей (номер в кортеже _extra)"""
+        fields = list(self._extra or (None, None, None, None))
+        fields[index] = value
+        self._extra = _client_extra(*fields)
+    
+    @property
+    def partition(self):
+        """Партиция (депо/регион) клиента или None"""
+        extra = self._extra
+        return extra[0] if extra is not None else None
+    
+    @partition.setter
+    def partition(self, value):
+        self._set_extra(0, value)
+    
+    @property
+    def volume(self):
+        """Объем груза (м³) или None"""
+        extra = self._extra
+        return extra[1] if extra is not None else None
+    
+    @volume.setter
+    def volume(self, value):
+        self._set_extra(1, value)
+    
+    @property
+    def pallets(self):
+        """Количество паллет или None"""
+        extra = self._extra
+        return extra[2] if extra is not None else None
+    
+    @pallets.setter
+    def pallets(self, value):
+        self._set_extra(2, value)
+    
+    @property
+    def deadline(self):
+        """Срок доставки или None"""
+        extra = self._extra
+        return extra[3] if extra is not None else None
+    
+    @deadline.setter
+    def deadline(self, value):
+        self._set_extra(3, value)
+    
+    @property
+    def cargo_weight(self) -> float:
+        """Вес груза в тоннах"""
+        return to_tonnes(self.cargo_kg)
+    
+    @cargo_weight.setter
+    def cargo_weight(self, tonnes: float):
+        self.cargo_kg = shared_kg(to_kg(tonnes))
     
     def _validate_data(self, name: str, cargo_weight: float, is_vip: bool):
         """Валидация данных клиента"""
-        if not isinstance(name, str) or not name.strip():
-            raise ValueError("Имя клиента должно быть непустой строкой")
-        if not isinstance(cargo_weight, (int, float)) or cargo_weight <= 0:
-            raise ValueError("Вес груза должен быть положительным числом")
-        if not isinstance(is_vip, bool):
-            raise TypeError("is_vip должен быть булевым значением")
+        error = _client_error(name, cargo_weight, is_vip)
+        if error is not None:
+            raise error
+    
+    def _validate_dimensions(self, volume: float, pallets: int):
+        """Валидация объема и количества паллет груза"""
+        error = _dimensions_error(volume, pallets)
+        if error is not None:
+            raise error
+    
+    def _validate_schedule(self, priority: int, deadline: float):
+        """Валидация приоритета и срока доставки"""
+        error = _schedule_error(priority, deadline)
+        if error is not None:
+            raise error
     
     def __str__(self):
         vip_status = "VIP" if self.is_vip else "Обычный"
-        return f"Клиент: {self.name}, Груз: {self.cargo_weight}т, Статус: {vip_status}"
+        dimensions = ""
+        if self.volume is not None:
+            dimensions += f", Объем: {self.volume}м³"
+        if self.pallets is not None:
+            dimensions += f", Паллет: {self.pallets}"
+        # Приоритет выводится, только если он задан явно (отличается от приоритета по статусу)
+        schedule = ""
+        if self.priority != (VIP_PRIORITY if self.is_vip else DEFAULT_PRIORITY):
+            schedule += f", Приоритет: {self.priority}"
+        if self.deadline is not None:
+            schedule += f", Срок: {self.deadline:g}"
+        return f"Клиент: {self.name}, Груз: {format_tonnes(self.cargo_kg)}т{dimensions}{schedule}, Статус: {vip_status}"
+    
+    @property
+    def label(self) -> str:
+        """Подпись груза в отчете"""
+        return self.name
+
+
+class ClientPart(Client):
+    """Часть разделенного груза клиента: загружается как обычный груз и ссылается на клиента"""
+    __slots__ = ("client", "index", "count")
+    
+    @classmethod
+    def of(cls, client: Client, cargo_kg: int, index: int, count: int):
+        """Часть index из count весом cargo_kg; объем делится пропорционально весу"""
+        part = object.__new__(cls)
+        part.name = client.name
+        part.cargo_kg = cargo_kg
+        part.is_vip = client.is_vip
+        part.priority = client.priority
+        # Паллеты не делятся: у части они не заданы
+        volume = client.volume
+        part._extra = _client_extra(client.partition,
+                                    volume * cargo_kg / client.cargo_kg if volume is not None else None,
+                                    None, client.deadline)
+        part.client = client
+        part.index = index
+        part.count = count
+        return part
+    
+    @property
+    def label(self) -> str:
+        return f"{self.name} (часть {self.index}/{self.count})"
+    
+    def __str__(self):
+        return f"Часть {self.index}/{self.count} груза клиента {self.name}, Груз: {format_tonnes(self.cargo_kg)}т"
 
 
 class Vehicle:
-    def __init__(self, capacity: float):
+    # Грузоподъемность и загрузка хранятся целыми килограммами: сравнения точные и без накопления
+    # погрешности; capacity и current_load - те же величины в тоннах
+    # fixed_cost - стоимость запуска (платится, если транспорт использован), cost_per_tonne - за тонну груза
+    __slots__ = ("_id", "capacity_kg", "load_kg", "_clients", "partition",
+                 "max_volume", "max_pallets", "current_volume", "current_pallets", "fixed_cost", "cost_per_tonne")
+    
+    # Грузоподъемность одного вагона; у транспорта без вагонов ограничения нет
+    car_capacity = None
+    car_capacity_kg = None
+    
+    def __init__(self, capacity: float, partition: str = None, max_volume: float = None, max_pallets: int = None,
+                 fixed_cost: float = 0.0, cost_per_tonne: float = 0.0):
         self._validate_capacity(capacity)
-        self.vehicle_id = str(uuid.uuid4())[:8]
-        self.capacity = capacity
-        self.current_load = 0
-        self.clients_list = []
+        _validate_partition(partition)
+        self._validate_limits(max_volume, max_pallets)
+        self._validate_costs(fixed_cost, cost_per_tonne)
+        self._id = next(_vehicle_ids)
+        self.capacity_kg = to_kg(capacity)
+        self.partition = partition
+        self.load_kg = 0
+        # Список клиентов создается при первом обращении, пустой транспорт его не хранит
+        self._clients = None
+        # Необязательные ограничения по объему и паллетам (None - не ограничено)
+        self.max_volume = max_volume
+        self.max_pallets = max_pallets
+        self.current_volume = 0
+        self.current_pallets = 0
+        self.fixed_cost = fixed_cost
+        self.cost_per_tonne = cost_per_tonne
+    
+    @classmethod
+    def trusted(cls, capacity: float, partition: str = None, max_volume: float = None, max_pallets: int = None,
+                fixed_cost: float = 0.0, cost_per_tonne: float = 0.0):
+        """Создание без валидации: только для уже проверенных данных"""
+        vehicle = object.__new__(cls)
+        vehicle._id = next(_vehicle_ids)
+        vehicle.capacity_kg = to_kg(capacity)
+        vehicle.partition = partition
+        vehicle.load_kg = 0
+        vehicle._clients = None
+        vehicle.max_volume = max_volume
+        vehicle.max_pallets = max_pallets
+        vehicle.current_volume = 0
+        vehicle.current_pallets = 0
+        vehicle.fixed_cost = fixed_cost
+        vehicle.cost_per_tonne = cost_per_tonne
+        return vehicle
+    
+    @property
+    def capacity(self) -> float:
+        """Грузоподъемность в тоннах"""
+        return to_tonnes(self.capacity_kg)
+    
+    @capacity.setter
+    def capacity(self, tonnes: float):
+        self.capacity_kg = to_kg(tonnes)
+    
+    @property
+    def current_load(self) -> float:
+        """Текущая загрузка в тоннах"""
+        return to_tonnes(self.load_kg)
+    
+    @current_load.setter
+    def current_load(self, tonnes: float):
+        self.load_kg = to_kg(tonnes)
+    
+    @property
+    def vehicle_id(self) -> str:
+        """ID транспорта: 8 шестнадцатеричных символов"""
+        return f"{self._id:08x}"
+    
+    @vehicle_id.setter
+    def vehicle_id(self, value: str):
+        self._id = int(value, 16)
+    
+    @property
+    def clients_list(self):
+        """Клиенты, загруженные в транспорт"""
+        if self._clients is None:
+            self._clients = []
+        return self._clients
+    
+    @clients_list.setter
+    def clients_list(self, clients):
+        self._clients = clients if clients else None
     
     def _validate_capacity(self, capacity: float):
         """Валидация грузоподъемности"""
-        if not isinstance(capacity, (int, float)) or capacity <= 0:
+        if (not isinstance(capacity, (int, float)) or not math.isfinite(capacity) or capacity <= 0
+                or to_kg(capacity) <= 0):
             raise ValueError("Грузоподъемность должна быть положительным числом")
     
+    def _validate_limits(self, max_volume: float, max_pallets: int):
+        """Валидация ограничений по объему и паллетам"""
+        error = _dimensions_error(max_volume, max_pallets)
+        if error is not None:
+            raise error
+    
+    def _validate_costs(self, fixed_cost: float, cost_per_tonne: float):
+        """Валидация стоимости запуска и стоимости тонны"""
+        for value in (fixed_cost, cost_per_tonne):
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError("Стоимость должна быть неотрицательным числом")
+    
+    @property
+    def cost(self) -> float:
+        """Стоимость рейса с текущей загрузкой (0, если транспорт не загружен)"""
+        if not self.load_kg:
+            return 0.0
+        return self.fixed_cost + self.cost_per_tonne * to_tonnes(self.load_kg)
+    
     def load_cargo(self, client: Client):
         """Загрузка груза клиента"""
         if not isinstance(client, Client):
             raise TypeError("Можно загружать только объекты класса Client")
         
-        if self.current_load + client.cargo_weight > self.capacity:
+        if self.load_kg + client.cargo_kg > self.capacity_kg:
             raise ValueError(
-                f"Перегруз! Текущая загрузка: {self.current_load}т, "
-                f"груз клиента: {client.cargo_weight}т, "
-                f"максимум: {self.capacity}т"
+                f"Перегруз! Текущая загрузка: {format_tonnes(self.load_kg)}т, "
+                f"груз клиента: {format_tonnes(client.cargo_kg)}т, "
+                f"максимум: {format_tonnes(self.capacity_kg)}т"
             )
+        if not self.fits(client):
+            raise ValueError(f"Груз клиента {client.name} не помещается по объему, паллетам или вагонам")
+        return self.load_trusted(client)
+    
+    def load_trusted(self, client: Client):
+        """Загрузка без проверок типа и перегруза: вызывающий код уже проверил fits"""
+        self.load_kg += client.cargo_kg
+        # Горячий путь: редкие поля читаются из _extra один раз, а не через два свойства
+        extra = client._extra
+        if extra is not None:
+            if extra[1] is not None:
+                self.current_volume += extra[1]
+            if extra[2] is not None:
+                self.current_pallets += extra[2]
+        if self._clients is None:
+            self._clients = [client]
+        else:
+            self._clients.append(client)
+        return True
+    
+    def unload_cargo(self, client: Client):
+        """Выгрузка груза клиента"""
+        if self._clients is None or client not in self._clients:
+            raise ValueError(f"Груз клиента {client.name} не загружен в этот транспорт")
         
-        self.current_load += client.cargo_weight
-        self.clients_list.append(client)
+        self._clients.remove(client)
+        self.load_kg -= client.cargo_kg
+        if client.volume is not None:
+            self.current_volume -= client.volume
+        if client.pallets is not None:
+            self.current_pallets -= client.pallets
+        if not self._clients:
+            self.clear_cargo()
         return True
     
+    def clear_cargo(self):
+        """Полностью разгружает транспорт"""
+        self._clients = None
+        self.load_kg = 0
+        self.current_volume = 0
+        self.current_pallets = 0
+    
     def can_load(self, cargo_weight: float) -> bool:
-        """Проверка, можно ли загрузить груз"""
-        return self.current_load + cargo_weight <= self.capacity
+        """Проверка, можно ли загрузить груз (вес в тоннах)"""
+        return self.load_kg + to_kg(cargo_weight) <= self.capacity_kg
+    
+    def can_load_kg(self, cargo_kg: int) -> bool:
+        """Проверка, можно ли загрузить груз (вес в килограммах)"""
+        return self.load_kg + cargo_kg <= self.capacity_kg
+    
+    def fits(self, client: Client) -> bool:
+        """Проверка груза по всем измерениям: вес, объем и паллеты"""
+        if self.load_kg + client.cargo_kg > self.capacity_kg:
+            return False
+        if (self.max_volume is not None and client.volume is not None
+                and self.current_volume + client.volume > self.max_volume):
+            return False
+        return (self.max_pallets is None or client.pallets is None
+                or self.current_pallets + client.pallets <= self.max_pallets)
+    
+    def car_free_kg(self) -> int:
+        """Наибольший груз (кг), который еще можно положить в один вагон"""
+        return self.capacity_kg - self.load_kg
     
     def __str__(self):
+        limits = ""
+        if self.max_volume is not None:
+            limits += f", Объем: {self.current_volume}/{self.max_volume}м³"
+        if self.max_pallets is not None:
+            limits += f", Паллет: {self.current_pallets}/{self.max_pallets}"
+        if self.fixed_cost or self.cost_per_tonne:
+            limits += f", Стоимость: запуск {self.fixed_cost}, тонна {self.cost_per_tonne}"
         return (f"Транспорт ID: {self.vehicle_id}, "
-                f"Грузоподъемность: {self.capacity}т, "
-                f"Текущая загрузка: {self.current_load}т, "
-                f"Свободно: {self.capacity - self.current_load}т")
+                f"Грузоподъемность: {format_tonnes(self.capacity_kg)}т, "
+                f"Текущая загрузка: {format_tonnes(self.load_kg)}т, "
+                f"Свободно: {format_tonnes(self.capacity_kg - self.load_kg)}т{limits}")
 
 
 class Truck(Vehicle):
-    def __init__(self, capacity: float, color: str):
-        super().__init__(capacity)
+    __slots__ = ("color",)
+    
+    def __init__(self, capacity: float, color: str, partition: str = None,
+                 max_volume: float = None, max_pallets: int = None, fixed_cost: float = 0.0, cost_per_tonne: float = 0.0):
+        super().__init__(capacity, partition, max_volume, max_pallets, fixed_cost, cost_per_tonne)
         self._validate_color(color)
         self.color = color
     
+    @classmethod
+    def trusted(cls, capacity: float, color: str, partition: str = None,
+                max_volume: float = None, max_pallets: int = None, fixed_cost: float = 0.0, cost_per_tonne: float = 0.0):
+        """Создание без валидации: только для уже проверенных данных"""
+        truck = super().trusted(capacity, partition, max_volume, max_pallets, fixed_cost, cost_per_tonne)
+        truck.color = color
+        return truck
+    
     def _validate_color(self, color: str):
         """Валидация цвета"""
         if not isinstance(color, str) or not color.strip():
@@ -79,27 +518,172 @@ class Truck(Vehicle):
 
 
 class Train(Vehicle):
-    def __init__(self, capacity: float, number_of_cars: int):
-        super().__init__(capacity)
+    """
+    Поезд заполняется по вагонам: грузоподъемность делится поровну между вагонами,
+    груз клиента целиком занимает место в одном вагоне (первом подходящем).
+    """
+    __slots__ = ("number_of_cars", "_car_loads", "_car_of")
+    
+    def __init__(self, capacity: float, number_of_cars: int, partition: str = None,
+                 max_volume: float = None, max_pallets: int = None, fixed_cost: float = 0.0, cost_per_tonne: float = 0.0):
+        super().__init__(capacity, partition, max_volume, max_pallets, fixed_cost, cost_per_tonne)
         self._validate_cars(number_of_cars)
         self.number_of_cars = number_of_cars
+        # Загрузка вагонов и вагон каждого клиента создаются при первой загрузке
+        self._car_loads = None
+        self._car_of = None
+    
+    @classmethod
+    def trusted(cls, capacity: float, number_of_cars: int, partition: str = None,
+                max_volume: float = None, max_pallets: int = None, fixed_cost: float = 0.0, cost_per_tonne: float = 0.0):
+        """Создание без валидации: только для уже проверенных данных"""
+        train = super().trusted(capacity, partition, max_volume, max_pallets, fixed_cost, cost_per_tonne)
+        train.number_of_cars = number_of_cars
+        train._car_loads = None
+        train._car_of = None
+        return train
     
     def _validate_cars(self, number_of_cars: int):
         """Валидация количества вагонов"""
         if not isinstance(number_of_cars, int) or number_of_cars <= 0:
             raise ValueError("Количество вагонов должно быть положительным целым числом")
     
+    @property
+    def car_capacity_kg(self):
+        """Грузоподъемность одного вагона в кг, с округлением вниз (None для поезда из одного вагона)"""
+        if self.number_of_cars == 1:
+            return None
+        return self.capacity_kg // self.number_of_cars
+    
+    @property
+    def car_capacity(self):
+        """Грузоподъемность одного вагона в тоннах (None для поезда из одного вагона)"""
+        if self.number_of_cars == 1:
+            return None
+        return to_tonnes(self.car_capacity_kg)
+    
+    @property
+    def car_loads(self):
+        """Загрузка каждого вагона в тоннах"""
+        if self._car_loads is None:
+            return [0.0] * self.number_of_cars
+        return [to_tonnes(load) for load in self._car_loads]
+    
+    def _car_for(self, cargo_kg: int) -> int:
+        """Первый вагон, в который помещается груз (-1, если такого нет)"""
+        if self._car_loads is None:
+            return 0 if cargo_kg <= self.car_capacity_kg else -1
+        limit = self.car_capacity_kg - cargo_kg
+        for car, load in enumerate(self._car_loads):
+            if load <= limit:
+                return car
+        return -1
+    
+    def fits(self, client: Client) -> bool:
+        if not super().fits(client):
+            return False
+        return self.number_of_cars == 1 or self._car_for(client.cargo_kg) != -1
+    
+    def car_free_kg(self) -> int:
+        if self.number_of_cars == 1:
+            return self.capacity_kg - self.load_kg
+        if self._car_loads is None:
+            return self.car_capacity_kg
+        return self.car_capacity_kg - min(self._car_loads)
+    
+    def load_trusted(self, client: Client):
+        if self.number_of_cars > 1:
+            car = self._car_for(client.cargo_kg)
+            if self._car_loads is None:
+                self._car_loads = [0] * self.number_of_cars
+                self._car_of = {}
+            if car == -1:
+                # Вызывающий код проверил fits; при восстановлении из снимка берем наименее загруженный вагон
+                car = self._car_loads.index(min(self._car_loads))
+            self._car_loads[car] += client.cargo_kg
+            self._car_of[client] = car
+        return super().load_trusted(client)
+    
+    def unload_cargo(self, client: Client):
+        super().unload_cargo(client)
+        if self._car_of is not None:
+            car = self._car_of.pop(client)
+            self._car_loads[car] -= client.cargo_kg
+        return True
+    
+    def clear_cargo(self):
+        super().clear_cargo()
+        self._car_loads = None
+        self._car_of = None
+    
     def __str__(self):
         base_str = super().__str__()
-        return f"{base_str}, Тип: Поезд, Вагонов: {self.number_of_cars}"
+        cars = ""
+        if self._car_loads is not None:
+            cars = f" (занято {sum(1 for load in self._car_loads if load > 0)})"
+        return f"{base_str}, Тип: Поезд, Вагонов: {self.number_of_cars}{cars}"
 
 
 class TransportCompany:
-    def __init__(self, name: str):
+    def __init__(self, name: str, columnar: bool = False):
         self._validate_name(name)
         self.name = name
         self.vehicles = []
-        self.clients = []
+        self._clients = []
+        # Удаленные клиенты, еще не вычищенные из _clients (вычищаются при обращении к clients)
+        self._removed = set()
+        # Очередь обслуживания: в _queue - клиенты, поставленные после последнего упорядочивания (в порядке
+        # постановки), в _order - уже упорядоченные записи (_schedule_entry). Запись действительна, пока клиент
+        # в компании; _requeued - удаленные и поставленные заново клиенты -> их действующая запись
+        # (None, пока клиент не упорядочен)
+        self._queue = []
+        self._order = []
+        self._requeued = {}
+        self._queue_numbers = itertools.count()
+        # Индексы поиска: ID транспорта -> транспорт, имя клиента -> первый добавленный клиент с этим именем.
+        # Имена не уникальны: _namesakes - имя -> все клиенты с этим именем в порядке добавления,
+        # только для повторяющихся имен
+        self._vehicles_by_id = {}
+        self._clients_by_name = {}
+        self._namesakes = {}
+        self.last_stats = None
+        # Итог последнего распределения (DistributionResult) и обработчик не размещенных грузов:
+        # on_unplaced(result) вызывается вместо записи в журнал
+        self.last_result = None
+        self.on_unplaced = None
+        # Необязательное колоночное хранилище для векторных агрегатов (требует numpy); его строки - копии
+        # полей объектов, их обновляют только методы компании.
+        # Импортируется по требованию: numpy заметно замедляет запуск программы
+        self.store = None
+        if columnar:
+            from columnar import ColumnarStore
+            self.store = ColumnarStore()
+        # Состояние последнего распределения для инкрементального режима;
+        # _assignment (клиент -> транспорт) также служит индексом для vehicle_of()
+        self._packer = None
+        self._assignment = {}
+        self._pending = []
+        # Ожидающие клиенты, которые не поместились в прошлый раз: их повторная неудача не вызывает переупаковку,
+        # а снова пробуются они, только если с тех пор освободилось место или добавился транспорт
+        self._unplaced = set()
+        self._retry_unplaced = False
+        # Деление не поместившихся грузов: (наименьшая часть в кг, наибольшее число частей) или None;
+        # _parts - клиент -> части его груза в текущем распределении
+        self._split = None
+        self._parts = {}
+        # Включается enable_instrumentation(), по умолчанию горячие пути без счетчиков
+        self.instrumentation = None
+        # Отпечаток состава транспорта и клиентов: одинаковые данные - одинаковый ключ кэша.
+        # _serials - объект компании -> его порядковый номер, выданный при добавлении
+        self._fingerprint = 0
+        self._serials = {}
+        self._next_serial = itertools.count()
+        self.distribution_cache = DistributionCache(DISTRIBUTION_CACHE_SIZE)
+        # Ключ кэша и результат распределения, примененного сейчас (None - распределение изменилось)
+        self._applied_key = None
+        self._last_used = None
+        # Страницы отчета для текущего состояния
+        self._reports = {}
     
     def _validate_name(self, name: str):
         """Валидация названия компании"""
@@ -110,81 +694,807 @@ class TransportCompany:
         """Добавление транспортного средства"""
         if not isinstance(vehicle, Vehicle):
             raise TypeError("Можно добавлять только объекты класса Vehicle или его наследников")
+        if vehicle._id in self._vehicles_by_id:
+            raise ValueError(f"Транспорт {vehicle.vehicle_id} уже добавлен")
         self.vehicles.append(vehicle)
+        self._index_vehicle(vehicle)
+        self._changed(self._enter(VEHICLE_TOKEN, (vehicle,)))
+        if self.store is not None:
+            self.store.add_vehicle(vehicle)
+        if self._packer is not None:
+            self._packer.add_vehicle(vehicle)
+            self._retry_unplaced = True
     
     def add_client(self, client: Client):
         """Добавление клиента"""
         if not isinstance(client, Client):
             raise TypeError("Можно добавлять только объекты класса Client")
-        self.clients.append(client)
+        if client in self._serials:
+            raise ValueError(f"Клиент {client.name} уже добавлен")
+        if self._removed and client in self._removed:
+            self._compact_clients()
+        self._clients.append(client)
+        first = self._clients_by_name.setdefault(client.name, client)
+        if first is not client:
+            self._namesakes.setdefault(client.name, [first]).append(client)
+        # Запись очереди собирается и упорядочивается один раз в scheduled_clients
+        self._queue.append(client)
+        # Горячий путь: отпечаток и сброс примененного результата без вызова _changed
+        serial = self._serials[client] = next(self._next_serial)
+        self._fingerprint = (self._fingerprint + hash((CLIENT_TOKEN, serial))) & FINGERPRINT_MASK
+        self._applied_key = self._last_used = None
+        if self._reports:
+            self._reports.clear()
+        if self.store is not None:
+            self.store.add_client(client)
+        if self._packer is not None:
+            self._pending.append(client)
+    
+    def add_vehicles(self, vehicles):
+        """Пакетное добавление транспортных средств"""
+        vehicles = list(vehicles)
+        if not all(isinstance(vehicle, Vehicle) for vehicle in vehicles):
+            raise TypeError("Можно добавлять только объекты класса Vehicle или его наследников")
+        duplicate = _first_duplicate((vehicle._id for vehicle in vehicles), self._vehicles_by_id)
+        if duplicate is not None:
+            raise ValueError(f"Транспорт {duplicate:08x} уже добавлен")
+        self.vehicles.extend(vehicles)
+        for vehicle in vehicles:
+            self._index_vehicle(vehicle)
+        self._changed(self._enter(VEHICLE_TOKEN, vehicles))
+        for vehicle in vehicles:
+            if self.store is not None:
+                self.store.add_vehicle(vehicle)
+            if self._packer is not None:
+                self._packer.add_vehicle(vehicle)
+        self._retry_unplaced = True
+    
+    def add_clients(self, clients):
+        """Пакетное добавление клиентов"""
+        clients = list(clients)
+        if not all(isinstance(client, Client) for client in clients):
+            raise TypeError("Можно добавлять только объекты класса Client")
+        duplicate = _first_duplicate(clients, self._serials)
+        if duplicate is not None:
+            raise ValueError(f"Клиент {duplicate.name} уже добавлен")
+        if self._removed and not self._removed.isdisjoint(clients):
+            self._compact_clients()
+        self._clients.extend(clients)
+        self._index_clients(clients)
+        self._queue.extend(clients)
+        self._changed(self._enter(CLIENT_TOKEN, clients))
+        if self.store is not None:
+            for client in clients:
+                self.store.add_client(client)
+        if self._packer is not None:
+            self._pending.extend(clients)
+    
+    def _restore(self, vehicles: list, clients: list, assignment: dict, parts: dict = None):
+        """
+        Принимает в пустую компанию транспорт, клиентов и распределение из снимка (клиент или часть груза ->
+        транспорт); parts - разделенные клиенты -> их части по порядку.
+        Данные проверялись при сохранении, поэтому индексы строятся сразу, без проверок типов и повторов.
+        """
+        self.vehicles = vehicles
+        self._clients = clients
+        self._vehicles_by_id = {vehicle._id: vehicle for vehicle in vehicles}
+        self._index_clients(clients)
+        self._queue = list(clients)
+        self._assignment = assignment
+        self._parts = parts or {}
+        self._changed(self._enter(VEHICLE_TOKEN, vehicles) + self._enter(CLIENT_TOKEN, clients))
+        if self.store is not None:
+            for vehicle in vehicles:
+                self.store.add_vehicle(vehicle)
+            for client in clients:
+                self.store.add_client(client)
+            self.store.sync_assignment()
+    
+    @property
+    def clients(self):
+        """Клиенты в порядке добавления"""
+        if self._removed:
+            self._compact_clients()
+        return self._clients
+    
+    def scheduled_clients(self):
+        """
+        Клиенты в порядке обслуживания: приоритет по убыванию, затем срок доставки, затем порядок постановки.
+        Поставленные после прошлого вызова сортируются и сливаются с уже упорядоченными
+        за O(n + k log k) - полной пересортировки нет.
+        """
+        if self._queue:
+            # Номера раздаются в порядке постановки, поэтому равные по приоритету и сроку сохраняют его
+            fresh = [_schedule_entry(client, number) for client, number in zip(self._queue, self._queue_numbers)]
+            if self._requeued:
+                requeued = self._requeued
+                for entry in fresh:
+                    if entry[-1] in requeued:
+                        requeued[entry[-1]] = entry
+            fresh.sort()
+            self._queue = []
+            self._order = list(heapq.merge(self._order, fresh)) if self._order else fresh
+        # Все действующие записи уже в _order, лишние - устаревшие; в _serials - только объекты компании
+        serials = self._serials
+        if len(self._order) != len(serials) - len(self.vehicles):
+            requeued = self._requeued
+            self._order = [entry for entry in self._order
+                           if entry[-1] in serials and requeued.get(entry[-1], entry) is entry]
+            requeued.clear()
+        return [entry[-1] for entry in self._order]
+    
+    def _reschedule(self, client: Client):
+        """Ставит клиента в очередь заново (после изменения приоритета или срока)"""
+        self._requeued[client] = None
+        self._queue.append(client)
+    
+    def _compact_clients(self):
+        """Вычищает удаленных клиентов из списка одним проходом"""
+        removed = self._removed
+        self._clients = [client for client in self._clients if client not in removed]
+        self._removed = set()
+    
+    def _index_clients(self, clients: list):
+        """Заносит клиентов в индекс по имени (первый с именем - в _clients_by_name, повторы - в _namesakes)"""
+        by_name = self._clients_by_name
+        namesakes = self._namesakes
+        for client in clients:
+            first = by_name.setdefault(client.name, client)
+            if first is not client:
+                namesakes.setdefault(client.name, [first]).append(client)
+    
+    def _unindex_client(self, client: Client):
+        """Убирает клиента из индекса по имени; следующий с тем же именем становится первым"""
+        name = client.name
+        same = self._namesakes.get(name)
+        if same is None:
+            del self._clients_by_name[name]
+            return
+        same.remove(client)
+        self._clients_by_name[name] = same[0]
+        if len(same) == 1:
+            del self._namesakes[name]
+    
+    def _index_vehicle(self, vehicle: Vehicle):
+        """Заносит транспорт и уже загруженные в него грузы в индексы поиска"""
+        self._vehicles_by_id[vehicle._id] = vehicle
+        if vehicle._clients:
+            for client in vehicle._clients:
+                self._assignment[client] = vehicle
+    
+    def get_vehicle(self, vehicle_id: str):
+        """Транспорт по ID (None, если такого нет)"""
+        try:
+            return self._vehicles_by_id.get(int(vehicle_id, 16))
+        except (TypeError, ValueError):
+            return None
+    
+    def get_client(self, name: str):
+        """Клиент по имени (None, если такого нет); из нескольких клиентов с одним именем - добавленный первым"""
+        return self._clients_by_name.get(name)
+    
+    def get_clients(self, name: str):
+        """Все клиенты с этим именем в порядке добавления"""
+        same = self._namesakes.get(name)
+        if same is not None:
+            return list(same)
+        client = self._clients_by_name.get(name)
+        return [client] if client is not None else []
+    
+    def vehicle_of(self, client: Client):
+        """
+        Транспорт, в который распределен груз клиента (None, если груз не распределен);
+        для разделенного груза - транспорт первой части.
+        """
+        parts = self._parts.get(client)
+        return self._assignment.get(parts[0] if parts else client)
+    
+    def vehicles_of(self, client: Client):
+        """Весь транспорт с грузом клиента: несколько единиц, если груз разделен"""
+        parts = self._parts.get(client)
+        if parts:
+            return [self._assignment[part] for part in parts]
+        vehicle = self._assignment.get(client)
+        return [vehicle] if vehicle is not None else []
+    
+    def place_client(self, client: Client, vehicle: Vehicle, previous: Vehicle = None):
+        """
+        Размещение груза вне оптимизатора (онлайн-диспетчер): загружает груз клиента в транспорт
+        и отмечает распределение; previous - транспорт, из которого груз переносится.
+        Вместимость не проверяется: вызывающий код уже проверил vehicle.fits(client).
+        """
+        if previous is not None:
+            previous.unload_cargo(client)
+        vehicle.load_trusted(client)
+        self._assignment[client] = vehicle
+        if self.store is not None:
+            self.store.update_assignment(client, vehicle)
+            if previous is not None:
+                self.store.update_load(previous)
+        self._changed()
+    
+    def detach_incremental(self):
+        """
+        Отключает дозагрузку последнего распределения: размещением управляет внешний код (place_client),
+        поэтому новые клиенты не копятся в очереди дозагрузки, а optimize_cargo_distribution ее не продолжит
+        """
+        self._packer = None
+        self._pending = []
+        self._unplaced = set()
+        self._retry_unplaced = False
+    
+    def _unassign(self, client: Client):
+        """
+        Выгружает груз клиента из его транспорта; возвращает этот транспорт (или None).
+        Разделенный груз выгружается целиком, возвращается транспорт последней части.
+        """
+        parts = self._parts.pop(client, None)
+        if parts:
+            for part in parts:
+                vehicle = self._unload(part)
+                if self.store is not None:
+                    self.store.update_load(vehicle)
+            return vehicle
+        return self._unload(client)
+    
+    def _unload(self, client: Client):
+        vehicle = self._assignment.pop(client, None)
+        if vehicle is None:
+            return None
+        self._retry_unplaced = True
+        if self._packer is not None and vehicle in self._packer:
+            self._packer.remove(client, vehicle)
+        else:
+            vehicle.unload_cargo(client)
+        return vehicle
+    
+    def remove_client(self, client: Client):
+        """Удаление клиента с освобождением места в транспорте"""
+        if not isinstance(client, Client):
+            raise TypeError("Можно удалять только объекты класса Client")
+        if client not in self._serials:
+            raise ValueError(f"Клиент {client.name} не найден")
+        self._unindex_client(client)
+        self._removed.add(client)
+        self._requeued[client] = None
+        self._changed(-hash((CLIENT_TOKEN, self._serials.pop(client))))
+        
+        vehicle = self._unassign(client)
+        if vehicle is None and client in self._pending:
+            self._pending.remove(client)
+            self._unplaced.discard(client)
+        if self.store is not None:
+            self.store.remove_client(client, vehicle)
+    
+    def update_client(self, name: str, **changes):
+        """
+        Изменяет груз клиента (cargo_weight, is_vip, partition, volume, pallets, priority, deadline).
+        Распределенный груз выгружается и ждет следующей дозагрузки. Приоритет, не заданный явно,
+        следует за is_vip; при смене приоритета или срока клиент встает в очередь заново
+        (после клиентов с теми же приоритетом и сроком). Из нескольких клиентов с одним именем
+        изменяется добавленный первым (как в get_client).
+        """
+        client = self._clients_by_name.get(name)
+        if client is None:
+            raise ValueError(f"Клиент {name} не найден")
+        names = ("cargo_weight", "is_vip", "partition", "volume", "pallets", "priority", "deadline")
+        unknown = set(changes) - set(names)
+        if unknown:
+            raise TypeError(f"Неизвестные поля клиента: {', '.join(sorted(unknown))}")
+        fields = {field: changes.get(field, getattr(client, field)) for field in names}
+        if "priority" not in changes and client.priority == (VIP_PRIORITY if client.is_vip else DEFAULT_PRIORITY):
+            fields["priority"] = None
+        errors = validate_clients([(name, *(fields[field] for field in names))])
+        if errors:
+            raise errors[0]
+        if fields["priority"] is None:
+            fields["priority"] = VIP_PRIORITY if fields["is_vip"] else DEFAULT_PRIORITY
+        
+        vehicle = self._unassign(client)
+        reschedule = (fields["priority"], fields["deadline"]) != (client.priority, client.deadline)
+        for field, value in fields.items():
+            setattr(client, field, value)
+        if reschedule:
+            self._reschedule(client)
+        if self._packer is not None and vehicle is not None:
+            self._pending.append(client)
+        # Груз изменился: прежняя неудача размещения больше ничего не говорит
+        self._unplaced.discard(client)
+        if self.store is not None:
+            self.store.update_client(client, vehicle)
+        # Отпечаток зависит только от состава, поэтому прежние результаты с этим клиентом устарели
+        self.distribution_cache.clear()
+        self._changed()
+        return client
+    
+    def remove_vehicle(self, vehicle_id: str):
+        """
+        Удаление транспорта по ID. Его грузы выгружаются и ждут следующей дозагрузки.
+        Поиск по индексу, удаление из списка транспорта - за O(количество транспорта).
+        """
+        vehicle = self.get_vehicle(vehicle_id)
+        if vehicle is None:
+            raise ValueError(f"Транспорт {vehicle_id} не найден")
+        clients = []
+        for client in list(vehicle.clients_list):
+            if isinstance(client, ClientPart):
+                # Остальные части тоже выгружаются: груз будет разделен заново
+                if client.client in self._parts:
+                    self._unassign(client.client)
+                    clients.append(client.client)
+                continue
+            del self._assignment[client]
+            clients.append(client)
+        vehicle.clear_cargo()
+        self.vehicles.remove(vehicle)
+        del self._vehicles_by_id[vehicle._id]
+        self._changed(-hash((VEHICLE_TOKEN, self._serials.pop(vehicle))))
+        
+        if self._packer is not None:
+            self._packer.remove_vehicle(vehicle)
+            self._pending.extend(clients)
+        if self.store is not None:
+            self.store.remove_vehicle(vehicle)
+        return vehicle
+    
+    def _enter(self, kind: int, objects) -> int:
+        """Выдает добавленным объектам порядковые номера; возвращает прибавку к отпечатку"""
+        serials = self._serials
+        counter = self._next_serial
+        delta = 0
+        for obj in objects:
+            serial = serials[obj] = next(counter)
+            delta += hash((kind, serial))
+        return delta
+    
+    def _changed(self, delta: int = 0):
+        """
+        Сбрасывает примененный результат и кэш отчета, delta прибавляется к отпечатку.
+        Отпечаток - сумма хешей (вид, порядковый номер) объектов по модулю 2**64: не зависит
+        от порядка добавления, а удаление возвращает прежнее значение. Номера не повторяются
+        в пределах компании, поэтому новый объект (даже с id удаленного) меняет отпечаток,
+        а удаленный и добавленный заново объект получает новый номер.
+        """
+        self._fingerprint = (self._fingerprint + delta) & FINGERPRINT_MASK
+        self._applied_key = None
+        self._last_used = None
+        self._reports.clear()
     
     def list_vehicles(self):
         """Возвращает список всех транспортных средств"""
         return self.vehicles
     
-    def optimize_cargo_distribution(self):
+    def enable_split_shipments(self, min_chunk: float = SPLIT_MIN_CHUNK, max_parts: int = SPLIT_MAX_PARTS):
+        """
+        Включает деление грузов: после полного распределения не поместившийся груз делится
+        на части (не больше max_parts, каждая не легче min_chunk тонн) по транспорту с наибольшим
+        свободным местом. Дозагрузка грузы не делит. Грузы с паллетами не делятся.
+        """
+        if (not isinstance(min_chunk, (int, float)) or isinstance(min_chunk, bool) or not math.isfinite(min_chunk)
+                or to_kg(min_chunk) <= 0):
+            raise ValueError("Наименьшая часть груза должна быть положительным числом")
+        if not isinstance(max_parts, int) or isinstance(max_parts, bool) or max_parts < 2:
+            raise ValueError("Число частей должно быть целым числом не меньше 2")
+        self._split = (to_kg(min_chunk), max_parts)
+        self._changed()
+    
+    def disable_split_shipments(self):
+        """Выключает деление грузов (уже разделенные остаются до следующего распределения)"""
+        self._split = None
+        self._changed()
+    
+    def enable_instrumentation(self, profile: bool = False):
+        """
+        Включает счетчики (проверки транспорта, размещенные грузы, открытый транспорт, неудачные размещения)
+        и таймеры фаз запусков этой компании; profile - еще и cProfile. Статистика последнего
+        запуска - instrumentation.last_run; у каждого запуска (в том числе восстановления из кэша) она своя.
+        """
+        self.instrumentation = instrumentation.Instrumentation(profile)
+        return self.instrumentation
+    
+    def disable_instrumentation(self):
+        """Выключает инструментацию"""
+        self.instrumentation = None
+    
+    def _instrumented_run(self, strategy: str, clients: int):
+        """Контекст запуска распределения для инструментации (пустой, если она выключена)"""
+        if self.instrumentation is None:
+            return contextlib.nullcontext()
+        return self.instrumentation.run(strategy, clients)
+    
+    def _run_stats(self):
+        """RunStats идущего запуска (None, если инструментация выключена или запуска нет)"""
+        return self.instrumentation.current if self.instrumentation is not None else None
+    
+    def _phase(self, name: str):
+        """Замер фазы в статистике компании (пустой контекст, если инструментация выключена)"""
+        if self.instrumentation is None:
+            return instrumentation.phase(None, name)
+        return self.instrumentation.phase(name)
+    
+    def optimize_cargo_distribution(self, strategy: str = "first_fit", time_budget: float = 1.0,
+                                    incremental: bool = False):
         """
         Оптимизирует распределение грузов:
-        1. VIP клиенты обслуживаются первыми
+        1. Клиенты обслуживаются в порядке очереди (scheduled_clients): старшие уровни приоритета
+           (VIP по умолчанию выше обычных), внутри уровня - ближайший срок доставки
         2. Используется минимальное количество транспорта
+        
+        strategy - стратегия упаковки из packing.STRATEGIES:
+        first_fit, ffd, bfd, worst_fit или exact (точный поиск с бюджетом time_budget секунд).
+        incremental - дозагрузить новых клиентов (first-fit) в существующее распределение.
+        После optimize_partitioned дозагрузка и полная переупаковка тоже идут по партициям.
+        Полная переупаковка выполняется, если распределения еще не было, доля незанятого места
+        превысила FRAGMENTATION_THRESHOLD или не поместился клиент приоритета выше обычного, добавленный
+        после прошлого распределения (не поместившиеся прежде остаются ждать без переупаковки).
+        Итоги запуска сохраняются в last_stats, включая нижнюю границу количества
+        транспорта и разрыв до нее (last_stats.lower_bound, last_stats.gap), а полный итог
+        с не размещенными грузами и причинами - в last_result (DistributionResult).
+        
+        Результаты полных распределений кэшируются по отпечатку данных (distribution_cache):
+        повтор без изменений возвращает текущее распределение, а ранее посчитанное для тех же
+        данных восстанавливается без переупаковки. Отпечаток обновляют только методы
+        add_*/remove_client - прямое изменение грузов и транспорта кэш не замечает.
         """
-        sorted_clients = sorted(self.clients, key=lambda x: not x.is_vip)
-        sorted_vehicles = sorted(self.vehicles, key=lambda x: x.capacity, reverse=True)
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия: {strategy}. "
+                             f"Доступны: {', '.join(STRATEGIES)}")
         
-        for vehicle in sorted_vehicles:
-            vehicle.current_load = 0
-            vehicle.clients_list = []
+        start = time.perf_counter()
+        if incremental and self._packer is not None:
+            if len(self._pending) == len(self._unplaced) and self._last_used is not None:
+                return list(self._last_used)
+            if self._packer.fragmentation() <= FRAGMENTATION_THRESHOLD:
+                with self._instrumented_run("incremental", len(self._pending)), self._phase("дозагрузка"):
+                    used_vehicles = self._place_pending(start)
+                if used_vehicles is not None:
+                    return used_vehicles
+            if self._packer.by_partition:
+                # После распределения по партициям и переупаковка идет по партициям
+                return self.optimize_partitioned(strategy, time_budget)
         
-        used_vehicles = []
-        for client in sorted_clients:
-            client_loaded = False
-            
-            for vehicle in used_vehicles:
-                if vehicle.can_load(client.cargo_weight):
-                    vehicle.load_cargo(client)
-                    client_loaded = True
-                    break
-            
-            if not client_loaded:
-                for vehicle in sorted_vehicles:
-                    if vehicle not in used_vehicles and vehicle.can_load(client.cargo_weight):
-                        vehicle.load_cargo(client)
+        # Бюджет времени влияет на результат только точного поиска
+        key = (self._fingerprint, strategy, time_budget if strategy == "exact" else None, self._split)
+        cached = self.distribution_cache.get(key)
+        if key == self._applied_key:
+            return list(self._last_used)
+        if cached is not None:
+            with self._instrumented_run(f"{strategy} из кэша", len(self.clients)):
+                return self._restore_distribution(key, cached, start)
+        
+        with self._instrumented_run(strategy, len(self.clients)):
+            used_vehicles, unplaced = pack(self.scheduled_clients(), self.vehicles, strategy, time_budget,
+                                           ordered=True, stats=self._run_stats())
+            used_vehicles, unplaced = self._split_unplaced(used_vehicles, unplaced)
+            self._finish_distribution(strategy, used_vehicles, unplaced, start)
+        self._remember(key, used_vehicles, unplaced)
+        return used_vehicles
+    
+    def _remember(self, key, used_vehicles, unplaced):
+        """Кладет результат полного распределения в кэш и отмечает его примененным"""
+        self.distribution_cache.put(key, (
+            list(used_vehicles),
+            [list(vehicle.clients_list) for vehicle in used_vehicles],
+            list(unplaced),
+            self.last_stats,
+        ))
+        self._applied_key = key
+        self._last_used = list(used_vehicles)
+    
+    def _restore_distribution(self, key, cached, start: float):
+        """Восстанавливает распределение из кэша повторной загрузкой тех же грузов в тот же транспорт"""
+        used_vehicles, loads, unplaced, stats = cached
+        for vehicle in self.vehicles:
+            vehicle.clear_cargo()
+        for vehicle, clients in zip(used_vehicles, loads):
+            for client in clients:
+                vehicle.load_trusted(client)
+        run = self._run_stats()
+        if run is not None:
+            run.loads += sum(len(clients) for clients in loads)
+        self._finish_distribution(stats.strategy, used_vehicles, unplaced, start)
+        # Итоги (в том числе нижняя граница) те же, что у исходного запуска
+        self.last_stats = self.last_result.stats = stats
+        self._applied_key = key
+        self._last_used = list(used_vehicles)
+        return list(used_vehicles)
+    
+    def optimize_partitioned(self, strategy: str = "first_fit", time_budget: float = 1.0,
+                             max_workers: int = None):
+        """
+        Распределяет грузы независимо по партициям (депо/регионам) в пуле процессов.
+        Клиенты партиции загружаются только в транспорт той же партиции, VIP первыми.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия: {strategy}. "
+                             f"Доступны: {', '.join(STRATEGIES)}")
+        
+        # partitioning строит грузы процессов-исполнителей на моделях этого модуля, поэтому импортируется здесь
+        from partitioning import pack_partitioned
+        
+        start = time.perf_counter()
+        with self._instrumented_run(f"{strategy} по партициям", len(self.clients)):
+            with self._phase("размещение"):
+                used_vehicles, unplaced = pack_partitioned(self.scheduled_clients(), self.vehicles, strategy,
+                                                           time_budget, max_workers, self._run_stats())
+            used_vehicles, unplaced = self._split_unplaced(used_vehicles, unplaced, by_partition=True)
+            self._finish_distribution(f"{strategy} по партициям", used_vehicles, unplaced, start,
+                                      by_partition=True)
+        self._last_used = list(used_vehicles)
+        return used_vehicles
+    
+    def _split_unplaced(self, used_vehicles, unplaced, by_partition: bool = False):
+        """Делит не поместившиеся грузы, если деление включено; возвращает (использованный транспорт, не размещенные)"""
+        if self._split is None or not unplaced:
+            return used_vehicles, unplaced
+        min_chunk_kg, max_parts = self._split
+        if by_partition:
+            from partitioning import split_by_partition
+            groups = split_by_partition(unplaced, self.vehicles).values()
+        else:
+            groups = [(unplaced, self.vehicles)]
+        used_vehicles = list(used_vehicles)
+        used_set = set(used_vehicles)
+        left = []
+        stats = self._run_stats()
+        with self._phase("деление грузов"):
+            for clients, vehicles in groups:
+                loaded, rest = split_cargo(clients, vehicles, min_chunk_kg, max_parts, ClientPart.of)
+                left.extend(rest)
+                if stats is not None:
+                    stats.loads += len(loaded)
+                for vehicle, _ in loaded:
+                    if vehicle not in used_set:
+                        used_set.add(vehicle)
                         used_vehicles.append(vehicle)
-                        client_loaded = True
-                        break
-            
-            if not client_loaded:
-                print(f"Предупреждение: Груз клиента {client.name} ({client.cargo_weight}т) "
-                      f"не поместился ни в один транспорт")
+        return used_vehicles, left
+    
+    def _finish_distribution(self, strategy: str, used_vehicles, unplaced, start: float,
+                             by_partition: bool = False):
+        """Сохраняет состояние после полного распределения и сообщает о не размещенных грузах"""
+        self._changed()
+        with self._phase("итоги"):
+            self._save_distribution(strategy, used_vehicles, unplaced, start, by_partition)
+            self._report(used_vehicles, unplaced, by_partition)
+    
+    def _report(self, used_vehicles, unplaced, by_partition: bool = False):
+        """Собирает last_result и передает не размещенные грузы обработчику или в журнал"""
+        stats = self._run_stats()
+        if stats is not None:
+            stats.placement_failures = len(unplaced)
+        result = DistributionResult(list(used_vehicles), explain_unplaced(unplaced, self.vehicles, by_partition),
+                                    self.last_stats)
+        self.last_result = result
+        if not result.unplaced:
+            return
+        if self.on_unplaced is not None:
+            self.on_unplaced(result)
+            return
+        logger.warning("%s: не размещено грузов: %d (%s)", self.name, len(result.unplaced),
+                       ", ".join(f"{reason}: {count}" for reason, count in result.reasons().items()))
+        if logger.isEnabledFor(logging.DEBUG):
+            for client, reason in result.unplaced:
+                logger.debug("Груз клиента %s (%sт) не размещен: %s", client.name, client.cargo_weight, reason)
+    
+    def _save_distribution(self, strategy: str, used_vehicles, unplaced, start: float, by_partition: bool = False):
+        if self.store is not None:
+            self.store.sync_assignment()
         
+        used_set = set(used_vehicles)
+        # После распределения по партициям дозагрузка тоже не выходит за партицию клиента
+        if by_partition:
+            from partitioning import PartitionedPacker
+            packer = PartitionedPacker
+        else:
+            packer = IncrementalPacker
+        self._packer = packer(used_vehicles, [v for v in dict.fromkeys(self.vehicles) if v not in used_set])
+        self._assignment = {client: vehicle for vehicle in used_vehicles for client in vehicle.clients_list}
+        self._parts = {}
+        if self._split is not None:
+            for client in self._assignment:
+                if isinstance(client, ClientPart):
+                    self._parts.setdefault(client.client, []).append(client)
+            for parts in self._parts.values():
+                parts.sort(key=lambda part: part.index)
+        self._pending = list(unplaced)
+        self._unplaced = set(unplaced)
+        self._retry_unplaced = False
+        
+        self.last_stats = PackingStats(
+            strategy,
+            len(used_vehicles),
+            to_tonnes(sum(v.load_kg for v in used_vehicles)),
+            to_tonnes(sum(v.capacity_kg for v in used_vehicles)),
+            len(unplaced),
+            time.perf_counter() - start,
+            # Граница по размещенным грузам, иначе при нехватке парка она превысит использованный транспорт
+            lower_bound([client for vehicle in used_vehicles for client in vehicle.clients_list], self.vehicles),
+            total_cost(used_vehicles),
+        )
+    
+    def _place_pending(self, start: float):
+        """
+        Дозагружает ожидающих клиентов в текущее распределение в порядке обслуживания.
+        Возвращает None, если не поместился новый клиент приоритета выше обычного и нужна полная
+        переупаковка; клиенты, не поместившиеся в прошлый раз, просто остаются ждать.
+        """
+        self._changed()
+        pending = sorted(self._pending, key=schedule_key)
+        known = self._unplaced
+        retry = self._retry_unplaced
+        stats = self._run_stats()
+        unplaced = []
+        for client in pending:
+            if client in known and not retry:
+                # Места с прошлой попытки не прибавилось - груз по-прежнему не поместится
+                unplaced.append(client)
+                continue
+            vehicle = self._packer.place(client, stats)
+            if vehicle is None:
+                if client.priority > DEFAULT_PRIORITY and client not in known:
+                    return None
+                unplaced.append(client)
+                continue
+            self._assignment[client] = vehicle
+            if self.store is not None:
+                self.store.update_assignment(client, vehicle)
+        self._pending = unplaced
+        self._unplaced = set(unplaced)
+        self._retry_unplaced = False
+        
+        used_vehicles = self._packer.used_vehicles()
+        self.last_stats = PackingStats(
+            "incremental",
+            len(used_vehicles),
+            to_tonnes(self._packer.loaded_kg),
+            to_tonnes(sum(v.capacity_kg for v in used_vehicles)),
+            len(unplaced),
+            time.perf_counter() - start,
+            cost=total_cost(used_vehicles),
+        )
+        self._report(used_vehicles, unplaced, self._packer.by_partition)
+        self._last_used = list(used_vehicles)
         return used_vehicles
     
-    def get_distribution_report(self):
-        """Генерирует отчет о распределении грузов"""
-        report = f"Отчет компании '{self.name}':\n"
-        report += "=" * 50 + "\n"
-        
-        total_cargo = sum(client.cargo_weight for client in self.clients)
-        vip_cargo = sum(client.cargo_weight for client in self.clients if client.is_vip)
-        
-        report += f"Всего клиентов: {len(self.clients)}\n"
-        report += f"VIP клиентов: {sum(1 for client in self.clients if client.is_vip)}\n"
-        report += f"Общий вес грузов: {total_cargo}т\n"
-        report += f"Вес грузов VIP: {vip_cargo}т\n\n"
-        
-        used_vehicles = [v for v in self.vehicles if v.current_load > 0]
-        
-        if used_vehicles:
-            report += "Использованный транспорт:\n"
-            for vehicle in used_vehicles:
-                report += f"\n{vehicle}\n"
-                if vehicle.clients_list:
-                    report += "  Клиенты в этом транспорте:\n"
-                    for client in vehicle.clients_list:
-                        vip_status = " (VIP)" if client.is_vip else ""
-                        report += f"    - {client.name}{vip_status}: {client.cargo_weight}т\n"
-                report += f"  Коэффициент загрузки: {(vehicle.current_load / vehicle.capacity * 100):.1f}%\n"
+    def get_distribution_report(self, start: int = 0, stop: int = None):
+        """Генерирует отчет о распределении грузов (повтор для того же состояния берется из кэша)"""
+        key = (start, stop, True)
+        cached = self._reports.get(key)
+        if cached is not None:
+            return cached[0]
+        with self._phase("отчет"):
+            text = "".join(self.iter_distribution_report(start, stop))
+        self._reports[key] = (text, None)
+        return text
+    
+    def write_distribution_report(self, out, start: int = 0, stop: int = None,
+                                  summary: bool = True) -> int:
+        """
+        Построчно записывает отчет в файловый объект out.
+        Возвращает количество транспорта на странице.
+        Ограниченные страницы (stop задан) кэшируются до следующего изменения данных.
+        """
+        key = (start, stop, summary)
+        cached = self._reports.get(key)
+        if cached is not None and cached[1] is not None:
+            out.write(cached[0])
+            return cached[1]
+        written = 0
+        lines = [] if stop is not None else None
+        with self._phase("отчет"):
+            for line in self.iter_distribution_report(start, stop, summary):
+                out.write(line)
+                if lines is not None:
+                    lines.append(line)
+                if line.startswith("\n"):
+                    written += 1
+        if lines is not None:
+            self._reports[key] = ("".join(lines), written)
+        return written
+    
+    def _client_totals(self, by_priority: bool = False):
+        """
+        Итоги по клиентам за один проход: (клиентов, VIP клиентов, вес грузов в кг, вес VIP в кг, уровни, ожидающие).
+        С by_priority уровни - {приоритет: [клиентов, размещено клиентов, вес в кг, размещенный вес в кг]},
+        ожидающие - не размещенные грузы приоритета выше обычного; иначе оба пустые.
+        Разделенный груз считается размещенным.
+        """
+        count = vip_count = total_kg = vip_kg = 0
+        tiers = {}
+        waiting = []
+        assignment = self._assignment
+        parts = self._parts
+        for client in self.clients:
+            cargo_kg = client.cargo_kg
+            count += 1
+            total_kg += cargo_kg
+            if client.is_vip:
+                vip_count += 1
+                vip_kg += cargo_kg
+            if by_priority:
+                tier = tiers.get(client.priority)
+                if tier is None:
+                    tier = tiers[client.priority] = [0, 0, 0, 0]
+                tier[0] += 1
+                tier[2] += cargo_kg
+                if client in assignment or client in parts:
+                    tier[1] += 1
+                    tier[3] += cargo_kg
+                elif client.priority > DEFAULT_PRIORITY:
+                    waiting.append(client)
+        return count, vip_count, total_kg, vip_kg, tiers, waiting
+    
+    def priority_summary(self):
+        """
+        Итоги по уровням приоритета (от старшего): [(приоритет, клиентов, размещено клиентов,
+        вес грузов в кг, размещенный вес в кг)]. Разделенный груз считается размещенным.
+        """
+        tiers = self._client_totals(by_priority=True)[4]
+        return [(priority, *tiers[priority]) for priority in sorted(tiers, reverse=True)]
+    
+    def _iter_priority_report(self, tiers: dict, waiting: list):
+        """Строки отчета: доля размещенного веса по уровням приоритета и не размещенные грузы высокого приоритета"""
+        yield "По уровням приоритета:\n"
+        for priority in sorted(tiers, reverse=True):
+            count, placed, total_kg, placed_kg = tiers[priority]
+            yield (f"  Приоритет {priority}: клиентов {count}, размещено {placed} "
+                   f"({placed_kg / total_kg * 100:.1f}% веса, {format_tonnes(placed_kg)}т из {format_tonnes(total_kg)}т)\n")
+        if waiting:
+            waiting.sort(key=schedule_key)
+            yield f"Не размещены грузы высокого приоритета: {len(waiting)}\n"
+            for client in waiting[:SUMMARY_UNPLACED]:
+                yield f"  - {client.name}: {format_tonnes(client.cargo_kg)}т{schedule_label(client)}\n"
+            if len(waiting) > SUMMARY_UNPLACED:
+                yield f"  ... и еще {len(waiting) - SUMMARY_UNPLACED}\n"
+    
+    def iter_distribution_report(self, start: int = 0, stop: int = None, summary: bool = True):
+        """
+        Генератор строк отчета о распределении грузов.
+        start и stop ограничивают страницу использованного транспорта (как срез),
+        summary - выводить ли заголовок и итоги по клиентам.
+        С пустой строки начинаются только записи транспорта (по ним write_distribution_report считает транспорт),
+        поэтому пустая строка после итогов дописывается к их последней строке.
+        """
+        if summary:
+            lines = [f"Отчет компании '{self.name}':\n", "=" * 50 + "\n"]
+            
+            # Доли размещенного веса по уровням приоритета имеют смысл только после распределения
+            by_priority = self.last_result is not None or bool(self._assignment)
+            # Все итоги по клиентам, включая уровни приоритета, за один проход
+            if self.store is not None:
+                clients_count, vip_count, total_kg, vip_kg, tiers, waiting = self.store.totals(by_priority, self._parts)
+            else:
+                clients_count, vip_count, total_kg, vip_kg, tiers, waiting = self._client_totals(by_priority)
+            
+            lines.append(f"Всего клиентов: {clients_count}\n")
+            lines.append(f"VIP клиентов: {vip_count}\n")
+            lines.append(f"Общий вес грузов: {format_tonnes(total_kg)}т\n")
+            lines.append(f"Вес грузов VIP: {format_tonnes(vip_kg)}т\n")
+            if by_priority:
+                lines.extend(self._iter_priority_report(tiers, waiting))
+            lines[-1] += "\n"
+            yield from lines
+        
+        if self.store is not None:
+            used_vehicles = iter(self.store.used_vehicles())
         else:
-            report += "Грузы еще не распределены\n"
+            used_vehicles = (v for v in self.vehicles if v.load_kg > 0)
+        page = itertools.islice(used_vehicles, start, stop)
+        
+        vehicle = next(page, None)
+        if vehicle is None:
+            if start == 0:
+                yield "Грузы еще не распределены\n"
+            return
         
-        return report
\ No newline at end of file
+        if summary:
+            yield "Использованный транспорт:\n"
+        while vehicle is not None:
+            yield f"\n{vehicle}\n"
+            if vehicle.clients_list:
+                yield "  Клиенты в этом транспорте:\n"
+                for client in vehicle.clients_list:
+                    vip_status = " (VIP)" if client.is_vip else ""
+                    yield f"    - {client.label}{vip_status}: {format_tonnes(client.cargo_kg)}т\n"
+            yield f"  Коэффициент загрузки: {(vehicle.load_kg / vehicle.capacity_kg * 100):.1f}%\n"
+            vehicle = next(page, None)
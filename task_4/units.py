@@ -0,0 +1,34 @@
+#Целочисленный учет веса: грузы, грузоподъемность и загрузка хранятся в килограммах
+
+# Килограммов в тонне: внутри вес - целое число килограммов, наружу выдается в тоннах
+KG_PER_TONNE = 1000
+
+
+def to_kg(tonnes) -> int:
+    """Тонны в целые килограммы (с округлением до ближайшего)"""
+    return round(tonnes * KG_PER_TONNE)
+
+
+def to_tonnes(kg: int) -> float:
+    """Килограммы в тонны"""
+    return kg / KG_PER_TONNE
+
+
+def format_tonnes(kg: int) -> str:
+    """Вес в тоннах для вывода: целые тонны без дробной части ("10", а не "10.0")"""
+    if kg % KG_PER_TONNE == 0:
+        return str(kg // KG_PER_TONNE)
+    return str(kg / KG_PER_TONNE)
+
+
+# Веса грузов округлены до 1 кг и часто повторяются, поэтому одинаковые значения хранятся одним объектом int
+# (как строки в sys.intern); таблица ограничена весами меньше SHARED_KG_LIMIT
+SHARED_KG_LIMIT = 50_000
+_shared_kg = {}
+
+
+def shared_kg(kg: int) -> int:
+    """Общий объект int для веса kg: клиенты с одинаковым грузом не хранят по своей копии числа"""
+    if kg < SHARED_KG_LIMIT:
+        return _shared_kg.setdefault(kg, kg)
+    return kg